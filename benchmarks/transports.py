@@ -0,0 +1,74 @@
+"""
+Compares throughput of the HTTP backends in `fzseries_api.transport`
+by fanning out small page requests against a local server.
+
+    python benchmarks/transports.py --requests 2000 --workers 8
+
+The local server speaks plain HTTP/1.1 so the httpx backend is measured
+without HTTP/2 multiplexing, which needs TLS - expect its advantage
+to show against the real site only.
+"""
+
+import argparse
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+import fzseries_api.transport as transport
+
+page = b"<html>" + b"x" * 20_000 + b"</html>"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+
+def benchmark(name: str, url: str, total: int, workers: int) -> float:
+    backend = transport.create(name, requests.Session())
+    try:
+        backend.get(url).content
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for resp in executor.map(lambda _: backend.get(url), range(total)):
+                assert resp.status_code == 200
+        return total / (time.perf_counter() - started)
+    finally:
+        backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/page"
+    try:
+        for name in transport.transports:
+            if name == "httpx" and not importlib.util.find_spec("httpx"):
+                print(f"{name:<10} skipped - httpx is not installed")
+                continue
+            rate = benchmark(name, url, args.requests, args.workers)
+            print(f"{name:<10} {rate:>10.1f} requests/s")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
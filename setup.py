@@ -12,9 +12,12 @@ INSTALL_REQUIRE = [
 
 cli_reqs = ["click==8.1.3", "rich==13.9.2"]
 
+http2_reqs = ["httpx[http2]>=0.27.0"]
+
 EXTRA_REQUIRE = {
     "cli": cli_reqs,
-    "all": cli_reqs + [],
+    "http2": http2_reqs,
+    "all": cli_reqs + http2_reqs,
 }
 
 setup(
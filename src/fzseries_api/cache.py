@@ -0,0 +1,264 @@
+"""
+This module avoids fetching the same resource
+more times than necessary:
+- Singleflight coalescing of identical concurrent requests
+- Response cache revalidated through ETag / Last-Modified
+- Parsed models memoized by content hash
+"""
+
+import functools
+import hashlib
+import os
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+import requests
+
+
+def request_key(url: str, *args, **kwargs) -> tuple:
+    """Identity of a request made with the given arguments"""
+    options = sorted(
+        (name, repr(value))
+        for name, value in kwargs.items()
+        if name not in ("priority", "timeout")
+    )
+    return (str(url), repr(args), tuple(options))
+
+
+def content_digest(contents: str | bytes) -> str:
+    """Hash of page contents"""
+    if isinstance(contents, str):
+        contents = contents.encode()
+    return hashlib.sha256(contents).hexdigest()
+
+
+class Call:
+    """A call in flight shared by all its callers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: t.Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class Singleflight:
+    """Runs a function once for all callers asking for the same key
+    at the same time - the rest wait and get the same result or error.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        """Calls actually made"""
+        self.coalesced = 0
+        """Calls saved by sharing an in-flight one"""
+        self._in_flight: dict[t.Hashable, Call] = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"<fzseries_api.cache.Singleflight in_flight={len(self._in_flight)}>"
+
+    def do(self, key: t.Hashable, function: t.Callable, *args, **kwargs) -> t.Any:
+        """Call function unless an identical call is in flight
+
+        Args:
+            key (t.Hashable): Identity of the call.
+            function (t.Callable): Function to call.
+
+        Returns:
+            t.Any: What the function returned - raises what it raised.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            if call is None:
+                call = self._in_flight[key] = Call()
+                self.calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def stats(self) -> dict[str, int]:
+        """Calls made, coalesced and currently in flight"""
+        with self._lock:
+            return dict(
+                calls=self.calls,
+                coalesced=self.coalesced,
+                in_flight=len(self._in_flight),
+            )
+
+
+class CachedResponse:
+    """Response kept by `ResponseCache` along with its validators"""
+
+    def __init__(self, response: requests.Response, ttl: float):
+        self.response = response
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.digest = content_digest(response.content)
+
+    def __str__(self):
+        return f'<fzseries_api.cache.CachedResponse url="{self.response.url}">'
+
+    def is_fresh(self) -> bool:
+        """Checks the response can be used without revalidating"""
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Keeps responses of pages for a while and revalidates them
+    afterwards - through `If-None-Match`/`If-Modified-Since` where the
+    server supports them and by comparing content hash where not.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 256):
+        """Initializes `ResponseCache`
+
+        Args:
+            ttl (float, optional): Seconds a response is used without revalidating. Defaults to 300.0.
+            max_entries (int, optional): Responses kept - least recently used are dropped. Defaults to 256.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        """Responses served fresh from cache"""
+        self.not_modified = 0
+        """Revalidations answered with 304"""
+        self.unchanged = 0
+        """Full responses identical to the cached ones"""
+        self.misses = 0
+        self._entries: OrderedDict[t.Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"<fzseries_api.cache.ResponseCache entries={len(self._entries)}>"
+
+    def get(self, key: t.Hashable) -> CachedResponse | None:
+        """Cached response - fresh or not"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.is_fresh():
+                self.hits += 1
+            return entry
+
+    def revalidated(self, key: t.Hashable) -> CachedResponse:
+        """Mark cached response as still valid after a 304 response"""
+        with self._lock:
+            entry = self._entries[key]
+            entry.stored_at = time.monotonic()
+            self.not_modified += 1
+            return entry
+
+    def store(self, key: t.Hashable, response: requests.Response) -> CachedResponse:
+        """Cache response - the previous one is kept if the content is unchanged"""
+        entry = CachedResponse(response, self.ttl)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous.digest == entry.digest:
+                self.unchanged += 1
+                previous.stored_at = entry.stored_at
+                previous.etag = entry.etag
+                previous.last_modified = entry.last_modified
+                entry = previous
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Cache entries, hits and revalidation outcomes"""
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                hits=self.hits,
+                not_modified=self.not_modified,
+                unchanged=self.unchanged,
+                misses=self.misses,
+            )
+
+
+class ParsedCache:
+    """Models extracted from page contents, keyed by content hash,
+    so byte-identical pages are not parsed again"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], t.Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def memoize(self, handler: t.Callable[[str], t.Any]) -> t.Callable[[str], t.Any]:
+        """Decorate a handler taking page contents and returning a model"""
+
+        @functools.wraps(handler)
+        def decorator(contents: str):
+            key = (handler.__qualname__, content_digest(contents))
+            with self._lock:
+                model = self._entries.get(key)
+                if model is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+            if model is None:
+                model = handler(contents)
+                with self._lock:
+                    self.misses += 1
+                    self._entries[key] = model
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            # Callers are free to modify the model they get
+            return model.model_copy(deep=True)
+
+        return decorator
+
+    def stats(self) -> dict[str, int]:
+        """Models kept and reused"""
+        with self._lock:
+            return dict(entries=len(self._entries), hits=self.hits, misses=self.misses)
+
+
+response_cache = ResponseCache(ttl=float(os.getenv("FZSERIES_CACHE_TTL", 300.0)))
+"""Caches listing pages fetched through `hunter`"""
+
+parsed_cache = ParsedCache()
+"""Memoizes models extracted by `handlers`"""
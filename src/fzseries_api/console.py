@@ -21,9 +21,46 @@ search_filters: list[str] = [
 
 @click.group(epilog=f"Repository : {fzseries_api.__repo__}")
 @click.version_option(version=fzseries_api.__version__)
-def fzseries():
+@click.option(
+    "--preconnect",
+    is_flag=True,
+    help="Warm up connections to the site's domains in the background",
+)
+@click.option(
+    "--cookie-jar",
+    type=click.Path(dir_okay=False),
+    help="Persist session cookies to this file to skip bootstrapping on next runs",
+)
+@click.option(
+    "--transport",
+    type=click.Choice(["requests", "urllib3", "httpx"]),
+    help="HTTP backend - httpx enables HTTP/2",
+)
+@click.option(
+    "--proxy",
+    multiple=True,
+    help="Proxy to spread downloads across e.g socks5h://127.0.0.1:9050 - repeatable",
+)
+def fzseries(preconnect, cookie_jar, transport, proxy):
     """Unofficial Python SDK/API for fztvseries.live"""
-    pass
+    if proxy:
+        from fzseries_api.hunter import proxy_pool
+
+        for url in proxy:
+            proxy_pool.add(url)
+    if transport:
+        from fzseries_api.hunter import use_transport
+
+        use_transport(transport)
+    if cookie_jar:
+        from fzseries_api.hunter import persist_cookies
+
+        persist_cookies(cookie_jar)
+    if preconnect:
+        from threading import Thread
+        from fzseries_api.hunter import preconnect as preconnect_hosts
+
+        Thread(target=preconnect_hosts, daemon=True).start()
 
 
 class Commands:
@@ -52,6 +89,12 @@ class Commands:
         help="Episode number to start downloading from",
         default=1,
     )
+    @click.option(
+        "-R",
+        "--range",
+        "episode_range",
+        help="Episodes to download instead of offsets e.g S03E05-S04E02, S02,S05 or latest",
+    )
     @click.option(
         "-l",
         "--limit",
@@ -125,12 +168,57 @@ class Commands:
     @click.option(
         "--simple", is_flag=True, help="Show percentage and bar only in progressbar"
     )
+    @click.option(
+        "--check-space",
+        is_flag=True,
+        help="Ensure there is enough disk space for all episodes before starting",
+    )
+    @click.option(
+        "-m",
+        "--max-bandwidth",
+        help="Cap total download rate e.g 40MB (per second)",
+    )
+    @click.option(
+        "--bandwidth-file",
+        type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+        help="Share the bandwidth cap with other processes using this file",
+    )
+    @click.option(
+        "-w",
+        "--workers",
+        type=click.INT,
+        default=1,
+        help="Number of episodes to download in parallel - 1",
+    )
+    @click.option(
+        "--connections",
+        type=click.INT,
+        default=1,
+        help="Maximum parallel connections per episode file - 1",
+    )
+    @click.option(
+        "--if-locked",
+        type=click.Choice(["wait", "skip", "attach"]),
+        default="wait",
+        help="What to do with episodes another process is downloading - wait",
+    )
+    @click.option(
+        "-p",
+        "--format-policy",
+        help="Pick format per episode - smallest, fastest or prefer:<format>:<percent> e.g prefer:WEBM:10",
+    )
+    @click.option(
+        "--plan",
+        is_flag=True,
+        help="Estimate sizes, disk space and duration without downloading",
+    )
     def download(
         query,
         by,
         season_offset,
         episode_offset,
         limit,
+        episode_range,
         download_trials,
         request_timeout,
         format,
@@ -144,17 +232,87 @@ class Commands:
         ignore_errors,
         confirm,
         simple,
+        check_space,
+        max_bandwidth,
+        bandwidth_file,
+        workers,
+        connections,
+        if_locked,
+        format_policy,
+        plan,
     ):
         """Download a whole series|seasons|episodes automatically"""
         from fzseries_api import Auto
+        from fzseries_api.throttle import limiter
+        from fzseries_api.utils import parse_rate
+
+        if bandwidth_file:
+            limiter.use_file(bandwidth_file)
+        if max_bandwidth:
+            rate = parse_rate(max_bandwidth)
+            if not rate:
+                raise Exception(f"Unrecognised bandwidth '{max_bandwidth}'")
+            limiter.set_rate(rate)
 
         auto = Auto(query=query, by=by)
+        if plan:
+            import rich
+            from datetime import timedelta
+            from rich.table import Table
+
+            download_plan = auto.plan(
+                season_offset=season_offset,
+                episode_offset=episode_offset,
+                one_season_only=one_season_only,
+                limit=limit,
+                episode_range=episode_range,
+                format=format,
+                directory=directory,
+                include_metadata=include_metadata,
+                format_policy=format_policy,
+            )
+            plan_table = Table(show_lines=True, title="Download Plan")
+            plan_table.add_column("Season", justify="center", style="yellow")
+            plan_table.add_column("Episodes", justify="center", style="yellow")
+            plan_table.add_column("Size (MB)", justify="right", style="cyan")
+            plan_table.add_column("Remaining (MB)", justify="right", style="cyan")
+            plan_table.add_column("Unknown sizes", justify="center", style="red")
+            for season in download_plan.seasons:
+                plan_table.add_row(
+                    season.season,
+                    str(season.episodes),
+                    str(round(season.size / 1_000_000, 1)),
+                    str(round(season.remaining / 1_000_000, 1)),
+                    str(season.unknown_sizes or ""),
+                )
+            rich.print(plan_table)
+            for planned in download_plan.episodes:
+                if planned.error:
+                    click.secho(f"{planned.title} - {planned.error}", fg="red")
+            click.echo(
+                f"Remaining : {round(download_plan.remaining / 1_000_000, 1)} MB"
+                f" of {round(download_plan.size / 1_000_000, 1)} MB"
+            )
+            click.secho(
+                f"Free space : {round(download_plan.free_space / 1_000_000, 1)} MB",
+                fg="green" if download_plan.has_enough_space else "red",
+            )
+            if download_plan.eta is None:
+                click.echo("ETA : unknown - no download has been measured yet")
+            else:
+                click.echo(
+                    f"ETA : {timedelta(seconds=round(download_plan.eta))} at "
+                    f"{round(download_plan.throughput / 1_000_000, 2)} MB/s"
+                )
+            return
+
         auto.run(
             season_offset=season_offset,
             episode_offset=episode_offset,
             one_season_only=one_season_only,
             ignore_errors=ignore_errors,
             limit=limit,
+            episode_range=episode_range,
             download_trials=download_trials,
             timeout=request_timeout,
             format=format,
@@ -166,6 +324,11 @@ class Commands:
             include_metadata=include_metadata,
             confirm=confirm,
             simple=simple,
+            check_disk_space=check_space,
+            workers=workers,
+            connections=connections,
+            if_locked=if_locked,
+            format_policy=format_policy,
         )
 
     @click.command()
@@ -322,6 +485,366 @@ class Commands:
             if not all:
                 break
 
+    @click.command()
+    @click.argument(
+        "directory",
+        default=os.getcwd(),
+        type=click.Path(exists=True, file_okay=False, resolve_path=True),
+    )
+    @click.option(
+        "-w",
+        "--workers",
+        type=click.INT,
+        default=4,
+        help="Number of episodes verified concurrently - 4",
+    )
+    @click.option("--failed-only", is_flag=True, help="Show corrupted episodes only")
+    def verify(directory, workers, failed_only):
+        """Check downloaded episodes against their integrity manifests"""
+        import rich
+        from rich.table import Table
+        from fzseries_api.storage import verify_library
+
+        verify_table = Table(show_lines=True, title="Episodes Integrity")
+        verify_table.add_column("Episode", justify="left", style="cyan")
+        verify_table.add_column("Status", justify="center")
+        verify_table.add_column("Remarks", justify="left", style="yellow")
+        total = corrupted = 0
+        for path, is_intact, reason in verify_library(directory, workers=workers):
+            total += 1
+            if not is_intact:
+                corrupted += 1
+            elif failed_only:
+                continue
+            verify_table.add_row(
+                os.path.relpath(path, directory),
+                "[green]✅[/green]" if is_intact else "[red]❌[/red]",
+                reason,
+            )
+        rich.print(verify_table)
+        rich.print(f"Verified {total} episodes - {corrupted} corrupted")
+        if corrupted:
+            raise SystemExit(1)
+
+    @click.command()
+    @click.argument("query")
+    @click.option(
+        "-b",
+        "--by",
+        help="Query category",
+        type=click.Choice(["series", "episodes"]),
+        default="series",
+    )
+    @click.option(
+        "-s",
+        "--season-offset",
+        type=click.INT,
+        help="Season number to start resolving from",
+        default=1,
+    )
+    @click.option(
+        "-e",
+        "--episode-offset",
+        type=click.INT,
+        help="Episode number to start resolving from",
+        default=1,
+    )
+    @click.option(
+        "-R",
+        "--range",
+        "episode_range",
+        help="Episodes to resolve instead of offsets e.g S03E05-S04E02, S02,S05 or latest",
+    )
+    @click.option(
+        "-l",
+        "--limit",
+        type=click.INT,
+        default=1000000,
+        help="Number of proceeding episodes to resolve before stopping",
+    )
+    @click.option(
+        "-f",
+        "--format",
+        type=click.Choice(["High MP4", "WEBM"]),
+        default="High MP4",
+        help="Preffered movie download format",
+    )
+    @click.option(
+        "-d",
+        "--directory",
+        default=os.getcwd(),
+        help="Parent directory the external downloader saves contents in",
+        type=click.Path(file_okay=False, resolve_path=True),
+    )
+    @click.option(
+        "-o",
+        "--output",
+        type=click.File("w"),
+        default="-",
+        help="File to write the manifest to - stdout",
+    )
+    @click.option(
+        "-t",
+        "--output-format",
+        type=click.Choice(["aria2", "ndjson"]),
+        default="aria2",
+        help="Manifest format - aria2",
+    )
+    @click.option(
+        "-w",
+        "--workers",
+        type=click.INT,
+        default=4,
+        help="Number of episodes resolved in parallel - 4",
+    )
+    @click.option(
+        "--include_metadata",
+        is_flag=True,
+        help="Add series title and episode-id in filename",
+    )
+    @click.option(
+        "--one-season-only", is_flag=True, help="Resolve only one season and stop."
+    )
+    @click.option(
+        "--no-mirrors", is_flag=True, help="Resolve the preferred server's link only"
+    )
+    @click.option(
+        "--ignore-errors",
+        is_flag=True,
+        help="Skip episodes whose links could not be resolved",
+    )
+    def resolve(
+        query,
+        by,
+        season_offset,
+        episode_offset,
+        limit,
+        episode_range,
+        format,
+        directory,
+        output,
+        output_format,
+        workers,
+        include_metadata,
+        one_season_only,
+        no_mirrors,
+        ignore_errors,
+    ):
+        """Resolve download links for external downloaders e.g aria2c -i"""
+        from fzseries_api import Auto
+        from fzseries_api.export import write
+        from fzseries_api.hunter import session
+
+        auto = Auto(query=query, by=by)
+        count = write(
+            auto.resolve(
+                season_offset=season_offset,
+                episode_offset=episode_offset,
+                one_season_only=one_season_only,
+                limit=limit,
+                episode_range=episode_range,
+                workers=workers,
+                ignore_errors=ignore_errors,
+                format=format,
+                directory=directory,
+                include_metadata=include_metadata,
+                mirrors=not no_mirrors,
+            ),
+            output,
+            format=output_format,
+            headers={"User-Agent": session.headers["User-Agent"]},
+        )
+        click.secho(f"Resolved {count} episodes", err=True)
+
+    @click.command()
+    @click.argument("query")
+    @click.option(
+        "-i",
+        "--index",
+        type=click.INT,
+        default=1,
+        help="Position of the episode in search results - 1",
+    )
+    @click.option(
+        "-f",
+        "--format",
+        type=click.Choice(["High MP4", "WEBM"]),
+        default="High MP4",
+        help="Preffered movie download format",
+    )
+    @click.option(
+        "-o",
+        "--output",
+        type=click.File("wb"),
+        default="-",
+        help="File or pipe to write contents to - stdout",
+    )
+    @click.option(
+        "-b",
+        "--read-ahead",
+        type=click.FLOAT,
+        default=16,
+        help="Contents buffered ahead of the consumer in MB - 16",
+    )
+    @click.option(
+        "--reconnects",
+        type=click.INT,
+        default=10,
+        help="Consecutive failed reconnects before giving up - 10",
+    )
+    @click.option(
+        "-r",
+        "--request-timeout",
+        type=click.INT,
+        help="Http request timeout in seconds - 30",
+        default=30,
+    )
+    def stream(query, index, format, output, read_ahead, reconnects, request_timeout):
+        """Stream an episode to stdout e.g fzseries stream "Lost S01E01" | ffplay -"""
+        import sys
+        from fzseries_api import Search, Download
+
+        episode = Search(query, by="episodes").results.episodes[index - 1]
+        click.secho(episode.title, err=True)
+        try:
+            for chunk in Download(episode, format).stream(
+                read_ahead=read_ahead,
+                reconnects=reconnects,
+                timeout=request_timeout,
+            ):
+                output.write(chunk)
+            output.flush()
+        except BrokenPipeError:
+            # Consumer such as a player quit early - silence flushing at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+    @click.command()
+    @click.argument("query")
+    @click.option(
+        "-i",
+        "--index",
+        type=click.INT,
+        default=1,
+        help="Position of the episode in search results - 1",
+    )
+    @click.option(
+        "-f",
+        "--format",
+        type=click.Choice(["High MP4", "WEBM"]),
+        default="High MP4",
+        help="Preffered movie download format",
+    )
+    @click.option(
+        "-d",
+        "--directory",
+        default=os.getcwd(),
+        help="Parent directory for caching the episode",
+        type=click.Path(exists=True, file_okay=False, writable=True, resolve_path=True),
+    )
+    @click.option("--host", default="127.0.0.1", help="Interface to listen on")
+    @click.option(
+        "-p", "--port", type=click.INT, default=8080, help="Port to listen on - 8080"
+    )
+    @click.option(
+        "-c",
+        "--chunk-size",
+        type=click.FLOAT,
+        default=1,
+        help="Size fetched per upstream request in MB - 1",
+    )
+    @click.option(
+        "--read-ahead",
+        type=click.INT,
+        default=4,
+        help="Chunks prefetched past the one being played - 4",
+    )
+    @click.option(
+        "--no-promote",
+        is_flag=True,
+        help="Keep the cache instead of saving the episode once complete",
+    )
+    def proxy(
+        query, index, format, directory, host, port, chunk_size, read_ahead, no_promote
+    ):
+        """Serve an episode on localhost for seekable playback"""
+        from fzseries_api import Search
+        from fzseries_api.server import serve_episode
+
+        episode = Search(query, by="episodes").results.episodes[index - 1]
+        serve_episode(
+            episode,
+            format=format,
+            directory=directory,
+            host=host,
+            port=port,
+            chunk_size=int(chunk_size * 1_000_000),
+            read_ahead=read_ahead,
+            promote=not no_promote,
+            on_ready=lambda url: click.secho(
+                f"Serving {episode.title} on {url}", err=True
+            ),
+        )
+
+    @click.command()
+    @click.option("--host", default="127.0.0.1", help="Interface to listen on")
+    @click.option(
+        "-p", "--port", type=click.INT, default=8000, help="Port to listen on - 8000"
+    )
+    @click.option(
+        "-q",
+        "--queue-file",
+        type=click.Path(dir_okay=False),
+        help="Queue database for download jobs - ~/.fzseries/jobs.sqlite3",
+    )
+    @click.option(
+        "-w",
+        "--workers",
+        type=click.INT,
+        default=1,
+        help="Number of jobs to download in parallel - 0 disables downloading",
+    )
+    @click.option(
+        "--connections",
+        type=click.INT,
+        default=1,
+        help="Maximum parallel connections per episode file - 1",
+    )
+    @click.option(
+        "-d",
+        "--directory",
+        default=os.getcwd(),
+        help="Directory that queued jobs must be saved within",
+        type=click.Path(exists=True, file_okay=False, writable=True, resolve_path=True),
+    )
+    @click.option(
+        "--allow-host",
+        multiple=True,
+        help="Host name the API is reached at besides loopback e.g my-server - repeatable",
+    )
+    @click.option(
+        "--no-warm-up",
+        is_flag=True,
+        help="Do not bootstrap session and connections before serving",
+    )
+    def serve(
+        host, port, queue_file, workers, connections, directory, allow_host, no_warm_up
+    ):
+        """Serve search, metadata, links and download jobs as a local JSON API"""
+        from fzseries_api.jobs import JobQueue, default_queue_path
+        from fzseries_api.server import serve
+
+        click.secho(f"Serving on http://{host}:{port}", err=True)
+        serve(
+            host=host,
+            port=port,
+            warm_up=not no_warm_up,
+            queue=JobQueue(queue_file or default_queue_path),
+            workers=workers,
+            download_dir=directory,
+            allowed_hosts=allow_host,
+            connections=connections,
+        )
+
 
 class Utils:
     """Utility commands"""
@@ -339,9 +862,287 @@ class Utils:
         ),
     )
     def set_domain(domain):
-        """Set domain for making requests to"""
-        #    f'export FZSERIES_DEFAULT_SITE="{domain}"'
-        raise NotImplementedError("Function not yet implemented")
+        """Set preferred domain for making requests to"""
+        from fzseries_api.hunter import check_domains
+
+        if check_domains().get(domain) is None:
+            click.secho(f"{domain} is currently unreachable", fg="yellow", err=True)
+        click.secho(
+            "Run the following to prefer the domain - the rest are used on failover",
+            err=True,
+        )
+        click.echo(f'export FZSERIES_DEFAULT_SITE="{domain}"')
+
+    @staticmethod
+    @click.command()
+    def domains():
+        """Health-check domains and show their latency"""
+        import rich
+        from rich.table import Table
+        from fzseries_api.hunter import check_domains, router
+
+        check_domains()
+        domains_table = Table(show_lines=True, title="Domains")
+        domains_table.add_column("Domain", justify="left", style="cyan")
+        domains_table.add_column("Healthy", justify="center")
+        domains_table.add_column("Latency (ms)", justify="right", style="yellow")
+        for domain, stats in router.stats().items():
+            domains_table.add_row(
+                domain,
+                "[green]✅[/green]" if stats["healthy"] else "[red]❌[/red]",
+                str(round(stats["latency"] * 1000)) if stats["latency"] else "-",
+            )
+        rich.print(domains_table)
+
+
+class Jobs:
+    """Download queue commands"""
+
+    @staticmethod
+    @click.command()
+    @click.argument("query")
+    @click.option(
+        "-b",
+        "--by",
+        help="Query category",
+        type=click.Choice(["series", "episodes"]),
+        default="series",
+    )
+    @click.option(
+        "-s",
+        "--season-offset",
+        type=click.INT,
+        help="Season number to start queueing from",
+        default=1,
+    )
+    @click.option(
+        "-e",
+        "--episode-offset",
+        type=click.INT,
+        help="Episode number to start queueing from",
+        default=1,
+    )
+    @click.option(
+        "-R",
+        "--range",
+        "episode_range",
+        help="Episodes to queue instead of offsets e.g S03E05-S04E02, S02,S05 or latest",
+    )
+    @click.option(
+        "-l",
+        "--limit",
+        type=click.INT,
+        default=1000000,
+        help="Number of proceeding episodes to queue before stopping",
+    )
+    @click.option(
+        "-f",
+        "--format",
+        type=click.Choice(["High MP4", "WEBM"]),
+        default="High MP4",
+        help="Preffered movie download format",
+    )
+    @click.option(
+        "-d",
+        "--directory",
+        default=os.getcwd(),
+        help="Parent directory for saving the downloaded contents",
+        type=click.Path(exists=True, file_okay=False, writable=True, resolve_path=True),
+    )
+    @click.option(
+        "-p",
+        "--priority",
+        type=click.INT,
+        default=0,
+        help="Higher priority jobs run first - 0",
+    )
+    @click.option(
+        "-t",
+        "--max-attempts",
+        type=click.INT,
+        default=10,
+        help="Attempts before a job is marked failed - 10",
+    )
+    @click.option(
+        "--include_metadata",
+        is_flag=True,
+        help="Add series title and episode-id in filename",
+    )
+    @click.option(
+        "--one-season-only", is_flag=True, help="Queue only one season and stop."
+    )
+    @click.option(
+        "--fetch-size",
+        is_flag=True,
+        help="Look up file sizes now for smallest-first runs",
+    )
+    @click.pass_obj
+    def add(
+        queue_file,
+        query,
+        by,
+        season_offset,
+        episode_offset,
+        limit,
+        episode_range,
+        format,
+        directory,
+        priority,
+        max_attempts,
+        include_metadata,
+        one_season_only,
+        fetch_size,
+    ):
+        """Queue episodes of a series for download"""
+        from fzseries_api import Auto
+        from fzseries_api.jobs import JobQueue
+
+        auto = Auto(query=query, by=by)
+        added = JobQueue(queue_file).add(
+            auto.iter_episodes(
+                season_offset=season_offset,
+                episode_offset=episode_offset,
+                one_season_only=one_season_only,
+                limit=limit,
+                episode_range=episode_range,
+            ),
+            format=format,
+            directory=directory,
+            include_metadata=include_metadata,
+            priority=priority,
+            max_attempts=max_attempts,
+            fetch_size=fetch_size,
+        )
+        click.echo(f"Queued {len(added)} episodes")
+
+    @staticmethod
+    @click.command("list")
+    @click.option(
+        "-s",
+        "--state",
+        multiple=True,
+        type=click.Choice(["pending", "running", "done", "failed", "cancelled"]),
+        help="Show jobs in this state only - repeatable",
+    )
+    @click.pass_obj
+    def list_jobs(queue_file, state):
+        """Show queued jobs and their progress"""
+        import rich
+        from rich.table import Table
+        from fzseries_api.jobs import JobQueue
+        from fzseries_api.storage import DownloadLock
+
+        jobs_table = Table(show_lines=True, title="Download Queue")
+        jobs_table.add_column("Id", justify="center", style="yellow")
+        jobs_table.add_column("Episode", justify="left", style="cyan")
+        jobs_table.add_column("State", justify="center")
+        jobs_table.add_column("Priority", justify="center", style="yellow")
+        jobs_table.add_column("Progress (MB)", justify="right", style="yellow")
+        jobs_table.add_column("Attempts", justify="center", style="yellow")
+        jobs_table.add_column("Error", justify="left", style="red")
+        for job in JobQueue(queue_file).jobs(state or None):
+            downloaded = job.downloaded
+            if job.state == "running":
+                owner = DownloadLock(job.path).owner()
+                downloaded = owner.downloaded if owner else downloaded
+            jobs_table.add_row(
+                str(job.id),
+                job.title,
+                job.state,
+                str(job.priority),
+                f"{round(downloaded / 1_000_000, 1)}/"
+                + (str(round(job.size / 1_000_000, 1)) if job.size else "?"),
+                f"{job.attempts}/{job.max_attempts}",
+                job.error or "",
+            )
+        rich.print(jobs_table)
+
+    @staticmethod
+    @click.command()
+    @click.option(
+        "-w",
+        "--workers",
+        type=click.INT,
+        default=1,
+        help="Number of jobs to run in parallel - 1",
+    )
+    @click.option(
+        "-o",
+        "--order",
+        type=click.Choice(["priority", "smallest"]),
+        default="priority",
+        help="Which job goes next - priority",
+    )
+    @click.option(
+        "-r",
+        "--request-timeout",
+        type=click.INT,
+        help="Http request timeout while downloading episodes in seconds.",
+        default=30 * 60,
+    )
+    @click.option(
+        "--connections",
+        type=click.INT,
+        default=1,
+        help="Maximum parallel connections per episode file - 1",
+    )
+    @click.option(
+        "--enable-progressbar/--disable-progressbar",
+        default=True,
+        help="Show or hide downloading progress bar - True",
+    )
+    @click.option(
+        "--if-locked",
+        type=click.Choice(["wait", "skip", "attach"]),
+        default="wait",
+        help="What to do with episodes another process is downloading - wait",
+    )
+    @click.pass_obj
+    def run(
+        queue_file,
+        workers,
+        order,
+        request_timeout,
+        connections,
+        enable_progressbar,
+        if_locked,
+    ):
+        """Download queued episodes - resumes where the last run stopped"""
+        from fzseries_api.jobs import JobQueue
+
+        executed = JobQueue(queue_file).run(
+            workers=workers,
+            order=order,
+            timeout=request_timeout,
+            connections=connections,
+            progress_bar=enable_progressbar,
+            leave=False,
+            if_locked=if_locked,
+        )
+        done = sum(job.state == "done" for job in executed)
+        click.echo(f"Ran {len(executed)} jobs - {done} done")
+
+    @staticmethod
+    @click.command()
+    @click.argument("ids", nargs=-1, type=click.INT)
+    @click.pass_obj
+    def retry(queue_file, ids):
+        """Queue failed or cancelled jobs again - all failed ones if no id is given"""
+        from fzseries_api.jobs import JobQueue
+
+        count = JobQueue(queue_file).retry(ids or None)
+        click.echo(f"Queued {count} jobs again")
+
+    @staticmethod
+    @click.command()
+    @click.argument("ids", nargs=-1, type=click.INT, required=True)
+    @click.pass_obj
+    def cancel(queue_file, ids):
+        """Drop jobs from the queue"""
+        from fzseries_api.jobs import JobQueue
+
+        count = JobQueue(queue_file).cancel(ids)
+        click.echo(f"Cancelled {count} jobs")
 
 
 class EntryGroup:
@@ -353,6 +1154,21 @@ class EntryGroup:
         """Utility commands for fzseries"""
         pass
 
+    @staticmethod
+    @fzseries.group()
+    @click.option(
+        "-q",
+        "--queue-file",
+        type=click.Path(dir_okay=False),
+        help="Queue database - ~/.fzseries/jobs.sqlite3",
+    )
+    @click.pass_context
+    def queue(ctx, queue_file):
+        """Persistent download queue"""
+        from fzseries_api.jobs import default_queue_path
+
+        ctx.obj = queue_file or default_queue_path
+
 
 def main():
     """Console entrypoint"""
@@ -360,7 +1176,18 @@ def main():
         fzseries.add_command(Commands.download)
         fzseries.add_command(Commands.metadata)
         fzseries.add_command(Commands.discover)
+        fzseries.add_command(Commands.verify)
+        fzseries.add_command(Commands.serve)
+        fzseries.add_command(Commands.stream)
+        fzseries.add_command(Commands.proxy)
+        fzseries.add_command(Commands.resolve)
         EntryGroup.utils.add_command(Utils.set_domain)
+        EntryGroup.utils.add_command(Utils.domains)
+        EntryGroup.queue.add_command(Jobs.add)
+        EntryGroup.queue.add_command(Jobs.list_jobs)
+        EntryGroup.queue.add_command(Jobs.run)
+        EntryGroup.queue.add_command(Jobs.retry)
+        EntryGroup.queue.add_command(Jobs.cancel)
         fzseries()
     except Exception as e:
         click.secho(
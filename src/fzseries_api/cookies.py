@@ -0,0 +1,113 @@
+"""
+This module persists session cookies to disk so that
+short-lived invocations reuse the `PHPSESSID` obtained by
+an earlier one instead of bootstrapping a new session.
+"""
+
+import copy
+import os
+import time
+import typing as t
+from http.cookiejar import Cookie, CookieJar, LWPCookieJar, LoadError
+from pathlib import Path
+from fzseries_api import logger
+from fzseries_api.storage import FileLock
+
+session_cookie_lifetime = 6 * 60 * 60
+"""Seconds a cookie without expiry (browser-session cookie) is kept on disk"""
+
+
+class CookieStore:
+    """Cookie jar file shared by concurrent processes.
+
+    Cookies are kept per domain with their expiry; those lacking one
+    expire `session_cookie_lifetime` seconds after being saved. Reads
+    and writes happen under a lock file next to the jar and saving
+    merges with what other processes have saved meanwhile.
+    """
+
+    def __init__(self, path: str | Path, lifetime: float = session_cookie_lifetime):
+        """Initializes `CookieStore`
+
+        Args:
+            path (str | Path): Path to the cookie jar file.
+            lifetime (float, optional): Seconds to keep cookies without expiry. Defaults to `session_cookie_lifetime`.
+        """
+        self.path = Path(path).expanduser()
+        self.lifetime = lifetime
+        self.lock = FileLock(self.path.with_name(f".{self.path.name}.lock"))
+
+    def __str__(self):
+        return f'<fzseries_api.cookies.CookieStore path="{self.path}">'
+
+    def _read(self) -> LWPCookieJar:
+        jar = LWPCookieJar(self.path)
+        if self.path.exists():
+            try:
+                jar.load(ignore_discard=True)
+            except (LoadError, OSError) as e:
+                logger.debug(f"Ignoring unreadable cookie jar {self.path} - {e}")
+        jar.clear_expired_cookies()
+        return jar
+
+    def load(self, jar: CookieJar) -> int:
+        """Add saved cookies that are yet to expire to jar
+
+        Args:
+            jar (CookieJar): Cookie jar such as `requests.Session.cookies`.
+
+        Returns:
+            int: Number of cookies loaded.
+        """
+        with self.lock:
+            saved = list(self._read())
+        for cookie in saved:
+            jar.set_cookie(cookie)
+        return len(saved)
+
+    def save(self, jar: CookieJar) -> int:
+        """Merge cookies of jar into the saved ones
+
+        Args:
+            jar (CookieJar): Cookie jar such as `requests.Session.cookies`.
+
+        Returns:
+            int: Number of cookies saved.
+        """
+        expires = int(time.time() + self.lifetime)
+        with self.lock:
+            saved = self._read()
+            for cookie in jar:
+                if cookie.is_expired():
+                    continue
+                if cookie.expires is None:
+                    cookie = copy.copy(cookie)
+                    cookie.expires, cookie.discard = expires, False
+                saved.set_cookie(cookie)
+            self._write(saved)
+            return len(saved)
+
+    def discard(self, matches: t.Callable[[Cookie], bool]) -> int:
+        """Remove saved cookies such as a session the server has dropped
+
+        Args:
+            matches (t.Callable[[Cookie], bool]): Returns True for cookies to remove.
+
+        Returns:
+            int: Number of cookies removed.
+        """
+        with self.lock:
+            saved = self._read()
+            stale = [cookie for cookie in saved if matches(cookie)]
+            for cookie in stale:
+                saved.clear(cookie.domain, cookie.path, cookie.name)
+            if stale:
+                self._write(saved)
+            return len(stale)
+
+    def _write(self, jar: LWPCookieJar):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f".{self.path.name}.tmp")
+        jar.save(temporary, ignore_discard=True)
+        os.chmod(temporary, 0o600)
+        os.replace(temporary, self.path)
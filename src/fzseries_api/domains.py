@@ -0,0 +1,144 @@
+"""
+This module routes requests across the different
+domains providing the same service - `utils.available_site_urls`.
+Domains are ranked by measured latency and the ones
+failing are skipped for a while.
+"""
+
+import threading
+import time
+import typing as t
+from urllib.parse import urlparse, urlunparse
+import fzseries_api.utils as utils
+
+
+class DomainRouter:
+    """Picks the fastest healthy domain and rewrites urls between domains"""
+
+    def __init__(
+        self,
+        domains: t.Iterable[str] = utils.available_site_urls,
+        preferred: str = utils.default_site_url,
+        cooldown: float = 120.0,
+        probe_interval: float = 600.0,
+        smoothing: float = 0.3,
+    ):
+        """Initializes `DomainRouter`
+
+        Args:
+            domains (t.Iterable[str], optional): Domains serving the same catalogue. Defaults to `utils.available_site_urls`.
+            preferred (str, optional): Domain used until latencies are measured. Defaults to `utils.default_site_url`.
+            cooldown (float, optional): Seconds a failing domain is skipped for. Defaults to 120.0.
+            probe_interval (float, optional): Seconds after which latencies are considered stale. Defaults to 600.0.
+            smoothing (float, optional): Weight of the newest latency sample. Defaults to 0.3.
+        """
+        self.domains = tuple(domains)
+        utils.assert_membership(preferred, self.domains, "Preferred domain")
+        self.preferred = preferred
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.smoothing = smoothing
+        self.failover = True
+        """Route to other domains when the preferred one fails"""
+        self.latencies: dict[str, float] = {}
+        self.failed_at: dict[str, float] = {}
+        self.probed_at: float | None = None
+        self._netlocs = {urlparse(domain).netloc: domain for domain in self.domains}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f'<fzseries_api.domains.DomainRouter active="{self.active()}">'
+
+    def is_healthy(self, domain: str) -> bool:
+        """Checks the domain has not failed within the cooldown period"""
+        failed_at = self.failed_at.get(domain)
+        return failed_at is None or time.monotonic() - failed_at >= self.cooldown
+
+    def candidates(self) -> list[str]:
+        """Domains in the order they should be tried - healthy ones
+        by latency, preferred first among equals and failing ones last"""
+        if not self.failover:
+            return [self.preferred]
+        with self._lock:
+            return sorted(
+                self.domains,
+                key=lambda domain: (
+                    not self.is_healthy(domain),
+                    self.latencies.get(domain, float("inf")),
+                    domain != self.preferred,
+                    self.failed_at.get(domain, 0),
+                ),
+            )
+
+    def active(self) -> str:
+        """Domain requests are currently routed to"""
+        return self.candidates()[0]
+
+    def is_stale(self) -> bool:
+        """Checks whether latencies need to be measured again"""
+        return (
+            self.probed_at is None
+            or time.monotonic() - self.probed_at >= self.probe_interval
+        )
+
+    def record_success(self, domain: str, latency: float | None = None):
+        """Mark domain healthy and update its smoothed latency"""
+        with self._lock:
+            self.failed_at.pop(domain, None)
+            if latency is not None:
+                previous = self.latencies.get(domain)
+                self.latencies[domain] = (
+                    latency
+                    if previous is None
+                    else previous + self.smoothing * (latency - previous)
+                )
+
+    def record_failure(self, domain: str):
+        """Skip domain until the cooldown elapses"""
+        with self._lock:
+            self.failed_at[domain] = time.monotonic()
+
+    def update(self, latencies: dict[str, float | None]):
+        """Apply results of a health-check
+
+        Args:
+            latencies (dict[str, float | None]): Seconds taken by each domain - None on failure.
+        """
+        for domain, latency in latencies.items():
+            if latency is None:
+                self.record_failure(domain)
+            else:
+                self.record_success(domain, latency)
+        self.probed_at = time.monotonic()
+
+    def domain_of(self, url: str) -> str | None:
+        """Domain the url belongs to - None for foreign urls such as file mirrors"""
+        return self._netlocs.get(urlparse(str(url)).netloc)
+
+    def rewrite(self, url: str, domain: str | None = None) -> str:
+        """Point url of one domain to another
+
+        Args:
+            url (str): Url belonging to any of the domains.
+            domain (str | None, optional): Target domain. Defaults to `active()`.
+
+        Returns:
+            str: Rewritten url - foreign urls are returned unchanged.
+        """
+        url = str(url)
+        if self.domain_of(url) is None:
+            return url
+        target = urlparse(domain or self.active())
+        return urlunparse(
+            urlparse(url)._replace(scheme=target.scheme, netloc=target.netloc)
+        )
+
+    def stats(self) -> dict[str, dict[str, t.Any]]:
+        """Health and latency of every domain"""
+        return {
+            domain: dict(
+                healthy=self.is_healthy(domain),
+                latency=self.latencies.get(domain),
+            )
+            for domain in self.candidates()
+        }
@@ -36,3 +36,79 @@ class TargetPageURLNotFound(Exception):
     """The page to navigate to has `null` as its url"""
 
     pass
+
+
+class InsufficientDiskSpace(Exception):
+    """Free disk space is less than what the downloads require"""
+
+    def __init__(self, required: int, available: int, message: str | None = None):
+        """Initializer
+
+        Args:
+            required (int): Bytes required.
+            available (int): Bytes available.
+            message (str | None, optional): Exception message. Defaults to None.
+        """
+        super().__init__(
+            message
+            if message
+            else (
+                f"Downloads require {round(required / 1_000_000, 1)} MB but only "
+                f"{round(available / 1_000_000, 1)} MB is available"
+            )
+        )
+        self.required = required
+        self.available = available
+
+
+class CircuitOpen(Exception):
+    """Host is considered down - requests to it are failing fast"""
+
+    def __init__(self, host: str, retry_in: float, message: str | None = None):
+        """Initializer
+
+        Args:
+            host (str): Host name.
+            retry_in (float): Seconds until a trial request is allowed.
+            message (str | None, optional): Exception message. Defaults to None.
+        """
+        super().__init__(
+            message
+            if message
+            else f"Host '{host}' is down - retry in {round(retry_in, 1)} seconds"
+        )
+        self.host = host
+        self.retry_in = retry_in
+
+
+class DownloadInProgress(Exception):
+    """Another process is downloading the same episode file"""
+
+    def __init__(self, path: str, pid: int | None = None, message: str | None = None):
+        """Initializer
+
+        Args:
+            path (str): Path to the episode.
+            pid (int | None, optional): Process holding the download lock. Defaults to None.
+            message (str | None, optional): Exception message. Defaults to None.
+        """
+        super().__init__(
+            message
+            if message
+            else f"'{path}' is being downloaded by another process"
+            + (f" (pid {pid})" if pid else "")
+        )
+        self.path = path
+        self.pid = pid
+
+
+class DownloadStopped(Exception):
+    """Download was stopped before completing - the partial file is resumed later"""
+
+    def __init__(self, path: str):
+        """Initializer
+
+        Args:
+            path (str): Path to the episode.
+        """
+        super().__init__(f"Download of '{path}' was stopped")
@@ -0,0 +1,87 @@
+"""
+This module writes episodes resolved by `Auto.resolve` in
+formats external download engines take:
+- aria2 - input file for `aria2c --input-file`
+- ndjson - a JSON object per line for custom tooling
+"""
+
+import typing as t
+from pathlib import Path
+import fzseries_api.models as models
+import fzseries_api.utils as utils
+from fzseries_api import logger
+
+export_formats = ("aria2", "ndjson")
+"""Supported output formats"""
+
+
+def aria2_entry(
+    episode: models.ResolvedEpisode, headers: dict[str, str] | None = None
+) -> str:
+    """Entry of an aria2 input file - mirrors are tab-separated
+    alternatives of the same file
+
+    Args:
+        episode (models.ResolvedEpisode): Resolved episode.
+        headers (dict[str, str] | None, optional): Http headers to send e.g `User-Agent`. Defaults to None.
+
+    Returns:
+        str: Entry lines
+    """
+    path = Path(episode.path)
+    size = (
+        f"{round(episode.size / 1_000_000, 1)} MB" if episode.size else "size unknown"
+    )
+    lines = [
+        f"# {episode.title} - {size}, expires {episode.expires_on.isoformat(timespec='seconds')}",
+        "\t".join([episode.url, *episode.mirrors]),
+        f"  dir={path.parent}",
+        f"  out={path.name}",
+    ]
+    if episode.proxy and episode.proxy.lower().startswith("socks"):
+        logger.warning(
+            f"Omitting proxy {episode.proxy} of {episode.title} - "
+            "aria2 supports HTTP proxies only"
+        )
+    elif episode.proxy:
+        # Download keys are bound to the IP that requested them
+        lines.append(f"  all-proxy={episode.proxy}")
+    for name, value in (headers or {}).items():
+        lines.append(f"  header={name}: {value}")
+    return "\n".join(lines) + "\n"
+
+
+def ndjson_entry(episode: models.ResolvedEpisode) -> str:
+    """Episode as a single JSON line"""
+    return episode.model_dump_json() + "\n"
+
+
+def write(
+    episodes: t.Iterable[models.ResolvedEpisode],
+    output: t.TextIO,
+    format: t.Literal["aria2", "ndjson"] = "aria2",
+    headers: dict[str, str] | None = None,
+) -> int:
+    """Write resolved episodes as they come
+
+    Args:
+        episodes (t.Iterable[models.ResolvedEpisode]): Resolved episodes.
+        output (t.TextIO): File to write to.
+        format (t.Literal["aria2", "ndjson"], optional): Output format. Defaults to "aria2".
+        headers (dict[str, str] | None, optional): Http headers for aria2 entries. Defaults to None.
+
+    Returns:
+        int: Episodes written
+    """
+    utils.assert_membership(format, export_formats, "Format")
+    count = 0
+    for episode in episodes:
+        output.write(
+            aria2_entry(episode, headers)
+            if format == "aria2"
+            else ndjson_entry(episode)
+        )
+        # Consumers may start on entries while the rest resolve
+        output.flush()
+        count += 1
+    return count
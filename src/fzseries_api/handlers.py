@@ -7,9 +7,11 @@ import re
 import fzseries_api.utils as utils
 import fzseries_api.models as models
 import fzseries_api.exceptions as exceptions
+from fzseries_api.cache import parsed_cache
 from datetime import datetime
 
 
+@parsed_cache.memoize
 def search_results_handler(contents: str) -> models.SearchResults:
     """Extract series from search results page
 
@@ -67,6 +69,7 @@ def search_results_handler(contents: str) -> models.SearchResults:
         raise exceptions.ZeroSearchResults("Search query returned zero results")
 
 
+@parsed_cache.memoize
 def episode_search_results_handler(contents: str) -> models.EpisodeSearchResults:
     """Extract series from episode search results page
 
@@ -166,6 +169,7 @@ def episode_search_results_handler(contents: str) -> models.EpisodeSearchResults
         raise exceptions.ZeroSearchResults("Search query returned zero results")
 
 
+@parsed_cache.memoize
 def tvseries_page_handler(contents: str) -> models.TVSeries:
     """Extract tvseries metadata from page
 
@@ -1,6 +1,6 @@
 """
 This module does the ground-work of interacting
-with fzseries.live in fetching the required resources 
+with fzseries.live in fetching the required resources
 that revolves around:
 - Load index page
 - Perform search
@@ -9,11 +9,26 @@ that revolves around:
 - Select link
 """
 
+import atexit
+import os
 import requests
 import re
+import threading
+import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import Cookie
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 import fzseries_api.utils as utils
 import fzseries_api.exceptions as exceptions
+from fzseries_api.resilience import RetryPolicy, CircuitBreaker
+from fzseries_api.domains import DomainRouter
+from fzseries_api.throttle import scheduler
+from fzseries_api.cache import Singleflight, request_key, response_cache
+from fzseries_api.cookies import CookieStore
+import fzseries_api.transport as transports
+from fzseries_api.proxies import ProxyPool
 from fzseries_api import logger
 
 session = requests.Session()
@@ -24,12 +39,326 @@ headers = {
     "Accept-Encoding": "gzip, deflate, br",
     "Accept-Language": "en-US,en;q=0.9",
     "referer": utils.default_site_url,
+    "Connection": "keep-alive",
 }
 
 session.headers.update(headers)
 
 request_timeout = 20
 
+metadata_pool_size = 10
+"""Connections kept alive per metadata domain"""
+
+mirror_pool_size = 16
+"""Connections kept alive per file mirror host"""
+
+mirror_pool_hosts = 32
+"""File mirror hosts whose connections are kept alive"""
+
+
+def configure_pool(
+    metadata_pool_size: int = metadata_pool_size,
+    mirror_pool_size: int = mirror_pool_size,
+    mirror_pool_hosts: int = mirror_pool_hosts,
+    block: bool = False,
+):
+    """Size connection pools of the session for the metadata domains
+    and the file mirrors
+
+    Args:
+        metadata_pool_size (int, optional): Connections kept alive per metadata domain. Defaults to 10.
+        mirror_pool_size (int, optional): Connections kept alive per mirror host. Defaults to 16.
+        mirror_pool_hosts (int, optional): Mirror hosts whose connections are kept alive. Defaults to 32.
+        block (bool, optional): Wait for a free connection instead of opening a throwaway one. Defaults to False.
+    """
+    mirror_adapter = HTTPAdapter(
+        pool_connections=mirror_pool_hosts,
+        pool_maxsize=mirror_pool_size,
+        pool_block=block,
+    )
+    session.mount("https://", mirror_adapter)
+    session.mount("http://", mirror_adapter)
+    for site_url in utils.available_site_urls:
+        session.mount(
+            site_url,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=metadata_pool_size,
+                pool_block=block,
+            ),
+        )
+
+
+def preconnect(
+    urls: t.Iterable[str] = utils.available_site_urls,
+    connections: int = 1,
+    timeout: int = request_timeout,
+) -> dict[str, float | None]:
+    """Warm up connections (TCP + TLS) to hosts in parallel ahead of use
+
+    Args:
+        urls (t.Iterable[str], optional): Urls to the hosts. Defaults to `utils.available_site_urls`.
+        connections (int, optional): Connections to open per host. Defaults to 1.
+        timeout (int, optional): Http request timeout. Defaults to `request_timeout`.
+
+    Returns:
+        dict[str, float | None]: Seconds taken to connect to each url - None on failure.
+    """
+    urls = list(urls)
+
+    def connect(url: str) -> float | None:
+        started = time.monotonic()
+        try:
+            resp = transport.head(url, timeout=timeout)
+            resp.close()
+        except requests.RequestException as e:
+            logger.debug(f"Failed to preconnect to {url} - {e}")
+            return None
+        if resp.status_code >= 500:
+            return None
+        return time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=max(len(urls) * connections, 1)) as executor:
+        latencies = list(executor.map(connect, urls * connections))
+    return dict(zip(urls, latencies))
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """Utilization of the session's connection pools
+
+    Returns:
+        dict[str, dict[str, int]]: Pool stats keyed by host url.
+    """
+    stats = {}
+    for poolmanager in transport.pool_managers():
+        pools = poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            idle = pool.pool.qsize() if pool.pool is not None else 0
+            stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = dict(
+                maxsize=pool.pool.maxsize if pool.pool is not None else 0,
+                idle=idle,
+                connections_opened=pool.num_connections,
+                requests=pool.num_requests,
+            )
+    return stats
+
+
+configure_pool()
+
+transport: transports.Transport = transports.RequestsTransport(session)
+"""Backend sending requests of `session` - see `use_transport`"""
+
+
+def use_transport(name: str, **kwargs) -> transports.Transport:
+    """Switch the backend sending requests
+
+    Args:
+        name (str): Backend name - one of `transport.transports`.
+
+    Returns:
+        transports.Transport: The new backend.
+    """
+    global transport
+    previous, transport = transport, transports.create(name, session, **kwargs)
+    if previous.name != transports.RequestsTransport.name:
+        previous.close()
+    return transport
+
+
+if os.getenv("FZSERIES_TRANSPORT"):
+    use_transport(os.getenv("FZSERIES_TRANSPORT"))
+
+default_retry_policy = RetryPolicy()
+"""Retry policy for hosts without a specific one"""
+
+retry_policies: dict[str, RetryPolicy] = {}
+"""Host specific retry policies e.g `{"tvseries.in": RetryPolicy(total=5)}`"""
+
+circuit_breaker = CircuitBreaker()
+"""Fast-fails requests to hosts considered down"""
+
+
+router = DomainRouter()
+"""Routes requests to the fastest healthy domain"""
+
+singleflight = Singleflight()
+"""Coalesces identical metadata requests in flight"""
+
+proxy_pool = ProxyPool(
+    proxy.strip()
+    for proxy in os.getenv("FZSERIES_PROXIES", "").split(",")
+    if proxy.strip()
+)
+"""Proxies downloads are spread across - requests go direct while empty"""
+
+_probe_lock = threading.Lock()
+
+
+def check_domains(timeout: int = request_timeout) -> dict[str, float | None]:
+    """Health-check and measure latency to all domains in parallel
+
+    Args:
+        timeout (int, optional): Http request timeout. Defaults to `request_timeout`.
+
+    Returns:
+        dict[str, float | None]: Seconds taken by each domain - None on failure.
+    """
+    latencies = preconnect(router.domains, timeout=timeout)
+    router.update(latencies)
+    return latencies
+
+
+def _check_domains_in_background():
+    if router.is_stale() and _probe_lock.acquire(blocking=False):
+
+        def probe():
+            try:
+                check_domains()
+            finally:
+                _probe_lock.release()
+
+        threading.Thread(target=probe, daemon=True).start()
+
+
+def _is_session_cookie(cookie: Cookie, site_url: str) -> bool:
+    return cookie.name == "PHPSESSID" and urlparse(site_url).netloc.endswith(
+        cookie.domain.lstrip(".")
+    )
+
+
+def has_session(site_url: str) -> bool:
+    """Checks whether the session holds unexpired `PHPSESSID` cookie for the domain"""
+    return any(
+        _is_session_cookie(cookie, site_url) and not cookie.is_expired()
+        for cookie in session.cookies
+    )
+
+
+def discard_session(site_url: str):
+    """Drop `PHPSESSID` cookie of the domain from the session and `cookie_store`
+    so that the next request bootstraps a new session
+
+    Args:
+        site_url (str): Domain whose session the server has dropped.
+    """
+    for cookie in list(session.cookies):
+        if _is_session_cookie(cookie, site_url):
+            session.cookies.clear(cookie.domain, cookie.path, cookie.name)
+    if cookie_store is not None:
+        try:
+            cookie_store.discard(lambda cookie: _is_session_cookie(cookie, site_url))
+        except OSError as e:
+            logger.debug(f"Failed to discard cookies in {cookie_store.path} - {e}")
+
+
+cookie_store: CookieStore | None = None
+"""Persists session cookies across runs - see `persist_cookies`"""
+
+
+def persist_cookies(path: str | None):
+    """Load session cookies saved at path and save them back
+    on exit and whenever a new session is bootstrapped
+
+    Args:
+        path (str | None): Path to the cookie jar file - None to stop persisting.
+    """
+    global cookie_store
+    if path is None:
+        cookie_store = None
+        return
+    cookie_store = CookieStore(path)
+    loaded = cookie_store.load(session.cookies)
+    logger.debug(f"Loaded {loaded} cookies from {cookie_store.path}")
+
+
+def save_cookies():
+    """Save session cookies to `cookie_store` if any"""
+    if cookie_store is not None:
+        try:
+            cookie_store.save(session.cookies)
+        except OSError as e:
+            logger.debug(f"Failed to save cookies to {cookie_store.path} - {e}")
+
+
+atexit.register(save_cookies)
+
+if os.getenv("FZSERIES_COOKIE_JAR"):
+    persist_cookies(os.getenv("FZSERIES_COOKIE_JAR"))
+
+
+def fetch(
+    url: str,
+    timeout: int = request_timeout,
+    *args,
+    priority: int | None = None,
+    **kwargs,
+) -> requests.Response:
+    """Perform idempotent GET request retrying on transient failures.
+    Backs off exponentially with jitter, honours `Retry-After` and
+    fast-fails through `circuit_breaker` while the host is down.
+    Every attempt waits for its turn in `scheduler` and goes through
+    the proxy pinned to the current thread by `proxy_pool` if any.
+
+    Args:
+        url (str): Url to resource.
+        timeout (int, optional): Http request timeout. Defaults to `request_timeout`.
+        priority (int | None, optional): `throttle.Priority` of the request. Defaults to that of the current thread.
+
+    Raises:
+        exceptions.CircuitOpen: Host is considered down.
+
+    Returns:
+        requests.Response: The last response received.
+    """
+    host = urlparse(url).netloc
+    policy = retry_policies.get(host, default_retry_policy)
+    proxy = proxy_pool.current()
+    if proxy:
+        kwargs.setdefault("proxies", proxy_pool.as_proxies(proxy))
+    attempt = 0
+    while True:
+        circuit_breaker.before_request(host)
+        try:
+            scheduler.acquire(host, priority)
+        except BaseException:
+            # A half-open trial must not be left pending forever
+            circuit_breaker.discard_trial(host)
+            raise
+        status_code = None
+        try:
+            resp = transport.get(url, *args, timeout=timeout, **kwargs)
+            status_code = resp.status_code
+        except policy.retryable_exceptions as e:
+            circuit_breaker.record_failure(host)
+            if proxy:
+                proxy_pool.record_failure(proxy)
+            delay = policy.backoff(attempt) if attempt < policy.total else None
+            if delay is None:
+                raise e
+            logger.debug(f"Retrying {url} in {round(delay, 2)}s - {e}")
+        except BaseException:
+            circuit_breaker.discard_trial(host)
+            raise
+        else:
+            if not policy.is_retryable(resp.status_code):
+                circuit_breaker.record_success(host)
+                return resp
+            circuit_breaker.record_failure(host)
+            delay = policy.backoff(attempt, resp) if attempt < policy.total else None
+            if delay is None:
+                return resp
+            logger.debug(
+                f"Retrying {url} in {round(delay, 2)}s - ({resp.status_code} : {resp.reason})"
+            )
+            resp.close()
+        finally:
+            scheduler.release(host, status_code)
+        time.sleep(delay)
+        attempt += 1
+
 
 class Index:
     """Accesses site's homepage"""
@@ -37,12 +366,35 @@ class Index:
     session_is_initialized = False
     search_by_options = ("series", "episodes")
 
-    def __init__(self):
-        """Initializes `Index`"""
-        if not self.session_is_initialized:
-            load_index_resp = session.get(
-                utils.default_site_url, timeout=request_timeout
-            )
+    def __init__(self, site_url: str | None = None):
+        """Initializes `Index`
+
+        Args:
+            site_url (str | None, optional): Domain to load. Defaults to fastest healthy one - failing over to the rest.
+        """
+        self.index_resp = None
+        if not (
+            self.session_is_initialized or has_session(site_url or router.active())
+        ):
+            load_index_resp = None
+            for site_url in [site_url] if site_url else router.candidates():
+                try:
+                    load_index_resp = fetch(site_url, timeout=request_timeout)
+                except (requests.RequestException, exceptions.CircuitOpen) as e:
+                    logger.debug(f"Failed to load {site_url} - {e}")
+                    router.record_failure(site_url)
+                    continue
+                if load_index_resp.ok:
+                    router.record_success(
+                        site_url, load_index_resp.elapsed.total_seconds()
+                    )
+                    break
+                router.record_failure(site_url)
+
+            if load_index_resp is None:
+                raise exceptions.LoadIndexError(
+                    "Failed to load index page - all domains are unreachable"
+                )
             if not load_index_resp.ok:
                 logger.debug(
                     f"Headers - {load_index_resp.headers} \nResponse - {load_index_resp.text}"
@@ -51,9 +403,10 @@ class Index:
                     f"Failed to load index page - ({load_index_resp.status_code} : {load_index_resp.reason})"
                 )
             self.index_resp = load_index_resp
+            save_cookies()
 
     def __str__(self):
-        return f"<fzseries_api.hunter.Index_{self.index_resp.reason}>"
+        return f"<fzseries_api.hunter.Index_{self.index_resp.reason if self.index_resp else 'Resumed'}>"
 
     def search(self, query: str, by: t.Literal["series", "episodes"] = "series") -> str:
         """Perform initial series|episode search
@@ -75,6 +428,7 @@ class Index:
                 vsearch="",
                 by=by,
             ),
+            cacheable=True,
         ).text
 
 
@@ -95,14 +449,64 @@ class Metadata:
         Args:
             timeout (int): Http request timeout
             url (str): Url to resource
+            priority (int, optional): `throttle.Priority` of the request - keyword only
+            cacheable (bool, optional): Keep response in `cache.response_cache` - keyword only
+
+        Identical requests made concurrently share a single network call.
         """
-        if not session.cookies.get("PHPSESSID"):
-            logger.debug("Initializing session")
-            Index()
-        resp = session.get(url, timeout=timeout, *args, **kwargs)
+        if kwargs.get("stream"):
+            return cls._get_resource(url, timeout, *args, **kwargs)
+        return singleflight.do(
+            (request_key(url, *args, **kwargs), proxy_pool.current()),
+            cls._get_resource,
+            url,
+            timeout,
+            *args,
+            **kwargs,
+        )
+
+    @classmethod
+    def _get_resource(
+        cls,
+        url: str,
+        timeout: int = request_timeout,
+        *args,
+        renew_session: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        cached = None
+        cacheable = kwargs.pop("cacheable", False)
+        request_kwargs = dict(kwargs)
+        if cacheable:
+            key = request_key(url, *args, **kwargs)
+            cached = response_cache.get(key)
+            if cached is not None and cached.is_fresh():
+                return cached.response
+            if cached is not None:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **cached.validators()}
+        if router.domain_of(url) is None:
+            resp = fetch(url, timeout, *args, **kwargs)
+        else:
+            resp = cls._fetch_with_failover(url, timeout, *args, **kwargs)
+        if cached is not None and resp.status_code == 304:
+            return response_cache.revalidated(key).response
         resp.raise_for_status()
         if "text/html" in resp.headers.get("Content-Type", ""):
             has_expired = re.search(cls.session_expired_pattern, resp.text)
+            site_url = router.domain_of(resp.url or url)
+            if has_expired and renew_session and site_url is not None:
+                # Saved session outlived the one on the server
+                logger.debug(f"Session expired - renewing for {site_url}")
+                discard_session(site_url)
+                Index(site_url)
+                return cls._get_resource(
+                    url,
+                    timeout,
+                    *args,
+                    renew_session=False,
+                    cacheable=cacheable,
+                    **request_kwargs,
+                )
             if has_expired:
                 raise exceptions.SessionExpired(
                     utils.get_absolute_url(
@@ -110,8 +514,46 @@ class Metadata:
                     ),
                 )
 
+        if cacheable:
+            return response_cache.store(key, resp).response
         return resp
 
+    @classmethod
+    def _fetch_with_failover(
+        cls, url: str, timeout: int = request_timeout, *args, **kwargs
+    ) -> requests.Response:
+        """Fetch url from the fastest healthy domain, failing over
+        to the other domains on connection errors and 5xx responses"""
+        _check_domains_in_background()
+        last_resp = last_error = None
+        for site_url in router.candidates():
+            try:
+                if not has_session(site_url):
+                    logger.debug(f"Initializing session - {site_url}")
+                    Index(site_url)
+                resp = fetch(router.rewrite(url, site_url), timeout, *args, **kwargs)
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                exceptions.CircuitOpen,
+                exceptions.LoadIndexError,
+            ) as e:
+                logger.debug(f"Failing over from {site_url} - {e}")
+                router.record_failure(site_url)
+                last_error = e
+                continue
+            if resp.status_code >= 500:
+                logger.debug(f"Failing over from {site_url} - {resp.status_code}")
+                router.record_failure(site_url)
+                last_resp = resp
+                continue
+            router.record_success(site_url, resp.elapsed.total_seconds())
+            return resp
+
+        if last_resp is not None:
+            return last_resp
+        raise last_error
+
     @classmethod
     def tvseries_page(cls, url: str) -> str:
         """Get page containing series season
@@ -123,7 +565,8 @@ class Metadata:
             str: Page contents
         """
         return cls.get_resource(
-            utils.validate_url(r".*/subfolder-.*", url, "to-seasons")
+            utils.validate_url(r".*/subfolder-.*", url, "to-seasons"),
+            cacheable=True,
         ).text
 
     @classmethod
@@ -137,7 +580,8 @@ class Metadata:
             str: Page contents
         """
         return cls.get_resource(
-            utils.validate_url(r".*/files-.*", url, "to-episodes")
+            utils.validate_url(r".*/files-.*", url, "to-episodes"),
+            cacheable=True,
         ).text
 
     @classmethod
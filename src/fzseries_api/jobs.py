@@ -0,0 +1,615 @@
+"""
+This module keeps episode downloads in a SQLite-backed queue
+so that progress outlives the process. Every job records its
+state, resolved download link, bytes saved and attempt history;
+workers pick jobs by priority or smallest file first and a run
+started after a crash or Ctrl-C resumes partially saved files.
+"""
+
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import requests
+from fzseries_api import logger
+from fzseries_api.main import Auto, Download
+import fzseries_api.hunter as hunter
+import fzseries_api.models as models
+import fzseries_api.resilience as resilience
+import fzseries_api.storage as storage
+import fzseries_api.throttle as throttle
+import fzseries_api.utils as utils
+import fzseries_api.exceptions as exceptions
+
+job_states = ("pending", "running", "done", "failed", "cancelled")
+"""States a job goes through"""
+
+default_queue_path = Path(
+    os.getenv("FZSERIES_QUEUE", Path.home() / ".fzseries" / "jobs.sqlite3")
+)
+"""Queue database used by the `fzseries queue` commands"""
+
+schema = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    episode TEXT NOT NULL,
+    format TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    size INTEGER,
+    downloaded INTEGER NOT NULL DEFAULT 0,
+    link TEXT,
+    proxy TEXT,
+    resolved_on TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 10,
+    skips INTEGER NOT NULL DEFAULT 0,
+    not_before TEXT,
+    error TEXT,
+    pid INTEGER,
+    host TEXT,
+    created_on TEXT NOT NULL,
+    updated_on TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE TABLE IF NOT EXISTS attempts (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    started_on TEXT NOT NULL,
+    finished_on TEXT,
+    outcome TEXT,
+    error TEXT,
+    downloaded INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, number)
+);
+"""
+
+latest_attempt = "SELECT MAX(number) FROM attempts WHERE job_id = ?"
+"""Attempt underway - a job runs one attempt at a time"""
+
+migrations = {
+    "skips": "ALTER TABLE jobs ADD COLUMN skips INTEGER NOT NULL DEFAULT 0",
+    "not_before": "ALTER TABLE jobs ADD COLUMN not_before TEXT",
+}
+"""Columns added to queues created by earlier versions"""
+
+
+def _is_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        # os.kill sends CTRL_C_EVENT on Windows instead of probing
+        return _is_alive_on_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _is_alive_on_windows(pid: int) -> bool:
+    import ctypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ERROR_INVALID_PARAMETER = 87
+    STILL_ACTIVE = 259
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # No such process - assume alive on any other error e.g access denied
+        return ctypes.get_last_error() != ERROR_INVALID_PARAMETER
+    try:
+        exit_code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            # Assume alive when unknown rather than take over its job
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+class JobQueue:
+    """Persistent queue of episode downloads shared by concurrent
+    processes - claiming a job is a single write transaction so no
+    two workers take the same one.
+    """
+
+    orders: dict[str, str] = {
+        "priority": "priority DESC, id",
+        "smallest": "size IS NULL, size, priority DESC, id",
+    }
+    """Job ordering options - smallest-first puts unresolved sizes last"""
+
+    def __init__(
+        self,
+        path: str | Path = default_queue_path,
+        link_ttl: float = Download.link_ttl,
+        retry_policy: resilience.RetryPolicy | None = None,
+    ):
+        """Initializes `JobQueue`
+
+        Args:
+            path (str | Path, optional): Path to the queue database. Defaults to `default_queue_path`.
+            link_ttl (float, optional): Seconds a resolved download link is reused for. Defaults to `Download.link_ttl`.
+            retry_policy (resilience.RetryPolicy | None, optional): Backoff of failed and skipped jobs. Defaults to 5s doubling up to 10 minutes.
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.link_ttl = link_ttl
+        self.retry_policy = retry_policy or resilience.RetryPolicy(
+            backoff_factor=5.0, max_backoff=600.0
+        )
+        self._local = threading.local()
+        self._running: set[int] = set()
+        """Jobs executed by this instance"""
+        self._stop = threading.Event()
+        self._connection().executescript(schema)
+        columns = {
+            row["name"] for row in self._connection().execute("PRAGMA table_info(jobs)")
+        }
+        for column, statement in migrations.items():
+            if column not in columns:
+                self._connection().execute(statement)
+
+    def __str__(self):
+        return f'<fzseries_api.jobs.JobQueue path="{self.path}">'
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> t.Generator[sqlite3.Connection, None, None]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> models.DownloadJob:
+        job = dict(row)
+        job["episode"] = models.EpisodeInSearch.model_validate_json(job["episode"])
+        return models.DownloadJob(**job)
+
+    def _update(self, job_id: int, **fields) -> models.DownloadJob:
+        fields["updated_on"] = self._now()
+        self._connection().execute(
+            f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+            (*fields.values(), job_id),
+        )
+        return self.get(job_id)
+
+    def add(
+        self,
+        episodes: t.Iterable[models.EpisodeInSearch],
+        format: t.Literal["High MP4", "WEBM"] = "High MP4",
+        directory: str | Path = os.getcwd(),
+        include_metadata: bool = False,
+        priority: int = 0,
+        max_attempts: int = 10,
+        fetch_size: bool = False,
+    ) -> list[models.DownloadJob]:
+        """Queue episodes for download - those already queued are left as they are
+
+        Args:
+            episodes (t.Iterable[models.EpisodeInSearch]): Episodes to download.
+            format (t.Literal["High MP4", "WEBM"], optional): Defaults to "High MP4".
+            directory (str|Path, optional): Parent directory for saving the episodes. Defaults to `getcwd()`.
+            include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
+            priority (int, optional): Higher runs first. Defaults to 0.
+            max_attempts (int, optional): Attempts before a job is marked failed. Defaults to 10.
+            fetch_size (bool, optional): Look up file sizes now for smallest-first scheduling. Defaults to False.
+
+        Returns:
+            list[models.DownloadJob]: Jobs added.
+        """
+        utils.assert_membership(format, Download.download_format_options)
+        added = []
+        for episode in episodes:
+            episode_path = Auto.episode_path(episode, directory, include_metadata)
+            size = (
+                Download(episode, format).results.size_in_bytes if fetch_size else None
+            )
+            now = self._now()
+            cursor = self._connection().execute(
+                "INSERT OR IGNORE INTO jobs (title, episode, format, path, priority, "
+                "size, max_attempts, created_on, updated_on) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    episode.title,
+                    episode.model_dump_json(),
+                    format,
+                    str(episode_path.absolute()),
+                    priority,
+                    size,
+                    max_attempts,
+                    now,
+                    now,
+                ),
+            )
+            if cursor.rowcount:
+                added.append(self.get(cursor.lastrowid))
+        return added
+
+    def get(self, job_id: int) -> models.DownloadJob:
+        """Job by id
+
+        Raises:
+            KeyError: No such job.
+        """
+        row = (
+            self._connection()
+            .execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(f"No job with id {job_id}")
+        return self._to_job(row)
+
+    def jobs(self, states: t.Iterable[str] | None = None) -> list[models.DownloadJob]:
+        """Jobs in the order they were queued
+
+        Args:
+            states (t.Iterable[str] | None, optional): Only jobs in these states. Defaults to None.
+
+        Returns:
+            list[models.DownloadJob]
+        """
+        query, params = "SELECT * FROM jobs", ()
+        if states is not None:
+            params = tuple(states)
+            for state in params:
+                utils.assert_membership(state, job_states, "State")
+            query += f" WHERE state IN ({', '.join('?' * len(params))})"
+        return [
+            self._to_job(row)
+            for row in self._connection().execute(query + " ORDER BY id", params)
+        ]
+
+    def attempts(self, job_id: int) -> list[models.JobAttempt]:
+        """Attempt history of a job"""
+        return [
+            models.JobAttempt(**dict(row))
+            for row in self._connection().execute(
+                "SELECT * FROM attempts WHERE job_id = ? ORDER BY number", (job_id,)
+            )
+        ]
+
+    def claim(
+        self, order: t.Literal["priority", "smallest"] = "priority"
+    ) -> models.DownloadJob | None:
+        """Take the next pending job and mark it running
+
+        Args:
+            order (t.Literal["priority", "smallest"], optional): Which job goes next. Defaults to "priority".
+
+        Returns:
+            models.DownloadJob | None: Job claimed - None if nothing is pending or due.
+        """
+        utils.assert_membership(order, tuple(self.orders), "Order")
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE state = 'pending' "
+                "AND (not_before IS NULL OR not_before <= ?) "
+                f"ORDER BY {self.orders[order]} LIMIT 1",
+                (self._now(),),
+            ).fetchone()
+            if row is None:
+                return None
+            now = self._now()
+            connection.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, "
+                "pid = ?, host = ?, updated_on = ? WHERE id = ?",
+                (os.getpid(), socket.gethostname(), now, row["id"]),
+            )
+            # Attempts are numbered across retries so that history is kept
+            connection.execute(
+                "INSERT INTO attempts (job_id, number, started_on, downloaded) "
+                "SELECT ?, COALESCE(MAX(number), 0) + 1, ?, ? "
+                "FROM attempts WHERE job_id = ?",
+                (row["id"], now, row["downloaded"], row["id"]),
+            )
+        self._running.add(row["id"])
+        return self.get(row["id"])
+
+    def _finish(
+        self,
+        job: models.DownloadJob,
+        outcome: str,
+        state: str,
+        error: str | None = None,
+        clear_link: bool = False,
+        retry_in: float | None = None,
+    ) -> models.DownloadJob:
+        save_to = Path(job.path)
+        downloaded = save_to.stat().st_size if save_to.exists() else 0
+        if not downloaded and job.size:
+            # Segmented downloads are journaled in a part file
+            journal = storage.RangeJournal(storage.part_path(save_to), job.size)
+            downloaded = journal.completed if journal.load() else 0
+        now = self._now()
+        not_before = (
+            (datetime.now() + timedelta(seconds=retry_in)).isoformat()
+            if retry_in is not None
+            else None
+        )
+        with self._transaction() as connection:
+            if outcome == "skipped":
+                # Waiting on another process is not an attempt
+                connection.execute(
+                    f"DELETE FROM attempts WHERE job_id = ? AND number = ({latest_attempt})",
+                    (job.id, job.id),
+                )
+                connection.execute(
+                    "UPDATE jobs SET attempts = attempts - 1, skips = skips + 1 "
+                    "WHERE id = ?",
+                    (job.id,),
+                )
+            else:
+                connection.execute(
+                    "UPDATE attempts SET finished_on = ?, outcome = ?, error = ?, "
+                    f"downloaded = ? WHERE job_id = ? AND number = ({latest_attempt})",
+                    (now, outcome, error, downloaded, job.id, job.id),
+                )
+            # A job cancelled meanwhile stays cancelled
+            connection.execute(
+                "UPDATE jobs SET state = CASE WHEN state = 'running' THEN ? "
+                "ELSE state END, downloaded = ?, error = ?, not_before = ?, "
+                "pid = NULL, host = NULL, updated_on = ? WHERE id = ?",
+                (state, downloaded, error, not_before, now, job.id),
+            )
+            if clear_link:
+                connection.execute(
+                    "UPDATE jobs SET link = NULL, resolved_on = NULL WHERE id = ?",
+                    (job.id,),
+                )
+        self._running.discard(job.id)
+        return self.get(job.id)
+
+    def recover(self) -> list[models.DownloadJob]:
+        """Put back jobs left running by processes that died on this machine
+
+        Returns:
+            list[models.DownloadJob]: Jobs put back to pending.
+        """
+        host = socket.gethostname()
+        recovered = []
+        for job in self.jobs(["running"]):
+            if job.host != host or job.id in self._running:
+                continue
+            if job.pid != os.getpid() and _is_alive(job.pid):
+                continue
+            logger.warning(f"Resuming job {job.id} abandoned by pid {job.pid}")
+            recovered.append(self._finish(job, "crashed", "pending"))
+        return recovered
+
+    def retry(self, ids: t.Iterable[int] | None = None) -> int:
+        """Queue failed or cancelled jobs again with a fresh attempts budget -
+        earlier attempts are kept in their history
+
+        Args:
+            ids (t.Iterable[int] | None, optional): Jobs to retry. Defaults to all failed ones.
+
+        Returns:
+            int: Jobs queued again.
+        """
+        if ids is None:
+            query, params = "WHERE state = 'failed'", ()
+        else:
+            params = tuple(ids)
+            query = (
+                f"WHERE id IN ({', '.join('?' * len(params))}) "
+                "AND state IN ('failed', 'cancelled')"
+            )
+        return (
+            self._connection()
+            .execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, skips = 0, "
+                f"error = NULL, not_before = NULL, updated_on = ? {query}",
+                (self._now(), *params),
+            )
+            .rowcount
+        )
+
+    def cancel(self, ids: t.Iterable[int]) -> int:
+        """Drop jobs from the queue - a running one completes its current attempt
+
+        Args:
+            ids (t.Iterable[int]): Jobs to cancel.
+
+        Returns:
+            int: Jobs cancelled.
+        """
+        params = tuple(ids)
+        return (
+            self._connection()
+            .execute(
+                "UPDATE jobs SET state = 'cancelled', updated_on = ? "
+                f"WHERE id IN ({', '.join('?' * len(params))}) "
+                "AND state IN ('pending', 'running', 'failed')",
+                (self._now(), *params),
+            )
+            .rowcount
+        )
+
+    def link_is_fresh(self, job: models.DownloadJob, proxy: str | None) -> bool:
+        """Checks the resolved link can be reused - download keys are bound
+        to the IP that requested them and expire after a while"""
+        return bool(
+            job.link
+            and job.resolved_on
+            and job.proxy == proxy
+            and (datetime.now() - job.resolved_on).total_seconds() < self.link_ttl
+        )
+
+    def resolve(self, job: models.DownloadJob) -> models.DownloadJob:
+        """Look up final download link and file size of the job"""
+        download = Download(job.episode, job.format)
+        link = download.last_url
+        return self._update(
+            job.id,
+            link=link,
+            size=download.results_cache.size_in_bytes,
+            proxy=hunter.proxy_pool.current(),
+            resolved_on=self._now(),
+        )
+
+    def execute(
+        self, job: models.DownloadJob, progress_bar: bool = False, **kwargs
+    ) -> models.DownloadJob:
+        """Run a single attempt of a claimed job - partially saved
+        files are resumed
+
+        Args:
+            job (models.DownloadJob): Job from `claim`.
+            progress_bar (bool, optional): Show download progressbar. Defaults to False.
+
+            - The rest are arguments for `Download.save`
+        Returns:
+            models.DownloadJob: Job as updated by the attempt.
+        """
+        save_to = Path(job.path)
+        outcome, state, error, clear_link = "done", "done", None, False
+        retry_in = None
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(job.episode.files[0].url) as proxy:
+            try:
+                if not self.link_is_fresh(job, proxy):
+                    job = self.resolve(job)
+                save_to.parent.mkdir(parents=True, exist_ok=True)
+                Download.save(
+                    link=job.link,
+                    filename=save_to.name,
+                    dir=save_to.parent,
+                    progress_bar=progress_bar,
+                    resume=save_to.exists(),
+                    **kwargs,
+                )
+
+            except FileExistsError:
+                pass
+
+            except (KeyboardInterrupt, EOFError):
+                outcome, state = "interrupted", "pending"
+                raise
+
+            except exceptions.DownloadStopped:
+                outcome, state = "interrupted", "pending"
+
+            except exceptions.DownloadInProgress as e:
+                outcome, state, error = "skipped", "pending", str(e)
+                retry_in = self._backoff(job.skips)
+
+            except Exception as e:
+                outcome, error = "failed", f"{e.__class__.__name__}: {e}"
+                state = "failed" if job.attempts >= job.max_attempts else "pending"
+                retry_in = self._backoff(job.attempts - 1)
+                # Rejected links are most likely expired
+                clear_link = (
+                    isinstance(e, requests.HTTPError)
+                    and e.response is not None
+                    and 400 <= e.response.status_code < 500
+                )
+                logger.debug(f"Job {job.id} attempt {job.attempts} failed - {error}")
+
+            finally:
+                job = self._finish(job, outcome, state, error, clear_link, retry_in)
+        return job
+
+    def _backoff(self, attempt: int) -> float:
+        """Seconds before a job is due again - never immediately"""
+        return max(
+            self.retry_policy.backoff(attempt) or 0,
+            self.retry_policy.backoff_factor,
+        )
+
+    def next_due(self) -> datetime | None:
+        """When the earliest pending job backing off is due - None if there is none"""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT MIN(not_before) FROM jobs WHERE state = 'pending' "
+                "AND not_before IS NOT NULL"
+            )
+            .fetchone()
+        )
+        return datetime.fromisoformat(row[0]) if row[0] else None
+
+    def stop(self):
+        """Stop jobs underway at their next chunk and let workers of `run` return -
+        the jobs are resumed on the next run"""
+        self._stop.set()
+
+    def run(
+        self,
+        workers: int = 1,
+        order: t.Literal["priority", "smallest"] = "priority",
+        **kwargs,
+    ) -> list[models.DownloadJob]:
+        """Execute pending jobs until none is left - waiting for those backing off
+
+        Args:
+            workers (int, optional): Jobs executed in parallel. Defaults to 1.
+            order (t.Literal["priority", "smallest"], optional): Which job goes next. Defaults to "priority".
+
+            - The rest are arguments for `JobQueue.execute`
+        Returns:
+            list[models.DownloadJob]: Jobs executed - in the state their last attempt left them.
+        """
+        utils.assert_membership(order, tuple(self.orders), "Order")
+        self.recover()
+        self._stop.clear()
+        kwargs.setdefault("stop", self._stop)
+        executed: dict[int, models.DownloadJob] = {}
+
+        @throttle.scheduler.in_background
+        def work():
+            while not self._stop.is_set():
+                job = self.claim(order)
+                if job is None:
+                    due = self.next_due()
+                    if due is None:
+                        return
+                    self._stop.wait(max((due - datetime.now()).total_seconds(), 0.1))
+                    continue
+                job = self.execute(job, **kwargs)
+                executed[job.id] = job
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(work) for _ in range(workers)]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    # Jobs being downloaded stop at their next chunk instead of
+                    # holding up the executor - they are put back on the next run
+                    self._stop.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        else:
+            work()
+        return list(executed.values())
@@ -14,6 +14,25 @@ It achieves this through 4 classes
 
 from tqdm import tqdm
 from os import path, getcwd, makedirs
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import nullcontext
+from functools import partial
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import os
+import queue
+import threading
+import time
+import requests
 from pathlib import Path
 import typing as t
 import re
@@ -23,6 +42,10 @@ import fzseries_api.hunter as hunter
 import fzseries_api.models as models
 import fzseries_api.handlers as handlers
 import fzseries_api.utils as utils
+import fzseries_api.storage as storage
+import fzseries_api.throttle as throttle
+import fzseries_api.resilience as resilience
+import fzseries_api.selection as selection
 import fzseries_api.exceptions as exceptions
 
 try:
@@ -268,6 +291,9 @@ class Download:
 
     download_format_options = ("High MP4", "WEBM")
 
+    link_ttl: float = 3600
+    """Seconds a final download link is assumed to stay valid"""
+
     def __init__(
         self,
         episode: models.EpisodeInSearch,
@@ -314,6 +340,41 @@ class Download:
         )
         return handlers.final_download_link_handler(final_download_link_page)
 
+    def resolve_links(self, mirrors: bool = True) -> list[str]:
+        """Final download links of the episode - one per server
+
+        Args:
+            mirrors (bool, optional): Resolve links of every server not just the preferred one. Defaults to True.
+
+        Returns:
+            list[str]: Final download links - the preferred one first
+        """
+        self.results_cache = self.results
+        links = self.results_cache.links
+        links = [links[self.final_download_link_index]] + (
+            [
+                link
+                for index, link in enumerate(links)
+                if index != self.final_download_link_index
+            ]
+            if mirrors
+            else []
+        )
+        final_links = []
+        for index, link in enumerate(links):
+            try:
+                final_links.append(
+                    handlers.final_download_link_handler(
+                        hunter.Metadata.episode_final_download_link(link)
+                    )
+                )
+            except Exception as e:
+                # The preferred link is a must, mirrors are a bonus
+                if index == 0:
+                    raise
+                logger.debug(f"Skipping mirror {link} - {e}")
+        return final_links
+
     def run(self, **kwargs) -> Path:
         """Download and save the episode in disk
         - kwargs : arguments for `Download.save`
@@ -321,9 +382,143 @@ class Download:
         Returns:
             Path: Absolute path to the downloaded episode
         """
-        kwargs["link"] = self.last_url
-        kwargs.setdefault("filename", self.results_cache.filename)
-        return self.save(**kwargs)
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(self.episode.files[0].url):
+            kwargs["link"] = self.last_url
+            kwargs.setdefault("filename", self.results_cache.filename)
+            return self.save(**kwargs)
+
+    def stream(self, **kwargs) -> t.Generator[bytes, None, None]:
+        """Stream the episode contents without saving them in disk
+        - kwargs : arguments for `Download.stream_link`
+
+        Returns:
+            t.Generator[bytes, None, None]: Episode contents in chunks
+        """
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(self.episode.files[0].url) as proxy:
+            link = self.last_url
+        kwargs.setdefault("proxy", proxy)
+        return self.stream_link(link, **kwargs)
+
+    @staticmethod
+    def stream_link(
+        link: str,
+        chunk_size: int = 256,
+        read_ahead: float = 16,
+        timeout: int = 30,
+        reconnects: int = 10,
+        offset: int = 0,
+        proxy: str | None = None,
+    ) -> t.Generator[bytes, None, None]:
+        """Stream the episode file - contents are read ahead in a background
+        thread and dropped connections are resumed with range requests
+
+        Args:
+            link (str): URL pointing to downloadable episode file - `Final download link`
+            chunk_size (int, optional): Chunk_size for reading the file in KB. Defaults to 256.
+            read_ahead (float, optional): Maximum contents buffered ahead of the consumer in MB. Defaults to 16.
+            timeout (int, optional): Http request timeout. Defaults to 30.
+            reconnects (int, optional): Consecutive failed reconnects before giving up. Defaults to 10.
+            offset (int, optional): Byte to start streaming from. Defaults to 0.
+            proxy (str | None, optional): Proxy to stream through. Defaults to the one pinned to the thread.
+
+        Yields:
+            bytes: Episode contents in chunks
+        """
+        host = urlparse(link).netloc
+        chunk_size_in_bytes = chunk_size * 1_000
+        chunks: queue.Queue = queue.Queue(
+            maxsize=max(int(read_ahead * 1_000_000) // chunk_size_in_bytes, 1)
+        )
+        stopped = threading.Event()
+        end_of_file = object()
+        policy = resilience.RetryPolicy(total=reconnects)
+        resumable_exceptions = (
+            *policy.retryable_exceptions,
+            requests.exceptions.ChunkedEncodingError,
+        )
+        proxy = proxy or hunter.proxy_pool.current()
+
+        def put(item: t.Any) -> bool:
+            while not stopped.is_set():
+                try:
+                    chunks.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read():
+            received = offset
+            failures = 0
+            while not stopped.is_set():
+                headers = {"Range": f"bytes={received}-"} if received else {}
+                try:
+                    with throttle.tuner.connection(
+                        host
+                    ), throttle.limiter.share() as bandwidth, hunter.proxy_pool.use(
+                        proxy
+                    ) as lease:
+                        resp = hunter.transport.get(
+                            link,
+                            stream=True,
+                            timeout=timeout,
+                            headers=headers,
+                            proxies=lease.proxies,
+                        )
+                        throttle.tuner.check_status(host, resp.status_code)
+                        if received and resp.status_code == 416:
+                            break
+                        resp.raise_for_status()
+                        # Server ignoring the range sends contents from the start
+                        skip = received if resp.status_code != 206 else 0
+                        with resp:
+                            for chunk in resp.iter_content(chunk_size_in_bytes):
+                                bandwidth.consume(len(chunk))
+                                throttle.tuner.record(host, len(chunk))
+                                lease.add(len(chunk))
+                                if skip:
+                                    chunk, skip = chunk[skip:], max(
+                                        skip - len(chunk), 0
+                                    )
+                                    if not chunk:
+                                        continue
+                                if not put(chunk):
+                                    return
+                                received += len(chunk)
+                                failures = 0
+                    break
+                except resumable_exceptions as e:
+                    if isinstance(e, requests.ConnectionError):
+                        throttle.tuner.record_error(host)
+                    if failures >= policy.total:
+                        raise
+                    logger.debug(
+                        f"Stream of {link} dropped at byte {received} - {e}. Reconnecting"
+                    )
+                    stopped.wait(policy.backoff(failures))
+                    failures += 1
+            put(end_of_file)
+
+        def run_reader():
+            try:
+                read()
+            except BaseException as e:
+                put(e)
+
+        reader = threading.Thread(target=run_reader, daemon=True)
+        reader.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is end_of_file:
+                    return
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            stopped.set()
 
     @classmethod
     def save(
@@ -339,6 +534,15 @@ class Download:
         leave: bool = True,
         colour: str = "cyan",
         simple: bool = False,
+        write_behind: bool = True,
+        buffer_budget: int = 16,
+        write_size: int = 1024,
+        preallocate: bool = True,
+        checksum: bool = True,
+        connections: int = 1,
+        segment_size: float = 8,
+        if_locked: t.Literal["wait", "skip", "attach"] = "wait",
+        stop: threading.Event | None = None,
     ):
         """Save the episode in disk
         Args:
@@ -353,89 +557,590 @@ class Download:
             leave (bool, optional): Keep all traces of the progressbar. Defaults to True.
             colour (str, optional): Progress bar display color. Defaults to "cyan".
             simple (bool, optional): Show percentage and bar only in progressbar. Deafults to False.
+            write_behind (bool, optional): Write to disk from a background thread. Defaults to True.
+            buffer_budget (int, optional): Maximum contents buffered in memory for write-behind in MB. Defaults to 16.
+            write_size (int, optional): Size in KB to batch small chunks into before writing. Defaults to 1024.
+            preallocate (bool, optional): Reserve disk blocks for the whole file upfront. Defaults to True.
+            checksum (bool, optional): Hash contents while downloading and save integrity manifest. Defaults to True.
+            connections (int, optional): Maximum parallel connections for segmented download. Defaults to 1.
+            segment_size (float, optional): Size of each segment in MB. Defaults to 8.
+            if_locked (t.Literal["wait", "skip", "attach"], optional): What to do while another process downloads the same file - attach shows its progress. Defaults to "wait".
+            stop (threading.Event | None, optional): Abandon the download at the next chunk once set - saved contents are resumed later. Defaults to None.
 
         Raises:
             FileExistsError:  Incase of `resume=True` but the download was complete
+            exceptions.DownloadInProgress: Another process downloads the file and `if_locked="skip"`
+            exceptions.DownloadStopped: `stop` was set
             Exception
 
         Returns:
             str: Path where the episode contents have been saved to.
         """
-        current_downloaded_size = 0
-        current_downloaded_size_in_mb = 0
         save_to = Path(dir) / filename
-        episode_file_url = link
-
-        def pop_range_in_session_headers():
-            if hunter.session.headers.get("Range"):
-                hunter.session.headers.pop("Range")
-
-        if resume:
-            if not path.exists(save_to):
-                raise FileNotFoundError(f"File not found in path - '{save_to}'")
-            current_downloaded_size = path.getsize(save_to)
-            # Set the headers to resume download from the last byte
-            hunter.session.headers.update(
-                {"Range": f"bytes={current_downloaded_size}-"}
+        download_lock = cls._claim(save_to, if_locked, progress_bar and not quiet)
+        if download_lock is None:
+            return save_to
+
+        try:
+            started = time.monotonic()
+            if download_lock.waited and path.exists(save_to):
+                # Carry on from where the process waited for stopped
+                resume = True
+            current_downloaded_size = 0
+            current_downloaded_size_in_mb = 0
+            episode_file_url = link
+            host = urlparse(episode_file_url).netloc
+            headers = {}
+            chunk_size_in_bytes = chunk_size * 1_000
+
+            if resume:
+                if not path.exists(save_to):
+                    raise FileNotFoundError(f"File not found in path - '{save_to}'")
+                current_downloaded_size = path.getsize(save_to)
+                # Set the headers to resume download from the last byte
+                headers["Range"] = f"bytes={current_downloaded_size}-"
+                current_downloaded_size_in_mb = current_downloaded_size / 1000000
+                # convert to mb
+
+            segmented_size = None
+            # Segmented downloads left incomplete resume from their journal
+            part_path = storage.part_path(save_to)
+            has_journal = storage.journal_path(part_path).exists()
+            if (connections > 1 or has_journal) and not resume:
+                segmented_size = cls._probe_size(episode_file_url, timeout)
+                if (
+                    segmented_size
+                    and segmented_size <= segment_size * 1_000_000
+                    and not has_journal
+                ):
+                    segmented_size = None
+                if has_journal and not segmented_size:
+                    # Ranges cannot be resumed without range requests
+                    logger.warning(
+                        f"Discarding partial segmented download of {save_to.name} - "
+                        "server no longer honours range requests"
+                    )
+                    part_path.unlink(missing_ok=True)
+                    storage.journal_path(part_path).unlink(missing_ok=True)
+
+            if checksum:
+                storage.manifest_path(save_to).unlink(missing_ok=True)
+
+            def progress(size_in_mb: float) -> tqdm | nullcontext:
+                if not progress_bar:
+                    return nullcontext()
+                if not quiet:
+                    print(f"{filename}")
+                return tqdm(
+                    desc="Downloading",
+                    total=round(size_in_mb, 1),
+                    bar_format=(
+                        "{l_bar}{bar} | %(size)s MB" % (dict(size=round(size_in_mb, 1)))
+                        if simple
+                        else "{l_bar}{bar}{r_bar}"
+                    ),
+                    initial=current_downloaded_size_in_mb,
+                    unit="Mb",
+                    colour=colour,
+                    leave=leave,
+                )
+
+            if segmented_size:
+                size_in_mb = segmented_size / 1_000_000
+                download_lock.advance(0, total=segmented_size)
+                with progress(size_in_mb) as p_bar:
+                    fetched = cls._save_segmented(
+                        link=episode_file_url,
+                        save_to=save_to,
+                        size=segmented_size,
+                        connections=max(connections, 1),
+                        segment_size=int(segment_size * 1_000_000),
+                        chunk_size=chunk_size_in_bytes,
+                        timeout=timeout,
+                        p_bar=p_bar,
+                        download_lock=download_lock,
+                        stop=stop,
+                    )
+                if checksum:
+                    storage.write_manifest(
+                        save_to,
+                        storage.hash_file(save_to).hexdigest(),
+                        episode_file_url,
+                    )
+                throttle.history.record(fetched, time.monotonic() - started)
+                if not progress_bar:
+                    logger.info(f"{filename} - {size_in_mb}MB ✅")
+                return save_to
+
+            default_content_length = 0
+
+            with throttle.tuner.connection(host), hunter.proxy_pool.use() as proxy:
+                resp = hunter.transport.get(
+                    episode_file_url,
+                    stream=True,
+                    timeout=timeout,
+                    headers=headers,
+                    proxies=proxy.proxies,
+                )
+                throttle.tuner.check_status(host, resp.status_code)
+                if resume and resp.status_code == 416:
+                    if download_lock.waited:
+                        # Completed by the process waited for
+                        return save_to
+                    raise FileExistsError(
+                        f"Download completed for the file in path - '{save_to}'"
+                    )
+                resp.raise_for_status()
+                if resume and resp.status_code != 206:
+                    # Server ignoring the range sends contents from the start
+                    logger.warning(
+                        f"Server ignored range request for {filename} - "
+                        "downloading it from the start"
+                    )
+                    resume = False
+                    current_downloaded_size = 0
+                    current_downloaded_size_in_mb = 0
+
+                size_in_bytes = int(
+                    resp.headers.get("content-length", default_content_length)
+                )
+                if not size_in_bytes:
+                    if resume:
+                        raise FileExistsError(
+                            f"Download completed for the file in path - '{save_to}'"
+                        )
+                    else:
+                        raise Exception(
+                            f"Cannot download file of content-length {size_in_bytes} bytes"
+                        )
+
+                if resume:
+                    assert (
+                        size_in_bytes != current_downloaded_size
+                    ), f"Download completed for the file in path - '{save_to}'"
+
+                size_in_mb = (size_in_bytes / 1_000_000) + current_downloaded_size_in_mb
+                download_lock.advance(
+                    current_downloaded_size,
+                    total=current_downloaded_size + size_in_bytes,
+                )
+
+                saving_mode = "ab" if resume else "wb"
+
+                hasher = None
+                if checksum:
+                    hasher = hashlib.new(storage.checksum_algorithm)
+                    if resume:
+                        storage.hash_file(save_to, hasher)
+
+                with progress(size_in_mb) as p_bar, open(save_to, saving_mode) as fh:
+                    if preallocate:
+                        storage.preallocate(
+                            fh.fileno(), current_downloaded_size, size_in_bytes
+                        )
+                    if write_behind:
+                        writer = storage.WriteBehindWriter(
+                            fh,
+                            buffer_budget=buffer_budget * 1_000_000,
+                            write_size=write_size * 1_000,
+                            hasher=hasher,
+                        )
+                    else:
+                        writer = fh
+                    with writer, throttle.limiter.share() as bandwidth:
+                        for chunks in resp.iter_content(chunk_size=chunk_size_in_bytes):
+                            if stop is not None and stop.is_set():
+                                raise exceptions.DownloadStopped(save_to)
+                            bandwidth.consume(len(chunks))
+                            writer.write(chunks)
+                            throttle.tuner.record(host, len(chunks))
+                            proxy.add(len(chunks))
+                            download_lock.advance(len(chunks))
+                            if hasher is not None and not write_behind:
+                                hasher.update(chunks)
+                            if p_bar is not None:
+                                p_bar.update(len(chunks) / 1_000_000)
+
+            if (
+                hasher is not None
+                and path.getsize(save_to) == current_downloaded_size + size_in_bytes
+            ):
+                storage.write_manifest(save_to, hasher.hexdigest(), episode_file_url)
+
+            throttle.history.record(size_in_bytes, time.monotonic() - started)
+            if not progress_bar:
+                logger.info(f"{filename} - {size_in_mb}MB ✅")
+            return save_to
+        finally:
+            download_lock.release()
+
+    @staticmethod
+    def _claim(
+        save_to: Path,
+        if_locked: t.Literal["wait", "skip", "attach"] = "wait",
+        progress_bar: bool = True,
+    ) -> storage.DownloadLock | None:
+        """Take download lock of the episode file, handling another process
+        downloading it as `if_locked` says
+
+        Returns:
+            storage.DownloadLock | None: Lock taken - None if the other process completed the file.
+        """
+        utils.assert_membership(if_locked, ("wait", "skip", "attach"), "if_locked")
+        download_lock = storage.DownloadLock(save_to)
+        if download_lock.acquire():
+            return download_lock
+
+        owner = download_lock.owner()
+        if if_locked == "skip":
+            raise exceptions.DownloadInProgress(str(save_to), owner and owner.pid)
+
+        logger.info(f"Waiting for another process downloading '{save_to}'")
+        p_bar = None
+
+        def follow(owner: models.DownloadProgress | None):
+            nonlocal p_bar
+            if owner is None or not owner.total:
+                return
+            if p_bar is None:
+                p_bar = tqdm(
+                    desc=f"Attached (pid {owner.pid})",
+                    total=round(owner.total / 1_000_000, 1),
+                    unit="Mb",
+                    leave=False,
+                )
+            p_bar.n = round(owner.downloaded / 1_000_000, 1)
+            p_bar.refresh()
+
+        try:
+            download_lock.acquire(
+                blocking=True,
+                on_wait=follow if if_locked == "attach" and progress_bar else None,
             )
-            current_downloaded_size_in_mb = current_downloaded_size / 1000000
-            # convert to mb
+        finally:
+            if p_bar is not None:
+                p_bar.close()
+        # Files saved without checksum have no manifest to verify against
+        waited_for = download_lock.waited_for
+        if storage.verify_file(save_to)[0] or (
+            waited_for is not None
+            and waited_for.total
+            and save_to.exists()
+            and save_to.stat().st_size == waited_for.total
+        ):
+            download_lock.release()
+            return None
+        return download_lock
+
+    @staticmethod
+    def _probe_size(link: str, timeout: int) -> int | None:
+        """Total size of the episode file if the server honours range requests"""
+        resp = hunter.transport.get(
+            link,
+            headers={"Range": "bytes=0-0"},
+            timeout=timeout,
+            stream=True,
+            proxies=hunter.proxy_pool.as_proxies(hunter.proxy_pool.current()),
+        )
+        total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+        if resp.status_code == 206 and total.isdigit():
+            # The single byte is read so that the connection goes back to the pool
+            resp.raw.read(1)
+            resp.close()
+            return int(total)
+        # Servers ignoring the range would otherwise send the whole file
+        resp.close()
+
+    @staticmethod
+    def _save_segmented(
+        link: str,
+        save_to: Path,
+        size: int,
+        connections: int,
+        segment_size: int,
+        chunk_size: int,
+        timeout: int,
+        p_bar: tqdm | None = None,
+        segment_trials: int = 3,
+        download_lock: storage.DownloadLock | None = None,
+        stop: threading.Event | None = None,
+    ) -> int:
+        """Download the episode file in segments over parallel connections.
+        Connections per host are capped by `throttle.tuner` and segments
+        are spread across `hunter.proxy_pool` unless a proxy is pinned.
+        Completed ranges are journaled so an interrupted download resumes
+        by fetching only the missing ones.
 
-        default_content_length = 0
+        Args:
+            link (str): URL pointing to downloadable episode file.
+            save_to (Path): Path to save the episode to.
+            size (int): Total size in bytes.
+            connections (int): Maximum parallel connections.
+            segment_size (int): Bytes fetched per range request.
+            chunk_size (int): Bytes read at a time.
+            timeout (int): Http request timeout.
+            p_bar (tqdm | None, optional): Progress bar. Defaults to None.
+            segment_trials (int, optional): Attempts per segment before giving up. Defaults to 3.
+            download_lock (storage.DownloadLock | None, optional): Lock to record progress in. Defaults to None.
+            stop (threading.Event | None, optional): Abandon the download once set - completed ranges stay journaled. Defaults to None.
 
-        resp = hunter.session.get(episode_file_url, stream=True, timeout=timeout)
+        Raises:
+            exceptions.DownloadStopped: `stop` was set.
 
-        size_in_bytes = int(resp.headers.get("content-length", default_content_length))
-        if not size_in_bytes:
-            if resume:
-                raise FileExistsError(
-                    f"Download completed for the file in path - '{save_to}'"
+        Returns:
+            int: Bytes fetched - excludes those saved before resuming
+        """
+        host = urlparse(link).netloc
+        part_path = storage.part_path(save_to)
+        journal = storage.RangeJournal(part_path, size)
+        resumed = journal.load()
+        saved_before = journal.completed
+        segments = deque(journal.missing(segment_size))
+        failures: dict[int, int] = {}
+        errors: list[Exception] = []
+        lock = threading.Lock()
+        pinned_proxy = hunter.proxy_pool.current()
+
+        def stopped() -> bool:
+            return stop is not None and stop.is_set()
+
+        with open(part_path, "r+b" if resumed else "wb") as fh:
+            if resumed:
+                logger.info(
+                    f"Resuming {save_to.name} - {journal.completed} of {size} bytes saved"
                 )
+                if download_lock is not None:
+                    download_lock.advance(journal.completed)
+                if p_bar is not None:
+                    p_bar.update(journal.completed / 1_000_000)
             else:
-                raise Exception(
-                    f"Cannot download file of content-length {size_in_bytes} bytes"
-                )
+                storage.allocate(fh.fileno(), size)
+
+            def fetch_segments():
+                if storage.positional_io:
+                    return fetch_into(partial(os.pwrite, fh.fileno()))
+                # Workers seek handles of their own where `os.pwrite` is missing
+                with open(part_path, "r+b", buffering=0) as worker_fh:
+
+                    def write(chunks: bytes, offset: int):
+                        worker_fh.seek(offset)
+                        worker_fh.write(chunks)
+
+                    fetch_into(write)
+
+            def fetch_into(write: t.Callable[[bytes, int], t.Any]):
+                while True:
+                    with lock:
+                        if errors or not segments or stopped():
+                            return
+                        start, end = segments.popleft()
+                    offset = start
+                    try:
+                        with throttle.tuner.connection(
+                            host
+                        ), throttle.limiter.share() as bandwidth, hunter.proxy_pool.use(
+                            pinned_proxy
+                        ) as proxy:
+                            resp = hunter.transport.get(
+                                link,
+                                headers={"Range": f"bytes={start}-{end}"},
+                                stream=True,
+                                timeout=timeout,
+                                proxies=proxy.proxies,
+                            )
+                            throttle.tuner.check_status(host, resp.status_code)
+                            resp.raise_for_status()
+                            if resp.status_code != 206:
+                                raise Exception(
+                                    f"Server ignored range request - {resp.status_code}"
+                                )
+                            for chunks in resp.iter_content(chunk_size=chunk_size):
+                                if stopped():
+                                    resp.close()
+                                    return
+                                bandwidth.consume(len(chunks))
+                                write(chunks, offset)
+                                journal.add(offset, offset + len(chunks) - 1)
+                                journal.sync(fh.fileno())
+                                offset += len(chunks)
+                                throttle.tuner.record(host, len(chunks))
+                                proxy.add(len(chunks))
+                                if download_lock is not None:
+                                    download_lock.advance(len(chunks))
+                                if p_bar is not None:
+                                    p_bar.update(len(chunks) / 1_000_000)
+                            if offset != end + 1:
+                                raise IOError(f"Incomplete segment bytes={start}-{end}")
+                    except Exception as e:
+                        if isinstance(e, requests.ConnectionError):
+                            throttle.tuner.record_error(host)
+                        with lock:
+                            failures[start] = failures.get(start, 0) + 1
+                            if failures[start] >= segment_trials:
+                                errors.append(e)
+                            elif offset <= end:
+                                segments.append((offset, end))
+
+            workers = [
+                threading.Thread(target=fetch_segments, daemon=True)
+                for _ in range(connections)
+            ]
+            for worker in workers:
+                worker.start()
+            try:
+                for worker in workers:
+                    worker.join()
+            finally:
+                journal.sync(fh.fileno(), force=True)
 
-        if resume:
-            assert (
-                size_in_bytes != current_downloaded_size
-            ), f"Download completed for the file in path - '{save_to}'"
+        if stopped():
+            raise exceptions.DownloadStopped(save_to)
+        if errors:
+            raise errors[0]
+        os.replace(part_path, save_to)
+        journal.remove()
+        return size - saved_before
 
-        size_in_mb = (size_in_bytes / 1_000_000) + current_downloaded_size_in_mb
-        chunk_size_in_bytes = chunk_size * 1_000
 
-        saving_mode = "ab" if resume else "wb"
-        if progress_bar:
-            if not quiet:
-                print(f"{filename}")
-            with tqdm(
-                desc="Downloading",
-                total=round(size_in_mb, 1),
-                bar_format=(
-                    "{l_bar}{bar} | %(size)s MB" % (dict(size=round(size_in_mb, 1)))
-                    if simple
-                    else "{l_bar}{bar}{r_bar}"
-                ),
-                initial=current_downloaded_size_in_mb,
-                unit="Mb",
-                colour=colour,
-                leave=leave,
-            ) as p_bar:
-                # p_bar.update(current_downloaded_size)
-                with open(save_to, saving_mode) as fh:
-                    for chunks in resp.iter_content(chunk_size=chunk_size_in_bytes):
-                        fh.write(chunks)
-                        p_bar.update(round(chunk_size_in_bytes / 1_000_000, 1))
-                pop_range_in_session_headers()
-                return save_to
-        else:
-            with open(save_to, saving_mode) as fh:
-                for chunks in resp.iter_content(chunk_size=chunk_size_in_bytes):
-                    fh.write(chunks)
+class FormatPolicy:
+    """Picks the file format of each episode:
+    - smallest - the smaller file
+    - fastest - the file expected to download soonest going by a short probe
+    - prefer:<format>:<percent> - the format unless it is more than percent larger than the other
 
-            logger.info(f"{filename} - {size_in_mb}MB ✅")
-            pop_range_in_session_headers()
-            return save_to
+    Download pages of both formats are fetched concurrently.
+    """
+
+    policies = ("smallest", "fastest", "prefer")
+
+    def __init__(self, policy: str, probe_size: int = 1_000_000, timeout: int = 30):
+        """Initializes `FormatPolicy`
+
+        Args:
+            policy (str): Policy e.g `smallest`, `fastest`, `prefer:WEBM:10`.
+            probe_size (int, optional): Bytes fetched of each file by the fastest policy. Defaults to 1_000_000.
+            timeout (int, optional): Http request timeout of a probe. Defaults to 30.
+        """
+        name, *options = policy.split(":")
+        utils.assert_membership(name, self.policies, "Format policy")
+        self.policy = policy
+        self.name = name
+        self.preferred: str | None = None
+        self.tolerance = 0.0
+        if name == "prefer":
+            assert options, "Format policy 'prefer' needs a format e.g prefer:WEBM:10"
+            self.preferred = options[0]
+            utils.assert_membership(
+                self.preferred, Download.download_format_options, "Format"
+            )
+            self.tolerance = float(options[1]) if len(options) > 1 else 10.0
+        self.probe_size = probe_size
+        self.timeout = timeout
+
+    def __str__(self):
+        return f'<fzseries_api.main.FormatPolicy policy="{self.policy}">'
+
+    def _probe(self, download: Download) -> float | None:
+        """Bytes per second received while fetching the start of the file"""
+        link = download.last_url
+        host = urlparse(link).netloc
+        received = 0
+        with throttle.tuner.connection(
+            host
+        ), throttle.limiter.share() as bandwidth, hunter.proxy_pool.use() as lease:
+            started = time.monotonic()
+            resp = hunter.transport.get(
+                link,
+                headers={"Range": f"bytes=0-{self.probe_size - 1}"},
+                timeout=self.timeout,
+                stream=True,
+                proxies=lease.proxies,
+            )
+            throttle.tuner.check_status(host, resp.status_code)
+            with resp:
+                resp.raise_for_status()
+                # Servers ignoring the range would send the whole file
+                for chunk in resp.iter_content(min(self.probe_size, 65536)):
+                    chunk = chunk[: self.probe_size - received]
+                    bandwidth.consume(len(chunk))
+                    throttle.tuner.record(host, len(chunk))
+                    lease.add(len(chunk))
+                    received += len(chunk)
+                    if received >= self.probe_size:
+                        break
+            elapsed = time.monotonic() - started
+        return received / elapsed if elapsed else None
+
+    def _measure(
+        self, episode: models.EpisodeInSearch, format: str
+    ) -> tuple[int | None, float | None]:
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(episode.files[0].url):
+            download = Download(episode, format)
+            try:
+                size = download.results.size_in_bytes
+            except Exception as e:
+                logger.warning(f"Failed to get {format} size of {episode.title} - {e}")
+                return None, None
+            if self.name != "fastest":
+                return size, None
+            try:
+                return size, self._probe(download)
+            except Exception as e:
+                logger.warning(f"Failed to probe {format} of {episode.title} - {e}")
+                return size, None
+
+    def choose(self, episode: models.EpisodeInSearch) -> models.FormatChoice:
+        """Pick the format to download the episode in
+
+        Args:
+            episode (models.EpisodeInSearch): Episode
+
+        Returns:
+            models.FormatChoice: Format picked and the measurements behind it.
+        """
+        formats = Download.download_format_options
+        if len(episode.files) < 2:
+            # Only one file to pick from - `Download` ignores the format
+            formats = formats[:1]
+        with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+            measurements = dict(
+                zip(formats, executor.map(partial(self._measure, episode), formats))
+            )
+        sizes = {format: size for format, (size, _) in measurements.items()}
+        throughputs = {
+            format: throughput
+            for format, (_, throughput) in measurements.items()
+            if self.name == "fastest"
+        }
+        known_sizes = {format: size for format, size in sizes.items() if size}
+        chosen = formats[0]
+        if self.name == "fastest" and any(throughputs.values()):
+            probed = {
+                format: throughput
+                for format, throughput in throughputs.items()
+                if throughput
+            }
+            if all(format in known_sizes for format in probed):
+                # Expected seconds to download the whole file
+                chosen = min(
+                    probed, key=lambda format: known_sizes[format] / probed[format]
+                )
+            else:
+                chosen = max(probed, key=probed.get)
+        elif known_sizes:
+            chosen = min(known_sizes, key=known_sizes.get)
+            if self.preferred in known_sizes and known_sizes[
+                self.preferred
+            ] <= known_sizes[chosen] * (1 + self.tolerance / 100):
+                chosen = self.preferred
+        return models.FormatChoice(
+            format=chosen,
+            policy=self.policy,
+            sizes=sizes,
+            throughputs=throughputs,
+            decided_on=datetime.now(),
+        )
 
 
 class Auto(Search):
@@ -444,6 +1149,288 @@ class Auto(Search):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    @staticmethod
+    def episode_path(
+        episode: models.EpisodeInSearch,
+        directory: str | Path = getcwd(),
+        include_metadata: bool = False,
+    ) -> Path:
+        """Path where an episode is saved to - `directory/series/season/filename`
+
+        Args:
+            episode (models.EpisodeInSearch): Episode
+            directory (str|Path, optional): Parent directory for saving the episode. Defaults to `getcwd()`.
+            include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
+
+        Returns:
+            Path: Episode path
+        """
+        series_name, episode_id, episode_filename = re.findall(
+            r"(.+)\s-\s(S\d+)(.+)", episode.title
+        )[0]
+        return (
+            Path(directory)
+            / series_name
+            / episode_id
+            / (episode.title if include_metadata else episode_filename)
+        )
+
+    @classmethod
+    def ensure_disk_space(
+        cls,
+        episodes: list[models.EpisodeInSearch],
+        format: t.Literal["High MP4", "WEBM"] = "High MP4",
+        directory: str | Path = getcwd(),
+        include_metadata: bool = False,
+        **kwargs,
+    ) -> int:
+        """Checks there is enough free disk space for downloading the episodes
+
+        Args:
+            episodes (list[models.EpisodeInSearch]): Episodes to be downloaded.
+            format (t.Literal["High MP4", "WEBM"], optional): Defaults to "High MP4".
+            directory (str|Path, optional): Parent directory for saving the episodes. Defaults to `getcwd()`.
+            include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
+
+            - The rest are arguments for `Auto.plan_episodes`
+        Raises:
+            exceptions.InsufficientDiskSpace: Free space is less than required.
+
+        Returns:
+            int: Bytes required
+        """
+        plan = cls.plan_episodes(
+            episodes, format, directory, include_metadata, **kwargs
+        )
+        if not plan.has_enough_space:
+            raise exceptions.InsufficientDiskSpace(plan.remaining, plan.free_space)
+        return plan.remaining
+
+    @classmethod
+    def plan_episodes(
+        cls,
+        episodes: t.Iterable[models.EpisodeInSearch],
+        format: t.Literal["High MP4", "WEBM"] = "High MP4",
+        directory: str | Path = getcwd(),
+        include_metadata: bool = False,
+        workers: int = 8,
+        format_policy: str | None = None,
+        **kwargs,
+    ) -> models.DownloadPlan:
+        """Estimate what downloading the episodes takes - sizes are parsed from
+        their download pages fetched concurrently and no media is downloaded.
+        The ETA assumes episodes are downloaded one at a time at the rate
+        recorded in `throttle.history`.
+
+        Args:
+            episodes (t.Iterable[models.EpisodeInSearch]): Episodes to be downloaded.
+            format (t.Literal["High MP4", "WEBM"], optional): Defaults to "High MP4".
+            directory (str|Path, optional): Parent directory for saving the episodes. Defaults to `getcwd()`.
+            include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
+            workers (int, optional): Download pages fetched in parallel. Defaults to 8.
+            format_policy (str | None, optional): Plan the format `FormatPolicy` would pick instead - the larger file for `fastest`. Defaults to None.
+
+        Returns:
+            models.DownloadPlan
+        """
+        policy = FormatPolicy(format_policy) if format_policy else None
+
+        def episode_size(episode: models.EpisodeInSearch) -> int | None:
+            if policy is None:
+                return Download(episode, format).results.size_in_bytes
+            if policy.name == "fastest":
+                # Picking the fastest format probes the media
+                sizes = FormatPolicy("smallest").choose(episode).sizes
+                return max(filter(None, sizes.values()), default=None)
+            choice = policy.choose(episode)
+            return choice.sizes.get(choice.format)
+
+        def plan_episode(episode: models.EpisodeInSearch) -> models.PlannedEpisode:
+            episode_path = cls.episode_path(episode, directory, include_metadata)
+            planned = models.PlannedEpisode(
+                title=episode.title,
+                season=episode_path.parent.name,
+                path=str(episode_path.absolute()),
+            )
+            try:
+                planned.size = episode_size(episode)
+            except Exception as e:
+                planned.error = str(e)
+            part_path = storage.part_path(episode_path)
+            if episode_path.exists():
+                planned.saved = episode_path.stat().st_size
+            elif planned.size and part_path.exists():
+                journal = storage.RangeJournal(part_path, planned.size)
+                if journal.load():
+                    planned.saved = journal.completed
+            return planned
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            planned_episodes = list(
+                executor.map(throttle.scheduler.in_background(plan_episode), episodes)
+            )
+
+        seasons: dict[str, models.SeasonPlan] = {}
+        for planned in planned_episodes:
+            season = seasons.setdefault(
+                planned.season, models.SeasonPlan(season=planned.season)
+            )
+            season.episodes += 1
+            season.size += planned.size or 0
+            season.remaining += planned.remaining
+            season.unknown_sizes += planned.size is None
+
+        remaining = sum(planned.remaining for planned in planned_episodes)
+        throughput = throttle.history.rate()
+        if throttle.limiter.rate:
+            throughput = min(throughput or throttle.limiter.rate, throttle.limiter.rate)
+        return models.DownloadPlan(
+            episodes=planned_episodes,
+            seasons=list(seasons.values()),
+            size=sum(season.size for season in seasons.values()),
+            remaining=remaining,
+            unknown_sizes=sum(season.unknown_sizes for season in seasons.values()),
+            free_space=storage.free_space(directory),
+            throughput=throughput,
+            eta=remaining / throughput if throughput else None,
+        )
+
+    def plan(
+        self,
+        season_offset: int = 1,
+        episode_offset: int = 1,
+        one_season_only: bool = False,
+        limit: int = 1000000,
+        episode_range: str | None = None,
+        **kwargs,
+    ) -> models.DownloadPlan:
+        """Plan of what `Auto.run` would download with the same arguments
+
+        Args:
+            season_offset (int, optiona;): Season number to start from. Defaults to 1.
+            episode_offset (int, optional): Episode number to start from. Defaults to 1.
+            one_season_only (bool, optional): Plan only one season. Defaults to False.
+            limit (int, optional): Number of proceeding episodes to plan. Defaults to 1000000.
+            episode_range (str | None, optional): Episodes to plan instead of offsets e.g S03E05-S04E02 - see `selection.EpisodeRange`. Defaults to None.
+
+            - The rest are arguments for `Auto.plan_episodes`
+        Returns:
+            models.DownloadPlan
+        """
+        return self.plan_episodes(
+            self.iter_episodes(
+                season_offset=season_offset,
+                episode_offset=episode_offset,
+                one_season_only=one_season_only,
+                limit=limit,
+                episode_range=episode_range,
+            ),
+            **kwargs,
+        )
+
+    @classmethod
+    def resolve_episode(
+        cls,
+        episode: models.EpisodeInSearch,
+        format: t.Literal["High MP4", "WEBM"] = "High MP4",
+        directory: str | Path = getcwd(),
+        include_metadata: bool = False,
+        mirrors: bool = True,
+    ) -> models.ResolvedEpisode:
+        """Resolve final download links of an episode without downloading it
+
+        Args:
+            episode (models.EpisodeInSearch): Episode
+            format (t.Literal["High MP4", "WEBM"], optional): Defaults to "High MP4".
+            directory (str|Path, optional): Parent directory the episode would be saved in. Defaults to `getcwd()`.
+            include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
+            mirrors (bool, optional): Resolve links of every server. Defaults to True.
+
+        Returns:
+            models.ResolvedEpisode
+        """
+        download = Download(episode, format)
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(episode.files[0].url) as proxy:
+            url, *other_urls = download.resolve_links(mirrors)
+        resolved_on = datetime.now()
+        return models.ResolvedEpisode(
+            title=episode.title,
+            url=url,
+            mirrors=other_urls,
+            path=str(cls.episode_path(episode, directory, include_metadata).absolute()),
+            size=download.results_cache.size_in_bytes,
+            proxy=proxy,
+            resolved_on=resolved_on,
+            expires_on=resolved_on + timedelta(seconds=Download.link_ttl),
+        )
+
+    def resolve(
+        self,
+        season_offset: int = 1,
+        episode_offset: int = 1,
+        one_season_only: bool = False,
+        limit: int = 1000000,
+        episode_range: str | None = None,
+        workers: int = 4,
+        ignore_errors: bool = False,
+        **kwargs,
+    ) -> t.Generator[models.ResolvedEpisode, None, None]:
+        """Resolve final download links of episodes concurrently - for handing
+        the transfers over to external download engines
+
+        Args:
+            season_offset (int, optiona;): Season number to start from. Defaults to 1.
+            episode_offset (int, optional): Episode number to start from. Defaults to 1.
+            one_season_only (bool, optional): Resolve only one season and stop. Defaults to False.
+            limit (int, optional): Number of proceeding episodes to resolve before stopping. Defaults to 1000000.
+            episode_range (str | None, optional): Episodes to resolve instead of offsets e.g S03E05-S04E02 - see `selection.EpisodeRange`. Defaults to None.
+            workers (int, optional): Episodes resolved in parallel. Defaults to 4.
+            ignore_errors(bool, optional): Skip episodes whose links could not be resolved. Defaults to False.
+
+            - The rest are arguments for `Auto.resolve_episode`
+        Yields:
+            models.ResolvedEpisode: Episodes in order - as soon as they are resolved
+        """
+        episodes = self.iter_episodes(
+            season_offset=season_offset,
+            episode_offset=episode_offset,
+            one_season_only=one_season_only,
+            limit=limit,
+            episode_range=episode_range,
+        )
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            # A short window keeps links fresh for consumers reading as we go
+            in_flight: deque[tuple[models.EpisodeInSearch, Future]] = deque()
+            episodes_exhausted = False
+            while True:
+                while not episodes_exhausted and len(in_flight) < max(workers, 1) * 2:
+                    episode = next(episodes, None)
+                    if episode is None:
+                        episodes_exhausted = True
+                        break
+                    in_flight.append(
+                        (
+                            episode,
+                            executor.submit(
+                                throttle.scheduler.in_background(self.resolve_episode),
+                                episode,
+                                **kwargs,
+                            ),
+                        )
+                    )
+                if not in_flight:
+                    return
+                episode, future = in_flight.popleft()
+                try:
+                    yield future.result()
+                except Exception as e:
+                    if not ignore_errors:
+                        for _, pending in in_flight:
+                            pending.cancel()
+                        raise e
+                    logger.warning(f"Failed to resolve {episode.title} - {e}")
+
     @classmethod
     def download_episode(
         cls,
@@ -454,6 +1441,7 @@ class Auto(Search):
         include_metadata: bool = False,
         download_trials: int = 10,
         confirm: bool = False,
+        format_policy: str | None = None,
         **kwargs,
     ) -> Path:
         """Download and save episode using recommended best practices
@@ -466,6 +1454,7 @@ class Auto(Search):
             include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
             download_trials (int, optional): Number of trials before giving up on download. Defaults to 10.
             confirm (bool, optional): Ask user whether to proceed with the download or not. Defaults to False.
+            format_policy (str | None, optional): Pick the format per episode instead - see `FormatPolicy`. Defaults to None.
 
             - The rest are arguments for `Download.save`
         Returns:
@@ -480,14 +1469,44 @@ class Auto(Search):
                 )
             if not click.confirm(f'Download "{episode.title}"'):
                 return
+        format_choice = None
+        if format_policy:
+            format_choice = FormatPolicy(format_policy).choose(episode)
+            format = format_choice.format
+            logger.info(f"{episode.title} - {format} picked by {format_policy} policy")
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(episode.files[0].url):
+            saved_to = cls._download_episode(
+                episode,
+                progress_bar,
+                format,
+                directory,
+                include_metadata,
+                download_trials,
+                **kwargs,
+            )
+        if format_choice is not None and saved_to:
+            if storage.manifest_path(saved_to).exists():
+                storage.update_manifest(saved_to, format_choice=format_choice)
+        return saved_to
+
+    @classmethod
+    def _download_episode(
+        cls,
+        episode: models.EpisodeInSearch,
+        progress_bar: bool,
+        format: t.Literal["High MP4", "WEBM"],
+        directory: str | Path,
+        include_metadata: bool,
+        download_trials: int,
+        **kwargs,
+    ) -> Path:
         download = Download(episode=episode, format=format)
         link = download.last_url
-        series_name, episode_id, episode_filename = re.findall(
-            r"(.+)\s-\s(S\d+)(.+)", episode.title
-        )[0]
-        episode_dir = Path(directory) / series_name / episode_id
+        episode_path = cls.episode_path(episode, directory, include_metadata)
+        episode_dir = episode_path.parent
         makedirs(episode_dir, exist_ok=True)
-        filename = episode.title if include_metadata else episode_filename
+        filename = episode_path.name
         quiet = kwargs.get("quiet")
         kwargs["quiet"] = True
 
@@ -512,12 +1531,149 @@ class Auto(Search):
             except (KeyboardInterrupt, EOFError, FileExistsError, FileNotFoundError):
                 break
 
+            except exceptions.DownloadInProgress as e:
+                stdout(f"Skipping - {e}")
+                break
+
+            except exceptions.DownloadStopped:
+                raise
+
             except Exception as e:
                 if trials >= download_trials:
                     raise e
             else:
                 return resp
 
+    @staticmethod
+    def _season_listings(
+        seasons: list[models.TVSeriesSeason], lookahead: int = 1
+    ) -> t.Generator[models.EpisodeSearchResults, None, None]:
+        """Episode listings of the seasons in order - pages of the next
+        seasons are fetched in the background while the current one is
+        consumed and those outstanding are cancelled when closed early
+
+        Args:
+            seasons (list[models.TVSeriesSeason]): Seasons to list.
+            lookahead (int, optional): Seasons fetched ahead of the current one. Defaults to 1.
+
+        Yields:
+            models.EpisodeSearchResults
+        """
+        if not seasons:
+            return
+        lookahead = max(lookahead, 0)
+        remaining = deque(seasons)
+        in_flight: deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=lookahead + 1)
+        try:
+            while remaining or in_flight:
+                while remaining and len(in_flight) <= lookahead:
+                    in_flight.append(
+                        executor.submit(
+                            throttle.scheduler.in_background(
+                                lambda season: EpisodeMetadata(season).results
+                            ),
+                            remaining.popleft(),
+                        )
+                    )
+                yield in_flight.popleft().result()
+        finally:
+            # Fetches underway are left to finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_episodes(
+        self,
+        season_offset: int = 1,
+        episode_offset: int = 1,
+        one_season_only: bool = False,
+        limit: int = 1000000,
+        episode_range: str | selection.EpisodeRange | None = None,
+        lookahead: int | None = None,
+    ) -> t.Generator[models.EpisodeInSearch, None, None]:
+        """Lazily yield episodes to be downloaded in order across seasons
+
+        Args:
+            season_offset (int, optiona;): Season number to start from. Defaults to 1.
+            episode_offset (int, optional): Episode number to start from. Defaults to 1.
+            one_season_only (bool, optional): Yield only one season and stop. Defaults to False.
+            limit (int, optional): Number of proceeding episodes to yield before stopping. Defaults to 1000000.
+            episode_range (str | selection.EpisodeRange | None, optional): Episodes to yield instead of offsets e.g S03E05-S04E02 - see `selection.EpisodeRange`. Defaults to None.
+            lookahead (int | None, optional): Season pages fetched ahead of the one being consumed - None for 1 and 3 with `episode_range` whose pages are all needed. Defaults to None.
+
+        Yields:
+            models.EpisodeInSearch
+        """
+        if isinstance(episode_range, str):
+            episode_range = selection.EpisodeRange(episode_range)
+        results = self.results
+        if not isinstance(results, models.SearchResults):
+            if episode_range is not None:
+                raise ValueError("Episode ranges need a search by series")
+            episodes_count = 0
+            for result in self.get_all_results(stream=True, limit=limit):
+                for episode in result.episodes:
+                    yield episode
+                    episodes_count += 1
+                    if episodes_count >= limit:
+                        return
+            return
+
+        seasons = TVSeriesMetadata(results.series[0]).results.seasons
+        if episode_range is not None:
+            index = episode_range.index(seasons)
+            seasons = [season for season, _ in index]
+
+            def select(position: int, listing: models.EpisodeSearchResults):
+                return episode_range.select(listing.episodes, index[position][1])
+
+        else:
+            seasons = seasons[season_offset - 1 :][: 1 if one_season_only else None]
+
+            def select(position: int, listing: models.EpisodeSearchResults):
+                if position == 0:
+                    return listing.episodes[episode_offset - 1 :]
+                return listing.episodes
+
+        if lookahead is None:
+            lookahead = 1 if episode_range is None else 3
+        listings = self._season_listings(seasons, lookahead)
+        episodes_count = 0
+        try:
+            for position, listing in enumerate(listings):
+                for episode in select(position, listing):
+                    yield episode
+                    episodes_count += 1
+                    if episodes_count >= limit:
+                        return
+        finally:
+            listings.close()
+
+    async def aiter_episodes(
+        self, **kwargs
+    ) -> t.AsyncGenerator[models.EpisodeInSearch, None]:
+        """Asynchronous `Auto.iter_episodes` - pages are fetched off the
+        event loop. Arguments are as in `Auto.iter_episodes`
+
+        Yields:
+            models.EpisodeInSearch
+        """
+        loop = asyncio.get_running_loop()
+        episodes = self.iter_episodes(**kwargs)
+        exhausted = object()
+        # Calls into the generator must not overlap - one thread serializes them
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while True:
+                episode = await loop.run_in_executor(
+                    executor, next, episodes, exhausted
+                )
+                if episode is exhausted:
+                    return
+                yield episode
+        finally:
+            await loop.run_in_executor(executor, episodes.close)
+            executor.shutdown(wait=False)
+
     def run(
         self,
         season_offset: int = 1,
@@ -525,6 +1681,9 @@ class Auto(Search):
         one_season_only: bool = False,
         ignore_errors: bool = False,
         limit: int = 1000000,
+        episode_range: str | None = None,
+        check_disk_space: bool = False,
+        workers: int = 1,
         **kwargs,
     ) -> list[Path]:
         """Initiate the download process
@@ -534,58 +1693,72 @@ class Auto(Search):
             episode_offset (int, optional): Episode number to start downloading from. Defaults to 1.
             one_season_only (bool, optional): Download only one season and stop. Defaults to False.
             limit (int, optional): Number of proceeding episodes to download before stopping. Defaults to 1000000.
+            episode_range (str | None, optional): Episodes to download instead of offsets e.g S03E05-S04E02, S02,S05 or latest - see `selection.EpisodeRange`. Defaults to None.
             ignore_errors(bool, optional): Ignore exceptions raised while downloading episodes. Defaults to False.
+            check_disk_space(bool, optional): Ensure there is enough disk space for all episodes before starting. Defaults to False.
+            workers (int, optional): Episodes downloaded in parallel - connections per host are capped by `throttle.tuner`. Defaults to 1.
             progress_bar(bool, optional): Show download progressbar. Defaults to True.
             format (t.Literal["High MP4", "WEBM"], optional): Defaults to "High MP4".
             directory (str|Path, optional): Parent directory for saving the series. Defaults to `getcwd()`.
             include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
             download_trials (int, optional): Number of trials before giving up on download. Defaults to 10.
             confirm (bool, optional): Ask user whether to proceed with the download or not. Defaults to False.
+            format_policy (str | None, optional): Pick the format per episode instead - see `FormatPolicy`. Defaults to None.
 
             - The rest are arguments for `Download.save`
         Returns:
             list[Path]: List of path to downloaded-episodes
         """
-        results = self.results
-        season_index = season_offset - 1
-        episode_index = episode_offset - 1
-        episodes_downloaded_count = 0
-        downloaded_episodes_path: list[Path] = []
-
-        if isinstance(results, models.SearchResults):
-            tvseries_metadata = TVSeriesMetadata(results.series[0]).results
-            seasons = tvseries_metadata.seasons
-            for index, target_season in enumerate(seasons[season_index:]):
-                episode_metadata = EpisodeMetadata(target_season).results
-                for episode in (
-                    episode_metadata.episodes[episode_index:]
-                    if index == 0
-                    else episode_metadata.episodes
-                ):
-                    episodes_downloaded_count += 1
-                    try:
-                        saved_to = self.download_episode(episode, **kwargs)
-                        if saved_to:
-                            downloaded_episodes_path.append(saved_to)
-                    except Exception as e:
-                        if not ignore_errors:
-                            raise e
-                    if episodes_downloaded_count >= limit:
-                        break
+        if kwargs.get("format_policy"):
+            # Invalid policies fail before any episode
+            FormatPolicy(kwargs["format_policy"])
+        downloaded_episodes_path: dict[int, Path] = {}
+        episodes = self.iter_episodes(
+            season_offset=season_offset,
+            episode_offset=episode_offset,
+            one_season_only=one_season_only,
+            limit=limit,
+            episode_range=episode_range,
+        )
+        if check_disk_space:
+            episodes = list(episodes)
+            self.ensure_disk_space(episodes, **kwargs)
 
-                if one_season_only or episodes_downloaded_count >= limit:
-                    break
+        def collect(index: int, download: t.Callable[[], Path | None]):
+            try:
+                saved_to = download()
+                if saved_to:
+                    downloaded_episodes_path[index] = saved_to
+            except Exception as e:
+                if not ignore_errors:
+                    raise e
 
+        if workers > 1:
+            stop = kwargs.setdefault("stop", threading.Event())
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                in_flight: dict[Future, int] = {}
+                try:
+                    for index, episode in enumerate(episodes):
+                        in_flight[
+                            executor.submit(self.download_episode, episode, **kwargs)
+                        ] = index
+                        if len(in_flight) >= workers:
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                collect(in_flight.pop(future), future.result)
+                    for future in as_completed(list(in_flight)):
+                        collect(in_flight.pop(future), future.result)
+                except BaseException:
+                    # Downloads underway stop at their next chunk instead of
+                    # holding up the executor - they are resumed on the next run
+                    stop.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
         else:
-            for result in self.get_all_results(stream=True, limit=limit):
-                for episode in result.episodes:
-                    episodes_downloaded_count += 1
-                    try:
-                        saved_to = self.download_episode(episode, **kwargs)
-                        if saved_to:
-                            downloaded_episodes_path.append(saved_to)
-                    except Exception as e:
-                        if not ignore_errors:
-                            raise e
+            for index, episode in enumerate(episodes):
+                collect(index, lambda: self.download_episode(episode, **kwargs))
 
-        return downloaded_episodes_path
+        return [
+            downloaded_episodes_path[index]
+            for index in sorted(downloaded_episodes_path)
+        ]
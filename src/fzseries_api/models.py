@@ -11,8 +11,9 @@ The models are not limited to:
 """
 
 import typing as t
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, computed_field
 from datetime import datetime
+from fzseries_api.utils import parse_size
 
 
 class SeriesInSearch(BaseModel):
@@ -121,9 +122,10 @@ class EpisodeSearchResults(BaseModel):
     last_page: t.Union[HttpUrl, None] = None
 
     def __str__(self):
-        return f"<EpisodeSearchResults episodes={" | ".join([
-            str(episode) for episode in self.episodes
-        ])}"
+        return (
+            f"<EpisodeSearchResults episodes={' | '.join([str(episode) for episode in self.episodes])}"
+            f" total={len(self.episodes)}>"
+        )
 
     def __add__(self, other: "EpisodeSearchResults") -> "EpisodeSearchResults":
         if not isinstance(other, EpisodeSearchResults):
@@ -182,6 +184,7 @@ class DownloadEpisode(BaseModel):
     `filename` : Episodes filename
     `size` : Episode file size
     `downloads` : Total downloads
+    `size_in_bytes` : Episode file size parsed to bytes
     """
 
     links: list[HttpUrl]
@@ -189,5 +192,252 @@ class DownloadEpisode(BaseModel):
     size: str
     downloads: int
 
+    @computed_field
+    @property
+    def size_in_bytes(self) -> int | None:
+        return parse_size(self.size)
+
     def __str__(self):
         return f'<DownloadEpisode filename="{self.filename}", size="{self.size}">'
+
+
+class FormatChoice(BaseModel):
+    """Format picked for an episode by `main.FormatPolicy`
+    `format` : Format picked
+    `policy` : Policy that picked it e.g smallest
+    `sizes` : File size in bytes of each candidate format - None if unknown
+    `throughputs` : Probed bytes per second of each candidate format - fastest policy only
+    `decided_on` : Date the choice was made
+    """
+
+    format: str
+    policy: str
+    sizes: dict[str, t.Union[int, None]] = {}
+    throughputs: dict[str, t.Union[float, None]] = {}
+    decided_on: datetime
+
+    def __str__(self):
+        return f'<FormatChoice format="{self.format}", policy="{self.policy}">'
+
+
+class EpisodeManifest(BaseModel):
+    """Integrity record of a downloaded episode
+    `filename` : Episode filename
+    `size` : File size in bytes
+    `checksum` : Hex digest of the file contents
+    `algorithm` : Hashing algorithm used
+    `url` : Link the episode was downloaded from
+    `saved_on` : Date the download completed
+    `format_choice` : Why the file format was picked - None if it was not chosen by a policy
+    """
+
+    filename: str
+    size: int
+    checksum: str
+    algorithm: str = "sha256"
+    url: str
+    saved_on: datetime
+    format_choice: t.Union[FormatChoice, None] = None
+
+    def __str__(self):
+        return f'<EpisodeManifest filename="{self.filename}", size={self.size}>'
+
+
+class DownloadProgress(BaseModel):
+    """In-progress record of an episode held by a download lock
+    `filename` : Episode filename
+    `pid` : Process downloading the episode
+    `host` : Machine the process runs on
+    `started_on` : Date the download started
+    `updated_on` : Date the record was last updated
+    `downloaded` : Bytes downloaded so far
+    `total` : Bytes to download - None if unknown
+    """
+
+    filename: str
+    pid: int
+    host: str
+    started_on: datetime
+    updated_on: datetime
+    downloaded: int = 0
+    total: t.Union[int, None] = None
+
+    def __str__(self):
+        return f'<DownloadProgress filename="{self.filename}", pid={self.pid}>'
+
+
+class DownloadJob(BaseModel):
+    """Episode download queued in `jobs.JobQueue`
+    `id` : Job number
+    `title` : Episode title
+    `episode` : Episode to download
+    `format` : File format to download
+    `path` : Where the episode is saved to
+    `state` : One of `jobs.job_states`
+    `priority` : Higher runs first
+    `size` : Episode file size in bytes - None until resolved
+    `downloaded` : Bytes saved as of the last attempt
+    `link` : Resolved final download link
+    `proxy` : Proxy the link was resolved through
+    `resolved_on` : Date the link was resolved
+    `attempts` : Attempts made since queued or retried
+    `max_attempts` : Attempts before the job is marked failed
+    `skips` : Times the job was put back while another process downloaded the episode
+    `not_before` : Date a job backing off is due again
+    `error` : Error of the last failed attempt
+    `pid` : Process running the job
+    `host` : Machine the process runs on
+    `created_on` : Date the job was queued
+    `updated_on` : Date the job was last updated
+    """
+
+    id: int
+    title: str
+    episode: EpisodeInSearch
+    format: str
+    path: str
+    state: str
+    priority: int = 0
+    size: t.Union[int, None] = None
+    downloaded: int = 0
+    link: t.Union[str, None] = None
+    proxy: t.Union[str, None] = None
+    resolved_on: t.Union[datetime, None] = None
+    attempts: int = 0
+    max_attempts: int = 10
+    skips: int = 0
+    not_before: t.Union[datetime, None] = None
+    error: t.Union[str, None] = None
+    pid: t.Union[int, None] = None
+    host: t.Union[str, None] = None
+    created_on: datetime
+    updated_on: datetime
+
+    def __str__(self):
+        return f'<DownloadJob id={self.id}, title="{self.title}", state="{self.state}">'
+
+
+class JobAttempt(BaseModel):
+    """Single run of a download job
+    `job_id` : Job attempted
+    `number` : Attempt number
+    `started_on` : Date the attempt started
+    `finished_on` : Date the attempt ended - None while running
+    `outcome` : done, failed, interrupted, skipped or crashed - None while running
+    `error` : Error raised by the attempt
+    `downloaded` : Bytes saved when the attempt ended
+    """
+
+    job_id: int
+    number: int
+    started_on: datetime
+    finished_on: t.Union[datetime, None] = None
+    outcome: t.Union[str, None] = None
+    error: t.Union[str, None] = None
+    downloaded: int = 0
+
+    def __str__(self):
+        return f'<JobAttempt job_id={self.job_id}, number={self.number}, outcome="{self.outcome}">'
+
+
+class ResolvedEpisode(BaseModel):
+    """Episode with its final download links resolved
+    `title` : Episode title
+    `url` : Final download link
+    `mirrors` : Final download links of the other servers
+    `path` : Where `Auto.download_episode` saves the episode
+    `size` : Expected file size in bytes
+    `proxy` : Proxy the links were resolved through - keys are bound to it
+    `resolved_on` : Date the links were resolved
+    `expires_on` : Date the links are assumed to expire
+    """
+
+    title: str
+    url: str
+    mirrors: list[str] = []
+    path: str
+    size: t.Union[int, None] = None
+    proxy: t.Union[str, None] = None
+    resolved_on: datetime
+    expires_on: datetime
+
+    def __str__(self):
+        return f'<ResolvedEpisode title="{self.title}", mirrors={len(self.mirrors)}>'
+
+
+class PlannedEpisode(BaseModel):
+    """Episode in a download plan
+    `title` : Episode title
+    `season` : Season the episode belongs to e.g S01
+    `path` : Where the episode is saved to
+    `size` : Episode file size in bytes - None if unknown
+    `saved` : Bytes already on disk
+    `error` : Why the size could not be found
+    """
+
+    title: str
+    season: str
+    path: str
+    size: t.Union[int, None] = None
+    saved: int = 0
+    error: t.Union[str, None] = None
+
+    @computed_field
+    @property
+    def remaining(self) -> int:
+        return max((self.size or 0) - self.saved, 0)
+
+    def __str__(self):
+        return f'<PlannedEpisode title="{self.title}", size={self.size}>'
+
+
+class SeasonPlan(BaseModel):
+    """Season breakdown of a download plan
+    `season` : Season e.g S01
+    `episodes` : Episodes planned
+    `size` : Total size of episodes with known sizes
+    `remaining` : Bytes left to download
+    `unknown_sizes` : Episodes whose sizes could not be found
+    """
+
+    season: str
+    episodes: int = 0
+    size: int = 0
+    remaining: int = 0
+    unknown_sizes: int = 0
+
+    def __str__(self):
+        return f'<SeasonPlan season="{self.season}", episodes={self.episodes}>'
+
+
+class DownloadPlan(BaseModel):
+    """What `Auto.run` would download - nothing is downloaded
+    `episodes` : Episodes planned in order
+    `seasons` : Per season breakdown
+    `size` : Total size of episodes with known sizes
+    `remaining` : Bytes left to download
+    `unknown_sizes` : Episodes whose sizes could not be found
+    `free_space` : Free disk space in bytes
+    `throughput` : Expected download rate in bytes per second - None if never measured
+    `eta` : Expected seconds to download the remaining bytes one episode at a time - parallel workers are not accounted for, None without throughput
+    `has_enough_space` : Free space covers the remaining bytes
+    """
+
+    episodes: list[PlannedEpisode]
+    seasons: list[SeasonPlan]
+    size: int
+    remaining: int
+    unknown_sizes: int = 0
+    free_space: int
+    throughput: t.Union[float, None] = None
+    eta: t.Union[float, None] = None
+
+    @computed_field
+    @property
+    def has_enough_space(self) -> bool:
+        return self.remaining <= self.free_space
+
+    def __str__(self):
+        return (
+            f"<DownloadPlan episodes={len(self.episodes)}, remaining={self.remaining}>"
+        )
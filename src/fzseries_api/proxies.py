@@ -0,0 +1,226 @@
+"""
+This module spreads traffic across HTTP/SOCKS proxies
+so downloads can aggregate bandwidth of several egress IPs.
+Proxies are ranked by load and measured throughput, failing
+ones are skipped for a while and work keyed by episode sticks
+to one proxy since download keys are bound to the requesting IP.
+"""
+
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+import requests
+
+
+class ProxyStats:
+    """Health and throughput of a single proxy"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.active = 0
+        self.failures = 0
+        self.failed_at: float | None = None
+        self.total_bytes = 0
+        self.throughput: float | None = None
+        """Smoothed bytes per second"""
+
+    def __str__(self):
+        return f'<fzseries_api.proxies.ProxyStats url="{self.url}">'
+
+
+class ProxyLease:
+    """A proxy in use by a request - counts bytes moved through it"""
+
+    def __init__(self, proxy: str | None):
+        self.proxy = proxy
+        self.nbytes = 0
+        self.started = time.monotonic()
+
+    @property
+    def proxies(self) -> dict[str, str] | None:
+        """Proxies mapping taken by `requests` and `transport`"""
+        return ProxyPool.as_proxies(self.proxy)
+
+    def add(self, nbytes: int):
+        """Count bytes received through the proxy"""
+        self.nbytes += nbytes
+
+
+class ProxyPool:
+    """Assigns requests across configured proxies"""
+
+    failure_exceptions: tuple[type[Exception]] = (
+        requests.ConnectionError,
+        requests.Timeout,
+    )
+    """Errors that mark a proxy as failing"""
+
+    def __init__(
+        self,
+        proxies: t.Iterable[str] = (),
+        cooldown: float = 120.0,
+        smoothing: float = 0.3,
+    ):
+        """Initializes `ProxyPool`
+
+        Args:
+            proxies (t.Iterable[str], optional): Proxy urls e.g `socks5h://host:1080`. Defaults to ().
+            cooldown (float, optional): Seconds a failing proxy is skipped for. Defaults to 120.0.
+            smoothing (float, optional): Weight of the newest throughput sample. Defaults to 0.3.
+        """
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.proxies: dict[str, ProxyStats] = {}
+        self.sticky: dict[t.Hashable, str] = {}
+        """Proxy assigned to each key"""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        for proxy in proxies:
+            self.add(proxy)
+
+    def __str__(self):
+        return f"<fzseries_api.proxies.ProxyPool proxies={len(self.proxies)}>"
+
+    def __len__(self):
+        return len(self.proxies)
+
+    @staticmethod
+    def as_proxies(proxy: str | None) -> dict[str, str] | None:
+        """Proxies mapping taken by `requests` and `transport`"""
+        return dict(http=proxy, https=proxy) if proxy else None
+
+    def add(self, proxy: str):
+        """Add proxy to the pool"""
+        with self._lock:
+            self.proxies.setdefault(proxy, ProxyStats(proxy))
+
+    def remove(self, proxy: str):
+        """Remove proxy from the pool"""
+        with self._lock:
+            self.proxies.pop(proxy, None)
+            for key in [key for key, value in self.sticky.items() if value == proxy]:
+                del self.sticky[key]
+
+    def is_healthy(self, proxy: str) -> bool:
+        """Checks the proxy has not failed within the cooldown period"""
+        failed_at = self.proxies[proxy].failed_at
+        return failed_at is None or time.monotonic() - failed_at >= self.cooldown
+
+    def select(self, key: t.Hashable | None = None) -> str | None:
+        """Pick a proxy - the least loaded, fastest healthy one
+
+        Args:
+            key (t.Hashable | None, optional): Keep returning the same proxy for this key while healthy. Defaults to None.
+
+        Returns:
+            str | None: Proxy url - None if the pool is empty.
+        """
+        with self._lock:
+            if not self.proxies:
+                return None
+            if key is not None:
+                proxy = self.sticky.get(key)
+                if proxy in self.proxies and self.is_healthy(proxy):
+                    return proxy
+            proxy = min(
+                self.proxies.values(),
+                key=lambda stats: (
+                    not self.is_healthy(stats.url),
+                    stats.failed_at or 0,
+                    stats.active,
+                    -(stats.throughput or float("inf")),
+                ),
+            ).url
+            if key is not None:
+                self.sticky[key] = proxy
+            return proxy
+
+    def forget(self, key: t.Hashable):
+        """Drop proxy assignment of key"""
+        with self._lock:
+            self.sticky.pop(key, None)
+
+    def record_success(self, proxy: str, nbytes: int = 0, seconds: float = 0):
+        """Mark proxy healthy and update its smoothed throughput"""
+        with self._lock:
+            stats = self.proxies.get(proxy)
+            if stats is None:
+                return
+            stats.failed_at = None
+            stats.total_bytes += nbytes
+            if nbytes and seconds > 0:
+                sample = nbytes / seconds
+                stats.throughput = (
+                    sample
+                    if stats.throughput is None
+                    else stats.throughput + self.smoothing * (sample - stats.throughput)
+                )
+
+    def record_failure(self, proxy: str):
+        """Skip proxy until the cooldown elapses"""
+        with self._lock:
+            stats = self.proxies.get(proxy)
+            if stats is not None:
+                stats.failures += 1
+                stats.failed_at = time.monotonic()
+
+    @contextmanager
+    def use(
+        self, proxy: str | None = None, key: t.Hashable | None = None
+    ) -> t.Generator[ProxyLease, None, None]:
+        """Lease a proxy for a request - its outcome and bytes counted
+        through `ProxyLease.add` are recorded on exit
+
+        Args:
+            proxy (str | None, optional): Proxy to use. Defaults to one pinned to the thread or `select(key)`.
+            key (t.Hashable | None, optional): Sticky key for `select`. Defaults to None.
+        """
+        lease = ProxyLease(proxy or self.current() or self.select(key))
+        stats = self.proxies.get(lease.proxy)
+        if stats is None:
+            yield lease
+            return
+        with self._lock:
+            stats.active += 1
+        try:
+            yield lease
+        except self.failure_exceptions:
+            self.record_failure(lease.proxy)
+            raise
+        else:
+            self.record_success(
+                lease.proxy, lease.nbytes, time.monotonic() - lease.started
+            )
+        finally:
+            with self._lock:
+                stats.active -= 1
+
+    def current(self) -> str | None:
+        """Proxy pinned to the current thread"""
+        return getattr(self._local, "proxy", None)
+
+    @contextmanager
+    def pinned(self, key: t.Hashable) -> t.Generator[str | None, None, None]:
+        """Route requests of the current thread through the proxy
+        assigned to key - for work bound to one egress IP"""
+        previous = self.current()
+        self._local.proxy = self.select(key)
+        try:
+            yield self._local.proxy
+        finally:
+            self._local.proxy = previous
+
+    def stats(self) -> dict[str, dict[str, t.Any]]:
+        """Health, load and throughput of every proxy"""
+        with self._lock:
+            return {
+                proxy: dict(
+                    healthy=self.is_healthy(proxy),
+                    active=stats.active,
+                    failures=stats.failures,
+                    total_bytes=stats.total_bytes,
+                    throughput=stats.throughput,
+                )
+                for proxy, stats in self.proxies.items()
+            }
@@ -0,0 +1,170 @@
+"""
+This module keeps requests to a struggling host
+in check:
+- Retry policy with exponential backoff and jitter
+- Circuit breaker that fast-fails while a host is down
+"""
+
+import random
+import threading
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+import requests
+import fzseries_api.exceptions as exceptions
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying an idempotent request"""
+
+    retryable_exceptions: tuple[type[Exception]] = (
+        requests.ConnectionError,
+        requests.Timeout,
+    )
+    """Transport errors worth retrying"""
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        status_forcelist: t.Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0,
+    ):
+        """Initializes `RetryPolicy`
+
+        Args:
+            total (int, optional): Retries after the first attempt. Defaults to 3.
+            backoff_factor (float, optional): Base delay in seconds - doubled on every retry. Defaults to 0.5.
+            max_backoff (float, optional): Longest computed delay in seconds. Defaults to 30.0.
+            status_forcelist (t.Iterable[int], optional): Response statuses worth retrying. Defaults to (429, 500, 502, 503, 504).
+            respect_retry_after (bool, optional): Wait as long as `Retry-After` header says. Defaults to True.
+            max_retry_after (float, optional): Give up if `Retry-After` asks for longer than this. Defaults to 120.0.
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = tuple(status_forcelist)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def __str__(self):
+        return f"<fzseries_api.resilience.RetryPolicy total={self.total}>"
+
+    def is_retryable(self, status_code: int) -> bool:
+        """Checks whether a response status is worth retrying"""
+        return status_code in self.status_forcelist
+
+    @staticmethod
+    def retry_after(resp: requests.Response) -> float | None:
+        """Seconds the server asked to wait through `Retry-After` header"""
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(
+        self, attempt: int, resp: requests.Response | None = None
+    ) -> float | None:
+        """Seconds to wait before the next attempt
+
+        Args:
+            attempt (int): Zero-based number of the failed attempt.
+            resp (requests.Response | None, optional): Failed response. Defaults to None.
+
+        Returns:
+            float | None: Delay in seconds - None if the server asked to wait longer than `max_retry_after`.
+        """
+        if self.respect_retry_after and resp is not None:
+            retry_after = self.retry_after(resp)
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        delay = min(self.backoff_factor * (2**attempt), self.max_backoff)
+        # Full jitter spreads retries of concurrent workers apart
+        return random.uniform(0, delay)
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures per host and fast-fails requests
+    to a host for a while once it is considered down. After the
+    recovery timeout a single trial request is let through - success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """Initializes `CircuitBreaker`
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds to wait before a trial request. Defaults to 30.0.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures: dict[str, int] = {}
+        self.opened_at: dict[str, float] = {}
+        self.trials: set[str] = set()
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> t.Literal["closed", "open", "half-open"]:
+        """Circuit state of the host"""
+        with self._lock:
+            return self._state(host)
+
+    def _state(self, host: str) -> str:
+        opened_at = self.opened_at.get(host)
+        if opened_at is None:
+            return "closed"
+        if time.monotonic() - opened_at >= self.recovery_timeout:
+            return "half-open"
+        return "open"
+
+    def before_request(self, host: str):
+        """Checks a request to the host may proceed
+
+        Raises:
+            exceptions.CircuitOpen: Host is considered down.
+        """
+        with self._lock:
+            state = self._state(host)
+            if state == "closed":
+                return
+            if state == "half-open" and host not in self.trials:
+                self.trials.add(host)
+                return
+            retry_in = self.recovery_timeout - (time.monotonic() - self.opened_at[host])
+            raise exceptions.CircuitOpen(host, max(retry_in, 0))
+
+    def record_success(self, host: str):
+        """Close the circuit of the host"""
+        with self._lock:
+            self.failures.pop(host, None)
+            self.opened_at.pop(host, None)
+            self.trials.discard(host)
+
+    def record_failure(self, host: str):
+        """Count a failure - opens the circuit once the threshold is reached"""
+        with self._lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if host in self.trials or self.failures[host] >= self.failure_threshold:
+                self.opened_at[host] = time.monotonic()
+            self.trials.discard(host)
+
+    def discard_trial(self, host: str):
+        """Let another trial request through after one ended without an outcome
+        e.g interrupted or failed for reasons other than the host"""
+        with self._lock:
+            self.trials.discard(host)
+
+    def stats(self) -> dict[str, dict[str, t.Any]]:
+        """Circuit state of every host that has failed"""
+        with self._lock:
+            return {
+                host: dict(state=self._state(host), failures=failures)
+                for host, failures in self.failures.items()
+            }
@@ -0,0 +1,127 @@
+"""
+This module compiles episode range expressions
+into the seasons and episodes they select:
+- S03E05-S04E02 - episodes from S03E05 through S04E02
+- S02,S05 - whole seasons 2 and 5
+- S03E05- - from S03E05 to the last episode available
+- latest - the latest season
+"""
+
+import re
+import sys
+import typing as t
+import fzseries_api.models as models
+
+last_episode = sys.maxsize
+"""Stands in for the end of a season or series"""
+
+bound_pattern = re.compile(r"^S(\d+)(?:E(\d+))?$", re.IGNORECASE)
+
+episode_id_pattern = re.compile(r"S(\d+)E(\d+)", re.IGNORECASE)
+
+
+def episode_number(episode: models.EpisodeInSearch, default: int) -> int:
+    """Episode number in its season as in the title e.g S01E05 - default if missing"""
+    match = episode_id_pattern.search(episode.title)
+    return int(match.group(2)) if match else default
+
+
+class EpisodeRange:
+    """Episode range expression compiled into (season, episode) spans"""
+
+    def __init__(self, expression: str):
+        """Initializes `EpisodeRange`
+
+        Args:
+            expression (str): Comma separated ranges e.g `S03E05-S04E02`, `S02,S05`, `latest`.
+
+        Raises:
+            ValueError: Unrecognised expression.
+        """
+        self.expression = expression
+        self.spans: list[tuple[tuple[int, int], tuple[int, int]]] = []
+        self.latest = False
+        for item in expression.replace(" ", "").split(","):
+            if item.lower() == "latest":
+                self.latest = True
+                continue
+            first, separator, last = item.partition("-")
+            start = self._bound(first, item, is_end=False)
+            if last:
+                end = self._bound(last, item, is_end=True)
+            elif separator:
+                # Open ended e.g S03E05-
+                end = (last_episode, last_episode)
+            else:
+                end = self._bound(first, item, is_end=True)
+            if end < start:
+                raise ValueError(f"Episode range '{item}' ends before it starts")
+            self.spans.append((start, end))
+        if not self.spans and not self.latest:
+            raise ValueError(f"Unrecognised episode range '{expression}'")
+
+    def __str__(self):
+        return f'<fzseries_api.selection.EpisodeRange expression="{self.expression}">'
+
+    @staticmethod
+    def _bound(value: str, item: str, is_end: bool) -> tuple[int, int]:
+        match = bound_pattern.match(value)
+        if not match:
+            raise ValueError(f"Unrecognised episode range '{item}'")
+        season, episode = match.groups()
+        if episode is None:
+            # A season on its own stands for all of its episodes
+            return int(season), last_episode if is_end else 0
+        return int(season), int(episode)
+
+    def index(
+        self, seasons: list[models.TVSeriesSeason]
+    ) -> list[tuple[models.TVSeriesSeason, list[tuple[int, int]]]]:
+        """Seasons whose episodes are selected along with the episode
+        number spans selected in each - nothing else needs to be fetched
+
+        Args:
+            seasons (list[models.TVSeriesSeason]): Seasons of the series.
+
+        Returns:
+            list[tuple[models.TVSeriesSeason, list[tuple[int, int]]]]: Seasons in order.
+        """
+        spans = list(self.spans)
+        if self.latest and seasons:
+            latest = max(season.number for season in seasons)
+            spans.append(((latest, 0), (latest, last_episode)))
+        selected = []
+        for season in sorted(seasons, key=lambda season: season.number):
+            episode_spans = [
+                (
+                    start[1] if start[0] == season.number else 0,
+                    end[1] if end[0] == season.number else last_episode,
+                )
+                for start, end in spans
+                if start[0] <= season.number <= end[0]
+            ]
+            if episode_spans:
+                selected.append((season, episode_spans))
+        return selected
+
+    @staticmethod
+    def select(
+        episodes: t.Iterable[models.EpisodeInSearch],
+        episode_spans: list[tuple[int, int]],
+    ) -> t.Generator[models.EpisodeInSearch, None, None]:
+        """Episodes of a season within the spans - stops past the last one
+
+        Args:
+            episodes (t.Iterable[models.EpisodeInSearch]): Episodes of the season in order.
+            episode_spans (list[tuple[int, int]]): Spans from `EpisodeRange.index`.
+
+        Yields:
+            models.EpisodeInSearch
+        """
+        last = max(end for _, end in episode_spans)
+        for position, episode in enumerate(episodes, start=1):
+            number = episode_number(episode, position)
+            if any(start <= number <= end for start, end in episode_spans):
+                yield episode
+            elif number > last:
+                return
@@ -0,0 +1,655 @@
+"""
+This module serves the SDK as a local JSON HTTP API so that
+several consumers share one warm session, the response cache
+and request coalescing instead of each bootstrapping its own.
+
+    fzseries serve --port 8000
+
+Routes:
+- GET /health : Active domain and cache stats
+- GET /search?query=&by=series|episodes : `Search` results
+- POST /series : `TVSeriesMetadata` of a `SeriesInSearch` body
+- POST /episodes : `EpisodeMetadata` of a `TVSeriesSeason` body
+- POST /links : Final download link of `{"episode": EpisodeInSearch, "format": ...}`
+- POST /jobs : Queue `{"episodes": [...], "format": ..., "directory": ..., "priority": ...}`
+  - `directory` must lie within the download root of the server
+- GET /jobs?state= : Queued jobs
+- GET /jobs/<id> : Job and its attempts
+- POST /jobs/<id>/retry : Queue failed or cancelled job again
+- DELETE /jobs/<id> : Cancel job
+
+Queued jobs are downloaded in the background by the serving process.
+Request bodies must be JSON and requests from web pages of other
+origins are rejected, so that browsing cannot queue jobs.
+
+`EpisodeProxy` serves a single episode with seeking support - see
+`serve_episode` and `fzseries proxy`.
+"""
+
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from pydantic import BaseModel, ValidationError
+from fzseries_api import logger
+from fzseries_api.main import (
+    Search,
+    TVSeriesMetadata,
+    EpisodeMetadata,
+    Download,
+    Auto,
+)
+from fzseries_api.jobs import JobQueue, default_queue_path
+from fzseries_api.cache import Singleflight
+from fzseries_api.resilience import RetryPolicy
+import fzseries_api.hunter as hunter
+import fzseries_api.models as models
+import fzseries_api.storage as storage
+import fzseries_api.throttle as throttle
+import fzseries_api.exceptions as exceptions
+
+max_body_size = 1_000_000
+"""Largest request body accepted in bytes"""
+
+loopback_hosts = ("127.0.0.1", "localhost", "[::1]")
+"""Host names the server is reachable at on this machine"""
+
+
+class ApiError(Exception):
+    """Request could not be served - carries the http status to reply with"""
+
+    def __init__(self, status: int, message: str):
+        """Initializer
+
+        Args:
+            status (int): Http status code.
+            message (str): Exception message.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+def to_json(value: t.Any) -> t.Any:
+    """Convert models in value to JSON-compatible objects"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Passes requests to the routes of `Server`"""
+
+    server: "Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _reply(self, status: int, payload: t.Any):
+        body = json.dumps(to_json(payload)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > max_body_size:
+                raise ApiError(413, "Request body is too large")
+            body = self.rfile.read(length) if length else b""
+            self.server.check_request(method, self.headers, body)
+            status, payload = self.server.route(
+                method, url.path, parse_qs(url.query), body
+            )
+        except ApiError as e:
+            status, payload = e.status, dict(error=str(e))
+        except (ValidationError, AssertionError, ValueError) as e:
+            status, payload = 400, dict(error=str(e))
+        except (KeyError, exceptions.ZeroSearchResults) as e:
+            status, payload = 404, dict(error=str(e).strip("'"))
+        except Exception as e:
+            logger.exception(f"Failed to serve {method} {url.path}")
+            status, payload = 502, dict(error=f"{e.__class__.__name__}: {e}")
+        self._reply(status, payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class Server(ThreadingHTTPServer):
+    """JSON API over the SDK sharing `hunter.session` and its caches
+    across requests, with a job queue downloaded in the background"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        queue: JobQueue | None = None,
+        workers: int = 1,
+        poll_interval: float = 5.0,
+        download_dir: str | Path | None = None,
+        allowed_hosts: t.Iterable[str] = (),
+        **kwargs,
+    ):
+        """Initializes `Server`
+
+        Args:
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on - 0 picks a free one. Defaults to 8000.
+            queue (JobQueue | None, optional): Queue for download jobs. Defaults to one at `jobs.default_queue_path`.
+            workers (int, optional): Jobs downloaded in parallel - 0 leaves them to other processes. Defaults to 1.
+            poll_interval (float, optional): Seconds between checks for jobs queued by other processes. Defaults to 5.0.
+            download_dir (str | Path | None, optional): Root that queued episodes must be saved within. Defaults to `os.getcwd()`.
+            allowed_hosts (t.Iterable[str], optional): Extra `Host` names accepted besides loopback and `host`. Defaults to ().
+
+            - The rest are arguments for `Download.save`
+        """
+        super().__init__((host, port), RequestHandler)
+        self.queue = queue or JobQueue(default_queue_path)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.download_dir = Path(download_dir or os.getcwd()).resolve()
+        port = self.server_address[1]
+        self.allowed_hosts = {
+            f"{name}:{port}" for name in (*loopback_hosts, host, *allowed_hosts)
+        }
+        self.download_kwargs = kwargs
+        self.routes: list[tuple[str, re.Pattern, t.Callable]] = [
+            ("GET", re.compile(r"/health"), self.health),
+            ("GET", re.compile(r"/search"), self.search),
+            ("POST", re.compile(r"/series"), self.series),
+            ("POST", re.compile(r"/episodes"), self.episodes),
+            ("POST", re.compile(r"/links"), self.links),
+            ("GET", re.compile(r"/jobs"), self.list_jobs),
+            ("POST", re.compile(r"/jobs"), self.add_jobs),
+            ("GET", re.compile(r"/jobs/(\d+)"), self.get_job),
+            ("POST", re.compile(r"/jobs/(\d+)/retry"), self.retry_job),
+            ("DELETE", re.compile(r"/jobs/(\d+)"), self.cancel_job),
+        ]
+        self._jobs_added = threading.Event()
+        self._stopping = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base url of the API"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def check_request(self, method: str, headers: t.Mapping[str, str], body: bytes):
+        """Reject requests web pages could forge - foreign `Host` (DNS rebinding),
+        foreign `Origin` and bodies other than JSON (cross-site form posts)
+
+        Raises:
+            ApiError: Request is not allowed.
+        """
+        host = headers.get("Host")
+        if host is not None and host.lower() not in self.allowed_hosts:
+            raise ApiError(403, f"Host '{host}' is not allowed")
+        origin = headers.get("Origin")
+        if origin is not None and (
+            urlparse(origin).scheme != "http"
+            or urlparse(origin).netloc.lower() not in self.allowed_hosts
+        ):
+            raise ApiError(403, f"Origin '{origin}' is not allowed")
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if method != "GET" and body and content_type != "application/json":
+            raise ApiError(415, "Request body must be application/json")
+
+    def _confined(self, path: str | Path) -> Path:
+        """Path resolved within `download_dir`
+
+        Raises:
+            ApiError: Path lies outside `download_dir`.
+        """
+        resolved = (self.download_dir / path).resolve()
+        if not resolved.is_relative_to(self.download_dir):
+            raise ApiError(403, f"Path '{path}' is outside the download directory")
+        return resolved
+
+    def route(
+        self, method: str, path: str, query: dict[str, list[str]], body: bytes
+    ) -> tuple[int, t.Any]:
+        """Serve request
+
+        Returns:
+            tuple[int, t.Any]: Http status and payload.
+        """
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path.rstrip("/") or "/")
+            if match is None:
+                continue
+            if route_method != method:
+                path_matched = True
+                continue
+            return handler(*match.groups(), query=query, body=body)
+        if path_matched:
+            raise ApiError(405, f"Method {method} not allowed for {path}")
+        raise ApiError(404, f"No route for {path}")
+
+    @staticmethod
+    def _param(query: dict[str, list[str]], name: str, default: str = None) -> str:
+        values = query.get(name)
+        if values:
+            return values[0]
+        if default is None:
+            raise ApiError(400, f"Query parameter '{name}' is required")
+        return default
+
+    @staticmethod
+    def _json(body: bytes) -> dict:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError as e:
+            raise ApiError(400, f"Invalid JSON body - {e}")
+        if not isinstance(data, dict):
+            raise ApiError(400, "JSON body must be an object")
+        return data
+
+    def health(self, query, body) -> tuple[int, t.Any]:
+        return 200, dict(
+            status="ok",
+            domain=hunter.router.active(),
+            response_cache=hunter.response_cache.stats(),
+            coalescing=hunter.singleflight.stats(),
+        )
+
+    def search(self, query, body) -> tuple[int, t.Any]:
+        return (
+            200,
+            Search(
+                self._param(query, "query"), self._param(query, "by", "series")
+            ).results,
+        )
+
+    def series(self, query, body) -> tuple[int, t.Any]:
+        return 200, TVSeriesMetadata(models.SeriesInSearch(**self._json(body))).results
+
+    def episodes(self, query, body) -> tuple[int, t.Any]:
+        return 200, EpisodeMetadata(models.TVSeriesSeason(**self._json(body))).results
+
+    def links(self, query, body) -> tuple[int, t.Any]:
+        data = self._json(body)
+        episode = models.EpisodeInSearch(**data.get("episode", {}))
+        download = Download(episode, data.get("format", "High MP4"))
+        # Download keys are bound to the IP that requested them
+        with hunter.proxy_pool.pinned(episode.files[0].url) as proxy:
+            link = download.last_url
+        return 200, dict(link=link, proxy=proxy, download=download.results_cache)
+
+    def list_jobs(self, query, body) -> tuple[int, t.Any]:
+        return 200, self.queue.jobs(query.get("state"))
+
+    def add_jobs(self, query, body) -> tuple[int, t.Any]:
+        data = self._json(body)
+        episodes = [
+            models.EpisodeInSearch(**episode) for episode in data.get("episodes", [])
+        ]
+        directory = self._confined(data.get("directory", self.download_dir))
+        include_metadata = bool(data.get("include_metadata", False))
+        for episode in episodes:
+            # Titles come from the client and could climb out of the directory
+            self._confined(Auto.episode_path(episode, directory, include_metadata))
+        added = self.queue.add(
+            episodes,
+            format=data.get("format", "High MP4"),
+            directory=directory,
+            include_metadata=include_metadata,
+            priority=int(data.get("priority", 0)),
+        )
+        self._jobs_added.set()
+        return 202, added
+
+    def get_job(self, job_id: str, query, body) -> tuple[int, t.Any]:
+        job_id = int(job_id)
+        return 200, dict(
+            job=self.queue.get(job_id), attempts=self.queue.attempts(job_id)
+        )
+
+    def retry_job(self, job_id: str, query, body) -> tuple[int, t.Any]:
+        if not self.queue.retry([int(job_id)]):
+            raise ApiError(409, f"Job {job_id} has neither failed nor been cancelled")
+        self._jobs_added.set()
+        return 202, self.queue.get(int(job_id))
+
+    def cancel_job(self, job_id: str, query, body) -> tuple[int, t.Any]:
+        if not self.queue.cancel([int(job_id)]):
+            raise ApiError(409, f"Job {job_id} is already done or cancelled")
+        return 200, self.queue.get(int(job_id))
+
+    def _work(self):
+        while not self._stopping.is_set():
+            self._jobs_added.clear()
+            try:
+                self.queue.run(
+                    workers=self.workers, progress_bar=False, **self.download_kwargs
+                )
+            except Exception as e:
+                logger.error(f"Job worker failed - {e}")
+            self._jobs_added.wait(self.poll_interval)
+
+    def start_workers(self):
+        """Download queued jobs in a background thread"""
+        if self.workers > 0 and self._worker is None:
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+
+    def shutdown(self):
+        """Stop serving - jobs being downloaded are resumed on the next start"""
+        self._stopping.set()
+        self.queue.stop()
+        self._jobs_added.set()
+        super().shutdown()
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    warm_up: bool = True,
+    **kwargs,
+):
+    """Serve the API until interrupted
+
+    Args:
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 8000.
+        warm_up (bool, optional): Bootstrap session and connections before serving. Defaults to True.
+
+        - The rest are arguments for `Server`
+    """
+    server = Server(host, port, **kwargs)
+    if warm_up:
+        hunter.preconnect()
+        hunter.Index()
+    server.start_workers()
+    logger.info(f"Serving fzseries API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.queue.stop()
+        server.server_close()
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """First and last byte asked for by a single `Range` header
+
+    Args:
+        header (str): Header value e.g `bytes=0-499`, `bytes=500-` or `bytes=-500`.
+        size (int): Size of the resource.
+
+    Raises:
+        ValueError: Malformed header or multiple ranges.
+
+    Returns:
+        tuple[int, int] | None: Byte range - None if it is not satisfiable.
+    """
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header)
+    if match is None or match.groups() == ("", ""):
+        raise ValueError(f"Unsupported range '{header}'")
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class EpisodeProxyHandler(BaseHTTPRequestHandler):
+    """Serves the episode of `EpisodeProxy` with `Range` support"""
+
+    server: "EpisodeProxy"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _serve(self, send_body: bool = True):
+        size = self.server.cache.size
+        start, end, status = 0, size - 1, 200
+        range_header = self.headers.get("Range")
+        if range_header:
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                # Unsupported ranges are ignored in favour of the whole file
+                byte_range = (start, end)
+            else:
+                status = 206
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range
+
+        self.send_response(status)
+        self.send_header("Content-Type", self.server.content_type)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+        try:
+            for contents in self.server.read(start, end):
+                self.wfile.write(contents)
+        except (BrokenPipeError, ConnectionResetError):
+            # Players drop connections on seeking
+            self.close_connection = True
+        except Exception as e:
+            logger.error(f"Failed to serve bytes {start}-{end} - {e}")
+            self.close_connection = True
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve()
+
+
+class EpisodeProxy(ThreadingHTTPServer):
+    """Serves an episode on localhost with seeking support.
+
+    Client ranges are mapped to upstream range requests on the final
+    download link chunk by chunk. Fetched chunks are kept in a
+    `storage.ChunkCache` so seeking back costs nothing, and the cache
+    becomes the episode file once every chunk has been fetched.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        link: str,
+        save_to: str | Path,
+        size: int,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        chunk_size: int = 1_000_000,
+        read_ahead: int = 4,
+        timeout: int = 30,
+        proxy: str | None = None,
+        promote: bool = True,
+    ):
+        """Initializes `EpisodeProxy`
+
+        Args:
+            link (str): URL pointing to downloadable episode file - `Final download link`
+            save_to (str | Path): Path the episode is cached for.
+            size (int): Episode file size in bytes.
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on - 0 picks a free one. Defaults to 8080.
+            chunk_size (int, optional): Bytes fetched per upstream request. Defaults to 1_000_000.
+            read_ahead (int, optional): Chunks prefetched past the one being served. Defaults to 4.
+            timeout (int, optional): Http request timeout. Defaults to 30.
+            proxy (str | None, optional): Proxy the link was resolved through. Defaults to None.
+            promote (bool, optional): Save the episode file once every chunk is cached. Defaults to True.
+        """
+        super().__init__((host, port), EpisodeProxyHandler)
+        self.link = link
+        self.cache = storage.ChunkCache(save_to, size, chunk_size)
+        self.read_ahead = read_ahead
+        self.timeout = timeout
+        self.proxy = proxy
+        self.promote = promote
+        self.content_type = (
+            mimetypes.guess_type(self.cache.path.name)[0] or "application/octet-stream"
+        )
+        self.policy = RetryPolicy()
+        self.upstream_requests = 0
+        self._singleflight = Singleflight()
+        self._prefetcher = ThreadPoolExecutor(max_workers=2)
+
+    @property
+    def url(self) -> str:
+        """Url the episode is served at"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/{self.cache.path.name}"
+
+    def _fetch(self, index: int):
+        if self.cache.has(index):
+            return
+        start, end = self.cache.chunk_range(index)
+        host = urlparse(self.link).netloc
+        for attempt in range(self.policy.total + 1):
+            try:
+                with throttle.tuner.connection(
+                    host
+                ), throttle.limiter.share() as bandwidth, hunter.proxy_pool.use(
+                    self.proxy
+                ) as lease:
+                    self.upstream_requests += 1
+                    resp = hunter.transport.get(
+                        self.link,
+                        headers={"Range": f"bytes={start}-{end}"},
+                        timeout=self.timeout,
+                        proxies=lease.proxies,
+                    )
+                    throttle.tuner.check_status(host, resp.status_code)
+                    resp.raise_for_status()
+                    if resp.status_code != 206:
+                        raise Exception(
+                            f"Server ignored range request - {resp.status_code}"
+                        )
+                    bandwidth.consume(len(resp.content))
+                    throttle.tuner.record(host, len(resp.content))
+                    lease.add(len(resp.content))
+                break
+            except self.policy.retryable_exceptions as e:
+                throttle.tuner.record_error(host)
+                if attempt >= self.policy.total:
+                    raise
+                logger.debug(f"Retrying chunk {index} of {self.link} - {e}")
+                time.sleep(self.policy.backoff(attempt))
+        self.cache.write(index, resp.content)
+        if self.promote and self.cache.is_complete:
+            logger.info(
+                f"Every chunk is cached - saved {self.cache.promote(self.link)}"
+            )
+
+    def fetch(self, index: int):
+        """Cache a chunk - concurrent calls for the same chunk share one request"""
+        if not self.cache.has(index):
+            self._singleflight.do(index, self._fetch, index)
+
+    def _prefetch(self, index: int):
+        try:
+            self.fetch(index)
+        except Exception as e:
+            logger.debug(f"Failed to prefetch chunk {index} - {e}")
+
+    def read(self, start: int, end: int) -> t.Generator[bytes, None, None]:
+        """Episode contents from start to end byte inclusive
+
+        Yields:
+            bytes: Contents chunk by chunk
+        """
+        for index in self.cache.chunks_for(start, end):
+            self.fetch(index)
+            for ahead in range(
+                index + 1, min(index + 1 + self.read_ahead, self.cache.count)
+            ):
+                if not self.cache.has(ahead):
+                    self._prefetcher.submit(self._prefetch, ahead)
+            chunk_start, chunk_end = self.cache.chunk_range(index)
+            first, last = max(start, chunk_start), min(end, chunk_end)
+            yield self.cache.read(first, last - first + 1)
+
+    def server_close(self):
+        # Prefetches underway finish before the cache files are closed
+        self._prefetcher.shutdown(wait=True, cancel_futures=True)
+        super().server_close()
+        self.cache.close()
+
+
+def serve_episode(
+    episode: models.EpisodeInSearch,
+    format: t.Literal["High MP4", "WEBM"] = "High MP4",
+    directory: str | Path = os.getcwd(),
+    include_metadata: bool = False,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    on_ready: t.Callable[[str], None] | None = None,
+    **kwargs,
+):
+    """Serve an episode with seeking support until interrupted
+
+    Args:
+        episode (models.EpisodeInSearch): Episode to serve.
+        format (t.Literal["High MP4", "WEBM"], optional): Defaults to "High MP4".
+        directory (str|Path, optional): Parent directory for caching the episode. Defaults to `getcwd()`.
+        include_metadata(bool, optional): Add series title and episode-id in filename. Defaults to False.
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 8080.
+        on_ready (t.Callable[[str], None] | None, optional): Called with the episode url once serving. Defaults to None.
+
+        - The rest are arguments for `EpisodeProxy`
+    """
+    download = Download(episode, format)
+    # Download keys are bound to the IP that requested them
+    with hunter.proxy_pool.pinned(episode.files[0].url) as proxy:
+        link = download.last_url
+        size = Download._probe_size(link, kwargs.get("timeout", 30))
+    if size is None:
+        raise Exception("Episode host does not support range requests")
+    save_to = Auto.episode_path(episode, directory, include_metadata)
+    save_to.parent.mkdir(parents=True, exist_ok=True)
+    server = EpisodeProxy(link, save_to, size, host, port, proxy=proxy, **kwargs)
+    if on_ready is not None:
+        on_ready(server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
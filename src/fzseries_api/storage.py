@@ -0,0 +1,961 @@
+"""
+This module provides disk-side helpers used
+while saving episodes:
+- Write-behind writer that decouples network reads from disk writes
+- Disk space checks and file preallocation
+- Checksums, integrity manifests and verification
+- Advisory file locks shared across processes
+- Per-episode download locks with progress records
+- Sparse chunk cache filled by range requests
+- Journal of byte ranges completed by out-of-order writes
+"""
+
+import ctypes
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from fzseries_api import logger
+import fzseries_api.models as models
+
+block_size = 4096
+"""Writes are batched to multiples of this size"""
+
+FALLOC_FL_KEEP_SIZE = 0x01
+"""Reserve blocks without changing the apparent file size"""
+
+checksum_algorithm = "sha256"
+"""Hashing algorithm for episodes' integrity manifests"""
+
+manifest_suffix = ".manifest.json"
+
+lock_suffix = ".lock"
+
+cache_suffix = ".cache"
+
+chunks_suffix = ".chunks"
+
+part_suffix = ".part"
+
+journal_suffix = ".journal"
+
+try:
+    if not sys.platform.startswith("linux"):
+        raise OSError("fallocate is linux specific")
+    _fallocate = ctypes.CDLL(None, use_errno=True).fallocate
+    _fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    _fallocate.restype = ctypes.c_int
+except (OSError, AttributeError):
+    _fallocate = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+windows_lock_offset = 2**40
+"""Byte locked on Windows - past any record so other processes can still read it"""
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+positional_io = hasattr(os, "pwrite")
+"""`os.pread` and `os.pwrite` are available - missing on Windows"""
+
+_binary = getattr(os, "O_BINARY", 0)
+
+
+class WriteBehindWriter:
+    """Writes chunks to a file from a background thread
+
+    Chunks are queued in memory and flushed by a dedicated
+    thread, so a slow disk does not stall the socket reads.
+    `write` blocks once the queued bytes exceed the buffer budget.
+    """
+
+    def __init__(
+        self,
+        fh: t.BinaryIO,
+        buffer_budget: int = 16_000_000,
+        write_size: int = 1_000_000,
+        hasher: t.Any = None,
+    ):
+        """Initializes `WriteBehindWriter`
+
+        Args:
+            fh (t.BinaryIO): File opened in binary write/append mode.
+            buffer_budget (int, optional): Maximum bytes queued in memory. Defaults to 16_000_000.
+            write_size (int, optional): Small chunks are batched up to this size before writing. Defaults to 1_000_000.
+            hasher (t.Any, optional): `hashlib` object updated with contents in the writer thread. Defaults to None.
+        """
+        self.fh = fh
+        self.hasher = hasher
+        self.write_size = max(write_size, block_size)
+        self.buffer_budget = max(buffer_budget, self.write_size)
+        self._chunks: deque[bytes] = deque()
+        self._pending = 0
+        self._closed = False
+        self._error: BaseException | None = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="fzseries-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def write(self, chunk: bytes):
+        """Queue chunk for writing - blocks while the buffer budget is exhausted
+
+        Args:
+            chunk (bytes): Contents to be written.
+        """
+        if not chunk:
+            return
+        with self._condition:
+            while (
+                self._pending
+                and self._pending + len(chunk) > self.buffer_budget
+                and self._error is None
+            ):
+                self._condition.wait()
+            self._raise_error()
+            self._chunks.append(chunk)
+            self._pending += len(chunk)
+            self._condition.notify_all()
+
+    def _flush(self, batch: bytearray, final: bool = False):
+        if final:
+            aligned = len(batch)
+        elif len(batch) >= self.write_size:
+            aligned = len(batch) - len(batch) % block_size
+        else:
+            return
+        self.fh.write(batch[:aligned])
+        del batch[:aligned]
+
+    def _run(self):
+        batch = bytearray()
+        try:
+            while True:
+                with self._condition:
+                    while not self._chunks and not self._closed:
+                        self._condition.wait()
+                    if not self._chunks:
+                        break
+                    chunks = list(self._chunks)
+                    self._chunks.clear()
+
+                drained = 0
+                for chunk in chunks:
+                    if self.hasher is not None:
+                        self.hasher.update(chunk)
+                    batch += chunk
+                    drained += len(chunk)
+                    self._flush(batch)
+
+                with self._condition:
+                    self._pending -= drained
+                    self._condition.notify_all()
+
+            self._flush(batch, final=True)
+
+        except BaseException as e:
+            with self._condition:
+                self._error = e
+                self._chunks.clear()
+                self._pending = 0
+                self._condition.notify_all()
+
+    def close(self):
+        """Flush queued chunks and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._raise_error()
+
+
+def preallocate(fd: int, offset: int, length: int) -> bool:
+    """Reserve disk blocks for a file without changing its apparent size.
+    The size on disk keeps reflecting the downloaded bytes so resuming
+    from `path.getsize` stays valid.
+
+    Args:
+        fd (int): File descriptor.
+        offset (int): Byte offset to start reserving from.
+        length (int): Number of bytes to reserve.
+
+    Returns:
+        bool: True if the blocks were reserved.
+    """
+    if _fallocate is None or length <= 0:
+        return False
+    if _fallocate(fd, FALLOC_FL_KEEP_SIZE, offset, length) != 0:
+        logger.debug(
+            f"Failed to preallocate {length} bytes - errno {ctypes.get_errno()}"
+        )
+        return False
+    return True
+
+
+def allocate(fd: int, size: int):
+    """Allocate the whole file upfront - its apparent size becomes `size`.
+    Meant for segmented writes at arbitrary offsets.
+
+    Args:
+        fd (int): File descriptor.
+        size (int): File size in bytes.
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        os.ftruncate(fd, size)
+
+
+def free_space(directory: str | Path) -> int:
+    """Free disk space available for a directory that may not exist yet
+
+    Args:
+        directory (str | Path): Target directory.
+
+    Returns:
+        int: Free space in bytes.
+    """
+    directory = Path(directory).absolute()
+    while not directory.exists() and directory.parent != directory:
+        directory = directory.parent
+    return shutil.disk_usage(directory).free
+
+
+def hash_file(path: str | Path, hasher: t.Any = None) -> t.Any:
+    """Hash file contents through a memory-mapped read
+
+    Args:
+        path (str | Path): Path to the file.
+        hasher (t.Any, optional): `hashlib` object to update. Defaults to new `checksum_algorithm` object.
+
+    Returns:
+        t.Any: The updated hasher
+    """
+    if hasher is None:
+        hasher = hashlib.new(checksum_algorithm)
+    with open(path, "rb") as fh:
+        if not os.fstat(fh.fileno()).st_size:
+            return hasher
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            hasher.update(contents)
+    return hasher
+
+
+def manifest_path(path: str | Path) -> Path:
+    """Path to the integrity manifest of an episode - hidden sidecar file"""
+    path = Path(path)
+    return path.with_name(f".{path.name}{manifest_suffix}")
+
+
+def part_path(path: str | Path) -> Path:
+    """Path an episode is written to before it is complete"""
+    path = Path(path)
+    return path.with_name(path.name + part_suffix)
+
+
+def journal_path(path: str | Path) -> Path:
+    """Path to the range journal of a file - hidden sidecar file"""
+    path = Path(path)
+    return path.with_name(f".{path.name}{journal_suffix}")
+
+
+def write_manifest(path: str | Path, checksum: str, url: str) -> models.EpisodeManifest:
+    """Save integrity manifest for a completely downloaded episode
+
+    Args:
+        path (str | Path): Path to the episode.
+        checksum (str): Hex digest of the contents.
+        url (str): Link the episode was downloaded from.
+
+    Returns:
+        models.EpisodeManifest
+    """
+    path = Path(path)
+    manifest = models.EpisodeManifest(
+        filename=path.name,
+        size=path.stat().st_size,
+        checksum=checksum,
+        algorithm=checksum_algorithm,
+        url=url,
+        saved_on=datetime.now(),
+    )
+    manifest_path(path).write_text(manifest.model_dump_json(indent=2))
+    return manifest
+
+
+def read_manifest(path: str | Path) -> models.EpisodeManifest:
+    """Load integrity manifest of an episode
+
+    Args:
+        path (str | Path): Path to the episode.
+
+    Returns:
+        models.EpisodeManifest
+    """
+    return models.EpisodeManifest.model_validate_json(manifest_path(path).read_text())
+
+
+def update_manifest(path: str | Path, **fields) -> models.EpisodeManifest:
+    """Set fields of an episode's integrity manifest
+
+    Args:
+        path (str | Path): Path to the episode.
+        fields : `models.EpisodeManifest` fields and their values.
+
+    Returns:
+        models.EpisodeManifest
+    """
+    manifest = read_manifest(path).model_copy(update=fields)
+    manifest_path(path).write_text(manifest.model_dump_json(indent=2))
+    return manifest
+
+
+def verify_file(path: str | Path) -> tuple[bool, str]:
+    """Check episode contents against its manifest
+
+    Args:
+        path (str | Path): Path to the episode.
+
+    Returns:
+        tuple[bool, str]: Whether the episode is intact and the reason if not.
+    """
+    path = Path(path)
+    try:
+        manifest = read_manifest(path)
+    except FileNotFoundError:
+        return False, "Manifest not found"
+    if not path.exists():
+        return False, "File not found"
+    size = path.stat().st_size
+    if size != manifest.size:
+        return False, f"Size mismatch - expected {manifest.size} got {size}"
+    checksum = hash_file(path, hashlib.new(manifest.algorithm)).hexdigest()
+    if checksum != manifest.checksum:
+        return False, "Checksum mismatch"
+    return True, "OK"
+
+
+def verify_library(
+    directory: str | Path, workers: int = 4
+) -> t.Generator[tuple[Path, bool, str], None, None]:
+    """Verify all episodes having manifests under a directory in parallel
+
+    Args:
+        directory (str | Path): Library directory.
+        workers (int, optional): Number of files verified concurrently. Defaults to 4.
+
+    Yields:
+        tuple[Path, bool, str]: Episode path, whether it's intact and the reason if not.
+    """
+    paths = [
+        manifest.with_name(manifest.name[1 : -len(manifest_suffix)])
+        for manifest in sorted(Path(directory).rglob(f".*{manifest_suffix}"))
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, (is_intact, reason) in zip(paths, executor.map(verify_file, paths)):
+            yield path, is_intact, reason
+
+
+def _lock_fd(fd: int, blocking: bool = True, poll_interval: float = 0.1):
+    """Lock an open file exclusively across processes - `flock` or
+    `msvcrt.locking` on Windows. Raises OSError if not blocking and held."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    elif msvcrt is not None:
+        while True:
+            os.lseek(fd, windows_lock_offset, os.SEEK_SET)
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                if not blocking:
+                    raise
+            time.sleep(poll_interval)
+
+
+def _unlock_fd(fd: int):
+    """Let go of a lock taken with `_lock_fd`"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, windows_lock_offset, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, held across processes through
+    `flock` or `msvcrt.locking` on Windows - only threads of the current
+    process are excluded on platforms lacking both.
+    """
+
+    def __init__(self, path: str | Path, remove_on_release: bool = False):
+        """Initializes `FileLock`
+
+        Args:
+            path (str | Path): Lock file - created if missing.
+            remove_on_release (bool, optional): Delete lock file when letting go. Defaults to False.
+        """
+        self.path = Path(path)
+        self.remove_on_release = remove_on_release
+        self._fd: int | None = None
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f'<fzseries_api.storage.FileLock path="{self.path}">'
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock
+
+        Args:
+            blocking (bool, optional): Wait for the lock instead of giving up. Defaults to True.
+
+        Returns:
+            bool: Lock was taken.
+        """
+        if not self._lock.acquire(blocking):
+            return False
+        try:
+            while True:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                _lock_fd(self._fd, blocking)
+                if not self.remove_on_release or self._is_linked():
+                    break
+                # Previous holder removed the file we were waiting on
+                os.close(self._fd)
+                self._fd = None
+        except OSError:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._lock.release()
+            if blocking:
+                raise
+            return False
+        return True
+
+    def _is_linked(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino == os.fstat(self._fd).st_ino
+        except FileNotFoundError:
+            return False
+
+    def fileno(self) -> int:
+        """Descriptor of the lock file while held"""
+        return self._fd
+
+    def release(self, remove: bool | None = None):
+        """Let go of the lock
+
+        Args:
+            remove (bool | None, optional): Delete the lock file. Defaults to `remove_on_release`.
+        """
+        if self.remove_on_release if remove is None else remove:
+            try:
+                self.path.unlink(missing_ok=True)
+            except PermissionError:
+                # Windows keeps files open by any process - the next
+                # holder reuses it instead
+                pass
+        _unlock_fd(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def lock_path(path: str | Path) -> Path:
+    """Path to the download lock of an episode - hidden sidecar file"""
+    path = Path(path)
+    return path.with_name(f".{path.name}{lock_suffix}")
+
+
+class DownloadLock:
+    """Claims an episode file for the downloading process.
+
+    The lock file records who holds it and how far the download
+    has got, so other processes can wait for or follow it. Locks of
+    crashed processes are let go by the OS - a record left behind
+    is detected as stale and the download is taken over.
+    """
+
+    def __init__(self, path: str | Path, update_interval: float = 1.0):
+        """Initializes `DownloadLock`
+
+        Args:
+            path (str | Path): Path to the episode.
+            update_interval (float, optional): Least seconds between progress record updates. Defaults to 1.0.
+        """
+        self.path = Path(path)
+        self.update_interval = update_interval
+        self.file_lock = FileLock(lock_path(self.path), remove_on_release=True)
+        self.progress: models.DownloadProgress | None = None
+        self.waited = False
+        """Lock was held by another process when last acquired"""
+        self.waited_for: models.DownloadProgress | None = None
+        """Last progress record of the process waited for"""
+        self._written_at = 0.0
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f'<fzseries_api.storage.DownloadLock path="{self.path}">'
+
+    def owner(self) -> models.DownloadProgress | None:
+        """Progress record in the lock file - None if there is none"""
+        try:
+            return models.DownloadProgress.model_validate_json(
+                self.file_lock.path.read_text()
+            )
+        except (OSError, ValueError):
+            return None
+
+    def is_locked(self) -> bool:
+        """Checks whether another process holds the lock"""
+        if self.progress is not None:
+            return False
+        if not self.file_lock.acquire(blocking=False):
+            return True
+        # Probing must not remove a record left behind by a crash
+        self.file_lock.release(remove=False)
+        return False
+
+    def acquire(
+        self,
+        blocking: bool = False,
+        poll_interval: float = 0.5,
+        on_wait: t.Callable[[models.DownloadProgress | None], None] | None = None,
+    ) -> bool:
+        """Take the lock
+
+        Args:
+            blocking (bool, optional): Wait for the lock instead of giving up. Defaults to False.
+            poll_interval (float, optional): Seconds between attempts while waiting. Defaults to 0.5.
+            on_wait (t.Callable, optional): Called with the owner's progress record on every attempt. Defaults to None.
+
+        Returns:
+            bool: Lock was taken.
+        """
+        self.waited, self.waited_for = False, None
+        while not self.file_lock.acquire(blocking=False):
+            if not blocking:
+                return False
+            self.waited = True
+            self.waited_for = self.owner() or self.waited_for
+            if on_wait is not None:
+                on_wait(self.waited_for)
+            time.sleep(poll_interval)
+        stale = self.owner()
+        if stale is not None:
+            logger.warning(
+                f"Taking over download abandoned by pid {stale.pid} "
+                f"on {stale.host} - {self.path}"
+            )
+        now = datetime.now()
+        self.progress = models.DownloadProgress(
+            filename=self.path.name,
+            pid=os.getpid(),
+            host=socket.gethostname(),
+            started_on=now,
+            updated_on=now,
+        )
+        self._write()
+        return True
+
+    def _write(self):
+        contents = self.progress.model_dump_json().encode()
+        fd = self.file_lock.fileno()
+        # Seek and write since `os.pwrite` is missing on Windows
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, contents)
+        self._written_at = time.monotonic()
+
+    def advance(self, nbytes: int, total: int | None = None):
+        """Record downloaded bytes
+
+        Args:
+            nbytes (int): Bytes downloaded since the last call.
+            total (int | None, optional): Bytes to download. Defaults to None.
+        """
+        with self._lock:
+            self.progress.downloaded += nbytes
+            has_new_total = total is not None and total != self.progress.total
+            if has_new_total:
+                self.progress.total = total
+            if (
+                has_new_total
+                or time.monotonic() - self._written_at >= self.update_interval
+            ):
+                self.progress.updated_on = datetime.now()
+                self._write()
+
+    def release(self):
+        """Let go of the lock and remove its record"""
+        self.progress = None
+        self.file_lock.release()
+
+    def __enter__(self):
+        self.acquire(blocking=True)
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def active_downloads(
+    directory: str | Path,
+) -> t.Generator[tuple[Path, models.DownloadProgress, bool], None, None]:
+    """Episodes under directory with a download lock record
+
+    Args:
+        directory (str | Path): Library directory.
+
+    Yields:
+        tuple[Path, models.DownloadProgress, bool]: Episode path, its progress record
+            and whether a process is still on it - False for stale records of crashed ones.
+    """
+    for lock_file in sorted(Path(directory).rglob(f".*{lock_suffix}")):
+        path = lock_file.with_name(lock_file.name[1 : -len(lock_suffix)])
+        lock = DownloadLock(path)
+        progress = lock.owner()
+        if progress is not None:
+            yield path, progress, lock.is_locked()
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+    """`os.pread` or seek and read where it is missing - callers
+    sharing the descriptor must then serialise access"""
+    if positional_io:
+        return os.pread(fd, length, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+
+def _pwrite(fd: int, contents: bytes, offset: int):
+    """`os.pwrite` or seek and write where it is missing - callers
+    sharing the descriptor must then serialise access"""
+    if positional_io:
+        os.pwrite(fd, contents, offset)
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, contents)
+
+
+class ChunkCache:
+    """Sparse on-disk copy of an episode file filled chunk by chunk.
+
+    Contents are written at their offsets in `<episode>.cache` and a
+    hidden `.<episode>.chunks` map keeps a byte per chunk marking the
+    ones present, so the cache outlives the process. Once every chunk
+    is present it can be promoted to the episode file itself.
+    """
+
+    def __init__(self, path: str | Path, size: int, chunk_size: int = 1_000_000):
+        """Initializes `ChunkCache`
+
+        Args:
+            path (str | Path): Path to the episode.
+            size (int): Episode file size in bytes.
+            chunk_size (int, optional): Bytes per chunk. Defaults to 1_000_000.
+        """
+        self.path = Path(path)
+        self.size = size
+        self.chunk_size = chunk_size
+        self.count = -(-size // chunk_size)
+        self.cache_path = self.path.with_name(self.path.name + cache_suffix)
+        self.map_path = self.path.with_name(f".{self.path.name}{chunks_suffix}")
+        self._lock = threading.Lock()
+        self._header = f"{size}:{chunk_size}\n".encode()
+        self.closed = False
+
+        if (
+            not self.cache_path.exists()
+            and self.path.exists()
+            and self.path.stat().st_size == size
+        ):
+            self.present = bytearray(b"\x01" * self.count)
+            self.promoted = True
+            self._fd = os.open(self.path, os.O_RDONLY | _binary)
+            self._map_fd = None
+            return
+
+        self.promoted = False
+        self.present = self._load_map()
+        self._fd = os.open(self.cache_path, os.O_RDWR | os.O_CREAT | _binary, 0o644)
+        if os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, size)
+        self._map_fd = os.open(self.map_path, os.O_RDWR | os.O_CREAT | _binary, 0o644)
+        os.ftruncate(self._map_fd, 0)
+        _pwrite(self._map_fd, self._header + self.present, 0)
+
+    def __str__(self):
+        return (
+            f'<fzseries_api.storage.ChunkCache path="{self.path}" '
+            f"present={self.present.count(1)}/{self.count}>"
+        )
+
+    def _load_map(self) -> bytearray:
+        try:
+            header, _, present = self.map_path.read_bytes().partition(b"\n")
+        except FileNotFoundError:
+            return bytearray(self.count)
+        # Map of another size or chunking cannot be trusted
+        if header + b"\n" != self._header or len(present) != self.count:
+            logger.debug(f"Discarding mismatched chunk map {self.map_path}")
+            return bytearray(self.count)
+        if not self.cache_path.exists():
+            return bytearray(self.count)
+        return bytearray(present)
+
+    @property
+    def is_complete(self) -> bool:
+        """Every chunk is present"""
+        return all(self.present)
+
+    def chunk_range(self, index: int) -> tuple[int, int]:
+        """First and last byte of a chunk"""
+        start = index * self.chunk_size
+        return start, min(start + self.chunk_size, self.size) - 1
+
+    def chunks_for(self, start: int, end: int) -> range:
+        """Chunks holding bytes start to end inclusive"""
+        return range(start // self.chunk_size, end // self.chunk_size + 1)
+
+    def has(self, index: int) -> bool:
+        """Checks the chunk is present"""
+        return bool(self.present[index])
+
+    def missing(self) -> list[int]:
+        """Chunks yet to be fetched"""
+        return [index for index, present in enumerate(self.present) if not present]
+
+    def read(self, start: int, length: int) -> bytes:
+        """Read cached contents - the chunks must be present
+
+        Raises:
+            ValueError: The cache is closed.
+        """
+        with self._lock:
+            if self.closed:
+                raise ValueError(f"Cache of {self.path} is closed")
+            return _pread(self._fd, length, start)
+
+    def write(self, index: int, contents: bytes):
+        """Store contents of a chunk
+
+        Args:
+            index (int): Chunk number.
+            contents (bytes): Whole chunk.
+        """
+        start, end = self.chunk_range(index)
+        if len(contents) != end - start + 1:
+            raise ValueError(
+                f"Chunk {index} should have {end - start + 1} bytes not {len(contents)}"
+            )
+        with self._lock:
+            # Fetches finishing after the cache is closed are dropped
+            if self.closed or self.promoted or self.present[index]:
+                return
+            _pwrite(self._fd, contents, start)
+            # Contents reach the disk before the map claims them
+            _fdatasync(self._fd)
+            self.present[index] = 1
+            _pwrite(self._map_fd, b"\x01", len(self._header) + index)
+
+    def promote(self, url: str, checksum: bool = True) -> Path:
+        """Turn a complete cache into the episode file
+
+        Args:
+            url (str): Link the episode was fetched from - for the manifest.
+            checksum (bool, optional): Save integrity manifest. Defaults to True.
+
+        Returns:
+            Path: Path to the episode.
+        """
+        with self._lock:
+            if self.promoted:
+                return self.path
+            if self.closed:
+                raise ValueError(f"Cache of {self.path} is closed")
+            if not all(self.present):
+                raise ValueError(
+                    f"{len(self.missing())} chunks of {self.path} are missing"
+                )
+            os.fsync(self._fd)
+            # Readers keep using the open descriptor of the renamed file
+            os.replace(self.cache_path, self.path)
+            os.close(self._map_fd)
+            self._map_fd = None
+            self.map_path.unlink(missing_ok=True)
+            self.promoted = True
+        if checksum:
+            write_manifest(self.path, hash_file(self.path).hexdigest(), url)
+        return self.path
+
+    def close(self):
+        """Close the cache files - waits for a write underway"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            os.close(self._fd)
+            if self._map_fd is not None:
+                os.close(self._map_fd)
+                self._map_fd = None
+
+
+class RangeJournal:
+    """Byte ranges of a file completed by out-of-order writes.
+
+    Ranges are kept merged and saved to a hidden `.<file>.journal`
+    sidecar. Saving syncs the file contents first and replaces the
+    journal atomically, so it never claims bytes a crash could have
+    lost - a resumed download fetches just the ranges missing.
+    """
+
+    def __init__(self, path: str | Path, size: int, sync_interval: float = 5.0):
+        """Initializes `RangeJournal`
+
+        Args:
+            path (str | Path): Path to the file being written.
+            size (int): File size in bytes.
+            sync_interval (float, optional): Least seconds between journal saves. Defaults to 5.0.
+        """
+        self.path = Path(path)
+        self.size = size
+        self.sync_interval = sync_interval
+        self.journal_path = journal_path(self.path)
+        self.ranges: list[tuple[int, int]] = []
+        """Completed ranges - sorted, merged and inclusive"""
+        self._synced_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return (
+            f'<fzseries_api.storage.RangeJournal path="{self.path}" '
+            f"completed={self.completed}/{self.size}>"
+        )
+
+    def load(self) -> bool:
+        """Restore ranges saved for the file
+
+        Returns:
+            bool: Journal exists and matches the file.
+        """
+        try:
+            saved = json.loads(self.journal_path.read_text())
+        except (OSError, ValueError):
+            return False
+        if saved.get("size") != self.size or not self.path.exists():
+            logger.debug(f"Discarding mismatched range journal {self.journal_path}")
+            return False
+        with self._lock:
+            self.ranges = []
+            for start, end in saved["ranges"]:
+                self._add(start, end)
+        return True
+
+    def _add(self, start: int, end: int):
+        merged = []
+        for first, last in self.ranges:
+            if last + 1 < start or end + 1 < first:
+                merged.append((first, last))
+            else:
+                start, end = min(start, first), max(end, last)
+        merged.append((start, end))
+        self.ranges = sorted(merged)
+
+    def add(self, start: int, end: int):
+        """Record bytes start to end inclusive as written"""
+        with self._lock:
+            self._add(start, end)
+
+    @property
+    def completed(self) -> int:
+        """Bytes written"""
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    @property
+    def is_complete(self) -> bool:
+        """Every byte is written"""
+        return self.ranges == [(0, self.size - 1)]
+
+    def missing(self, segment_size: int | None = None) -> list[tuple[int, int]]:
+        """Ranges yet to be written
+
+        Args:
+            segment_size (int | None, optional): Split ranges to at most this size. Defaults to None.
+
+        Returns:
+            list[tuple[int, int]]: Inclusive byte ranges.
+        """
+        with self._lock:
+            gaps, position = [], 0
+            for start, end in [*self.ranges, (self.size, self.size)]:
+                if start > position:
+                    gaps.append((position, start - 1))
+                position = end + 1
+        if not segment_size:
+            return gaps
+        return [
+            (offset, min(offset + segment_size, end + 1) - 1)
+            for start, end in gaps
+            for offset in range(start, end + 1, segment_size)
+        ]
+
+    def sync(self, fd: int, force: bool = False):
+        """Save the journal once contents written so far reach the disk
+
+        Args:
+            fd (int): File descriptor of the file being written.
+            force (bool, optional): Save regardless of `sync_interval`. Defaults to False.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._synced_at < self.sync_interval:
+                return
+            self._synced_at = time.monotonic()
+            ranges = list(self.ranges)
+        # Ranges are taken before syncing so that none outruns the contents
+        _fdatasync(fd)
+        temporary_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        temporary_path.write_text(json.dumps(dict(size=self.size, ranges=ranges)))
+        os.replace(temporary_path, self.journal_path)
+
+    def remove(self):
+        """Delete the journal"""
+        self.journal_path.unlink(missing_ok=True)
@@ -0,0 +1,697 @@
+"""
+This module provides flow-control primitives
+shared across concurrent downloads:
+- Bandwidth limiter (token bucket) - process or machine wide
+- Connection-count autotuner (AIMD) per download host
+- Polite per-host request scheduler with priorities
+- History of measured download throughput for estimates
+"""
+
+import heapq
+import itertools
+import json
+import os
+import struct
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from fzseries_api import logger
+import fzseries_api.utils as utils
+
+
+class LocalBucket:
+    """Token bucket state kept in-process"""
+
+    def __init__(self, rate: float = 0):
+        """Initializes `LocalBucket`
+
+        Args:
+            rate (float, optional): Refill rate in bytes per second. Defaults to 0.
+        """
+        self.rate = rate
+        self._tokens = 0.0
+        self._timestamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, nbytes: int, burst: float) -> float:
+        """Take tokens going into debt if necessary
+
+        Args:
+            nbytes (int): Tokens to take.
+            burst (float): Bucket capacity in seconds worth of tokens.
+
+        Returns:
+            float: Seconds to wait before using the tokens.
+        """
+        with self._lock:
+            rate = self.rate
+            if not rate:
+                return 0
+            now = time.monotonic()
+            self._tokens = min(
+                rate * burst, self._tokens + (now - self._timestamp) * rate
+            )
+            self._timestamp = now
+            self._tokens -= nbytes
+            return -self._tokens / rate if self._tokens < 0 else 0
+
+
+class FileBucket:
+    """Token bucket state shared across processes through a small file.
+
+    The file holds `tokens`, `timestamp` and `rate` and is updated
+    under an exclusive `flock`, so every process using the same path
+    draws from one budget and rate changes propagate to all of them.
+    """
+
+    record = struct.Struct("ddd")
+
+    def __init__(self, path: str | Path, rate: float | None = None):
+        """Initializes `FileBucket`
+
+        Args:
+            path (str | Path): Path to the shared state file.
+            rate (float | None, optional): Refill rate in bytes per second - leave None to use the stored one. Defaults to None.
+        """
+        import fcntl
+
+        self._fcntl = fcntl
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+        if rate is not None:
+            self.rate = rate
+
+    @contextmanager
+    def _locked_state(self) -> t.Generator[list[float], None, None]:
+        with self._lock:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+            try:
+                contents = os.pread(self._fd, self.record.size, 0)
+                if len(contents) == self.record.size:
+                    state = list(self.record.unpack(contents))
+                else:
+                    state = [0.0, time.time(), 0.0]
+                yield state
+                os.pwrite(self._fd, self.record.pack(*state), 0)
+            finally:
+                self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    @property
+    def rate(self) -> float:
+        with self._locked_state() as state:
+            return state[2]
+
+    @rate.setter
+    def rate(self, value: float):
+        with self._locked_state() as state:
+            state[2] = float(value or 0)
+
+    def reserve(self, nbytes: int, burst: float) -> float:
+        """Take tokens going into debt if necessary - see `LocalBucket.reserve`"""
+        with self._locked_state() as state:
+            tokens, timestamp, rate = state
+            if not rate:
+                return 0
+            now = time.time()
+            tokens = min(rate * burst, tokens + max(now - timestamp, 0) * rate)
+            tokens -= nbytes
+            state[0], state[1] = tokens, now
+            return -tokens / rate if tokens < 0 else 0
+
+    def close(self):
+        """Close the state file - waits for an update underway"""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class BandwidthLimiter:
+    """Caps the aggregate download rate of every download sharing it.
+
+    Downloads draw tokens in equal quanta from a single bucket.
+    Reservations are served in arrival order and paid for by sleeping
+    outside the lock, so `n` concurrent downloads converge on
+    `rate / n` each and no download starves.
+    """
+
+    def __init__(
+        self,
+        rate: int | None = None,
+        burst: float = 1.0,
+        quantum: int = 256_000,
+        path: str | Path | None = None,
+    ):
+        """Initializes `BandwidthLimiter`
+
+        Args:
+            rate (int | None, optional): Maximum bytes per second - None for unlimited. Defaults to None.
+            burst (float, optional): Seconds worth of bytes allowed in a burst. Defaults to 1.0.
+            quantum (int, optional): Bytes each download reserves at a time. Defaults to 256_000.
+            path (str | Path | None, optional): File for sharing the limit across processes. Defaults to None.
+        """
+        self.burst = burst
+        self.quantum = quantum
+        self.bucket: LocalBucket | FileBucket = (
+            FileBucket(path, rate) if path else LocalBucket(rate or 0)
+        )
+        self.active_shares = 0
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"<fzseries_api.throttle.BandwidthLimiter rate={self.rate}>"
+
+    @property
+    def rate(self) -> float:
+        """Maximum bytes per second - 0 for unlimited"""
+        return self.bucket.rate
+
+    def set_rate(self, rate: int | None):
+        """Adjust the maximum bytes per second at runtime
+
+        Args:
+            rate (int | None): Bytes per second - None or 0 for unlimited.
+        """
+        self.bucket.rate = rate or 0
+
+    def use_file(self, path: str | Path):
+        """Share the limit with other processes using the same file
+
+        Args:
+            path (str | Path): Path to the shared state file.
+        """
+        rate = self.rate
+        previous, self.bucket = self.bucket, FileBucket(path, rate or None)
+        # Descriptors of replaced files would otherwise leak
+        if isinstance(previous, FileBucket):
+            previous.close()
+
+    def consume(self, nbytes: int):
+        """Block until `nbytes` can be transferred within the limit
+
+        Args:
+            nbytes (int): Number of bytes.
+        """
+        with self._lock:
+            self.total_bytes += nbytes
+        wait = self.bucket.reserve(nbytes, self.burst)
+        if wait > 0:
+            time.sleep(wait)
+
+    @contextmanager
+    def share(self) -> t.Generator["LimiterShare", None, None]:
+        """Register a download drawing from the limiter"""
+        with self._lock:
+            self.active_shares += 1
+        share = LimiterShare(self)
+        try:
+            yield share
+        finally:
+            share.flush()
+            with self._lock:
+                self.active_shares -= 1
+
+    def stats(self) -> dict[str, t.Any]:
+        """Limiter state"""
+        rate = self.rate
+        return dict(
+            rate=rate,
+            active_shares=self.active_shares,
+            fair_share=rate / self.active_shares if rate and self.active_shares else 0,
+            total_bytes=self.total_bytes,
+        )
+
+
+class LimiterShare:
+    """A single download's view of `BandwidthLimiter` - batches
+    chunk sizes into quanta so the shared bucket is not touched
+    on every chunk"""
+
+    def __init__(self, limiter: BandwidthLimiter):
+        self.limiter = limiter
+        self._pending = 0
+
+    def consume(self, nbytes: int):
+        """Account for transferred bytes
+
+        Args:
+            nbytes (int): Number of bytes.
+        """
+        self._pending += nbytes
+        if self._pending >= self.limiter.quantum:
+            self.flush()
+
+    def flush(self):
+        """Settle accumulated bytes with the limiter"""
+        if self._pending:
+            pending, self._pending = self._pending, 0
+            self.limiter.consume(pending)
+
+
+class HostConnections:
+    """Connection-count state of a single host kept by `ConnectionTuner`"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.errors = 0
+        self.throughput = 0.0
+        self.window_bytes = 0
+        self.window_started = time.monotonic()
+        self.saturated = False
+
+    def __str__(self):
+        return f"<fzseries_api.throttle.HostConnections limit={self.limit} active={self.active}>"
+
+
+class ConnectionTuner:
+    """Decides how many concurrent connections to open per host.
+
+    Additive increase while the aggregate throughput of a saturated
+    host keeps improving, a step back on diminishing returns and
+    multiplicative decrease on errors such as 429/503 or dropped
+    connections.
+    """
+
+    backoff_status_codes: tuple[int] = (429, 503)
+    """Responses signalling the host is overloaded"""
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 8,
+        window: float = 5.0,
+        gain: float = 0.05,
+    ):
+        """Initializes `ConnectionTuner`
+
+        Args:
+            initial (int, optional): Starting connections per host. Defaults to 2.
+            minimum (int, optional): Least connections per host. Defaults to 1.
+            maximum (int, optional): Most connections per host. Defaults to 8.
+            window (float, optional): Seconds of throughput measured before each decision. Defaults to 5.0.
+            gain (float, optional): Relative throughput change considered significant. Defaults to 0.05.
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.gain = gain
+        self.hosts: dict[str, HostConnections] = {}
+        self._condition = threading.Condition()
+
+    def _host(self, host: str) -> HostConnections:
+        if host not in self.hosts:
+            self.hosts[host] = HostConnections(
+                min(max(self.initial, self.minimum), self.maximum)
+            )
+        return self.hosts[host]
+
+    def limit(self, host: str) -> int:
+        """Current connections allowed for the host"""
+        with self._condition:
+            return self._host(host).limit
+
+    def acquire(self, host: str):
+        """Block until a connection to the host is allowed"""
+        with self._condition:
+            state = self._host(host)
+            while state.active >= state.limit:
+                self._condition.wait()
+            state.active += 1
+            if state.active >= state.limit:
+                state.saturated = True
+
+    def release(self, host: str):
+        """Give back a connection acquired with `acquire`"""
+        with self._condition:
+            self._host(host).active -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def connection(self, host: str) -> t.Generator[None, None, None]:
+        """Hold a connection slot for the host"""
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def record(self, host: str, nbytes: int):
+        """Account for bytes received from the host and adjust its limit
+        at the end of every measurement window
+
+        Args:
+            host (str): Host name.
+            nbytes (int): Bytes received.
+        """
+        with self._condition:
+            state = self._host(host)
+            state.window_bytes += nbytes
+            elapsed = time.monotonic() - state.window_started
+            if elapsed < self.window:
+                return
+            throughput = state.window_bytes / elapsed
+            if state.saturated:
+                if throughput > state.throughput * (1 + self.gain):
+                    state.limit = min(state.limit + 1, self.maximum)
+                elif throughput < state.throughput * (1 - self.gain):
+                    state.limit = max(state.limit - 1, self.minimum)
+            state.throughput = throughput
+            state.window_bytes = 0
+            state.window_started = time.monotonic()
+            state.saturated = state.active >= state.limit
+            self._condition.notify_all()
+
+    def record_error(self, host: str):
+        """Halve the connections allowed for the host"""
+        with self._condition:
+            state = self._host(host)
+            state.errors += 1
+            state.limit = max(state.limit // 2, self.minimum)
+            state.window_bytes = 0
+            state.window_started = time.monotonic()
+            state.saturated = False
+
+    def check_status(self, host: str, status_code: int):
+        """Back off if the response status signals an overloaded host"""
+        if status_code in self.backoff_status_codes:
+            self.record_error(host)
+
+    def stats(self) -> dict[str, dict[str, t.Any]]:
+        """Current decision for every host"""
+        with self._condition:
+            return {
+                host: dict(
+                    limit=state.limit,
+                    active=state.active,
+                    throughput=round(state.throughput),
+                    errors=state.errors,
+                )
+                for host, state in self.hosts.items()
+            }
+
+
+class Priority:
+    """Request priorities - lower values are served first"""
+
+    INTERACTIVE = 0
+    """Search and metadata lookups a user is waiting on"""
+
+    BACKGROUND = 10
+    """Crawling and prefetching"""
+
+
+class HostSchedule:
+    """Request schedule of a single host kept by `RequestScheduler`"""
+
+    def __init__(self, rate: float, concurrency: int):
+        self.configured_rate = rate
+        self.rate = rate
+        self.concurrency = concurrency
+        self.active = 0
+        self.next_at = time.monotonic()
+        self.waiters: list[tuple[int, int]] = []
+        self.throttled = 0
+
+    def __str__(self):
+        return f"<fzseries_api.throttle.HostSchedule rate={self.rate} active={self.active}>"
+
+
+class RequestScheduler:
+    """Spaces out requests per host to a configurable rate and
+    concurrency, serving interactive requests ahead of background ones.
+    The rate is halved whenever the host responds with 429/503 and
+    recovers gradually as requests succeed.
+    """
+
+    backoff_status_codes: tuple[int] = (429, 503)
+    """Responses signalling the host wants us to slow down"""
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        concurrency: int = 4,
+        min_rate: float = 0.2,
+        recovery: float = 0.1,
+    ):
+        """Initializes `RequestScheduler`
+
+        Args:
+            rate (float, optional): Requests per second per host. Defaults to 5.0.
+            concurrency (int, optional): Requests in flight per host. Defaults to 4.
+            min_rate (float, optional): Least requests per second after backing off. Defaults to 0.2.
+            recovery (float, optional): Requests per second regained after every success. Defaults to 0.1.
+        """
+        self.rate = rate
+        self.concurrency = concurrency
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.hosts: dict[str, HostSchedule] = {}
+        self._overrides: dict[str, tuple[float, int]] = {}
+        self._counter = itertools.count()
+        self._local = threading.local()
+        self._condition = threading.Condition()
+
+    def _host(self, host: str) -> HostSchedule:
+        if host not in self.hosts:
+            self.hosts[host] = HostSchedule(
+                *self._overrides.get(host, (self.rate, self.concurrency))
+            )
+        return self.hosts[host]
+
+    def configure(
+        self,
+        host: str | None = None,
+        rate: float | None = None,
+        concurrency: int | None = None,
+    ):
+        """Change rate and concurrency of a host or the defaults of all hosts
+
+        Args:
+            host (str | None, optional): Host name - None for all hosts. Defaults to None.
+            rate (float | None, optional): Requests per second. Defaults to None.
+            concurrency (int | None, optional): Requests in flight. Defaults to None.
+        """
+        with self._condition:
+            if host is None:
+                self.rate = rate or self.rate
+                self.concurrency = concurrency or self.concurrency
+                schedules = [
+                    schedule
+                    for name, schedule in self.hosts.items()
+                    if name not in self._overrides
+                ]
+            else:
+                current = self._overrides.get(host, (self.rate, self.concurrency))
+                self._overrides[host] = (rate or current[0], concurrency or current[1])
+                schedules = [self._host(host)]
+            for schedule in schedules:
+                schedule.configured_rate = rate or schedule.configured_rate
+                schedule.rate = min(schedule.rate, schedule.configured_rate)
+                schedule.concurrency = concurrency or schedule.concurrency
+            self._condition.notify_all()
+
+    @property
+    def default_priority(self) -> int:
+        """Priority of requests made by the current thread"""
+        return getattr(self._local, "priority", Priority.INTERACTIVE)
+
+    @contextmanager
+    def priority(self, level: int) -> t.Generator[None, None, None]:
+        """Make requests from the current thread at the given priority"""
+        previous = self.default_priority
+        self._local.priority = level
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def background(self) -> t.ContextManager[None]:
+        """Make requests from the current thread at background priority"""
+        return self.priority(Priority.BACKGROUND)
+
+    def in_background(self, function: t.Callable) -> t.Callable:
+        """Wrap function to make its requests at background priority in
+        whichever thread runs it e.g workers of a thread pool"""
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.background():
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def acquire(self, host: str, priority: int | None = None):
+        """Block until a request to the host may be sent
+
+        Args:
+            host (str): Host name.
+            priority (int | None, optional): Request priority. Defaults to `default_priority`.
+        """
+        entry = (
+            self.default_priority if priority is None else priority,
+            next(self._counter),
+        )
+        with self._condition:
+            schedule = self._host(host)
+            heapq.heappush(schedule.waiters, entry)
+            try:
+                while True:
+                    if (
+                        schedule.waiters[0] == entry
+                        and schedule.active < schedule.concurrency
+                    ):
+                        now = time.monotonic()
+                        if schedule.next_at <= now:
+                            heapq.heappop(schedule.waiters)
+                            schedule.active += 1
+                            schedule.next_at = now + 1 / schedule.rate
+                            self._condition.notify_all()
+                            return
+                        self._condition.wait(schedule.next_at - now)
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                # An interrupted waiter must not block those queued behind it
+                if entry in schedule.waiters:
+                    schedule.waiters.remove(entry)
+                    heapq.heapify(schedule.waiters)
+                    self._condition.notify_all()
+                raise
+
+    def release(self, host: str, status_code: int | None = None):
+        """Complete a request to the host and adapt its rate to the response
+
+        Args:
+            host (str): Host name.
+            status_code (int | None, optional): Response status - None on failure. Defaults to None.
+        """
+        with self._condition:
+            schedule = self._host(host)
+            schedule.active -= 1
+            if status_code in self.backoff_status_codes:
+                schedule.throttled += 1
+                schedule.rate = max(schedule.rate / 2, self.min_rate)
+                schedule.next_at = time.monotonic() + 1 / schedule.rate
+            elif status_code is not None:
+                schedule.rate = min(
+                    schedule.rate + self.recovery, schedule.configured_rate
+                )
+            self._condition.notify_all()
+
+    def stats(self) -> dict[str, dict[str, t.Any]]:
+        """Current schedule of every host"""
+        with self._condition:
+            return {
+                host: dict(
+                    rate=round(schedule.rate, 2),
+                    concurrency=schedule.concurrency,
+                    active=schedule.active,
+                    waiting=len(schedule.waiters),
+                    throttled=schedule.throttled,
+                )
+                for host, schedule in self.hosts.items()
+            }
+
+
+class ThroughputHistory:
+    """Throughput of recently completed downloads kept in a small
+    JSON file so that later runs can estimate how long a batch takes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_samples: int = 50,
+        max_age: float = 7 * 24 * 3600,
+        min_size: int = 1_000_000,
+    ):
+        """Initializes `ThroughputHistory`
+
+        Args:
+            path (str | Path): Path to the history file.
+            max_samples (int, optional): Most recent samples kept. Defaults to 50.
+            max_age (float, optional): Seconds after which a sample is ignored. Defaults to 7*24*3600.
+            min_size (int, optional): Least bytes a download must transfer to be sampled. Defaults to 1_000_000.
+        """
+        self.path = Path(path)
+        self.max_samples = max_samples
+        self.max_age = max_age
+        self.min_size = min_size
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f'<fzseries_api.throttle.ThroughputHistory path="{self.path}">'
+
+    def samples(self) -> list[dict[str, float]]:
+        """Recent samples - `finished_on`, `nbytes` and `seconds`"""
+        try:
+            samples = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return []
+        oldest = time.time() - self.max_age
+        return [
+            sample
+            for sample in samples
+            if isinstance(sample, dict) and sample.get("finished_on", 0) >= oldest
+        ]
+
+    def record(self, nbytes: int, seconds: float):
+        """Add a completed download - failures to persist are only logged
+
+        Args:
+            nbytes (int): Bytes transferred.
+            seconds (float): Time taken.
+        """
+        if nbytes < self.min_size or seconds <= 0:
+            return
+        with self._lock:
+            samples = self.samples()
+            samples.append(
+                dict(finished_on=time.time(), nbytes=nbytes, seconds=seconds)
+            )
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+                temporary.write_text(json.dumps(samples[-self.max_samples :]))
+                # Replaced atomically since other processes read it anytime
+                os.replace(temporary, self.path)
+            except OSError as e:
+                logger.debug(f"Failed to record throughput - {e}")
+
+    def rate(self) -> float | None:
+        """Bytes per second over the recent samples - None without any"""
+        samples = self.samples()
+        seconds = sum(sample["seconds"] for sample in samples)
+        if not seconds:
+            return None
+        return sum(sample["nbytes"] for sample in samples) / seconds
+
+
+limiter = BandwidthLimiter(
+    rate=utils.parse_rate(os.getenv("FZSERIES_MAX_BANDWIDTH", "")),
+    path=os.getenv("FZSERIES_BANDWIDTH_FILE"),
+)
+"""Bandwidth limiter shared by all downloads in the process"""
+
+tuner = ConnectionTuner()
+"""Connections autotuner shared by all downloads in the process"""
+
+scheduler = RequestScheduler(
+    rate=float(os.getenv("FZSERIES_REQUEST_RATE", 5.0)),
+    concurrency=int(os.getenv("FZSERIES_REQUEST_CONCURRENCY", 4)),
+)
+"""Schedules metadata requests made through `hunter`"""
+
+history = ThroughputHistory(
+    os.getenv("FZSERIES_THROUGHPUT_FILE", Path.home() / ".fzseries" / "throughput.json")
+)
+"""Throughput of downloads completed on this machine"""
@@ -0,0 +1,362 @@
+"""
+This module provides interchangeable HTTP backends
+used by `hunter` and `Download.save`:
+- requests (default)
+- urllib3 - thin backend skipping requests' per-call overhead
+- httpx - HTTP/2 multiplexing, requires `pip install fzseries-api[http2]`
+
+Every backend shares headers and cookies of `hunter.session` and
+returns `requests.Response` objects.
+"""
+
+import time
+import typing as t
+from datetime import timedelta
+from urllib.parse import urljoin
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import fzseries_api.utils as utils
+
+
+class Transport:
+    """Sends requests prepared from a session"""
+
+    name: str = None
+
+    def __init__(self, session: requests.Session):
+        """Initializes `Transport`
+
+        Args:
+            session (requests.Session): Session providing headers and cookies.
+        """
+        self.session = session
+
+    def __str__(self):
+        return f"<fzseries_api.transport.{self.__class__.__name__}>"
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+        proxies: dict | None = None,
+    ) -> requests.Response:
+        """Send request
+
+        Args:
+            method (str): Http method.
+            url (str): Url to resource.
+            params (dict | None, optional): Query parameters. Defaults to None.
+            headers (dict | None, optional): Headers on top of the session's. Defaults to None.
+            timeout (float | None, optional): Http request timeout. Defaults to None.
+            stream (bool, optional): Defer reading the body. Defaults to False.
+            allow_redirects (bool, optional): Follow redirects. Defaults to True.
+            proxies (dict | None, optional): Proxies keyed by scheme. Defaults to None.
+
+        Returns:
+            requests.Response
+        """
+        raise NotImplementedError
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> requests.Response:
+        """Send GET request - see `request`"""
+        return self.request("GET", url, params=params, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """Send HEAD request - see `request`"""
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def prepare(
+        self, method: str, url: str, params: dict | None, headers: dict | None
+    ) -> requests.PreparedRequest:
+        """Merge request with headers and cookies of the session"""
+        return self.session.prepare_request(
+            requests.Request(method, url, params=params, headers=headers)
+        )
+
+    def pool_managers(self) -> list[urllib3.PoolManager]:
+        """Connection pools in use - for `hunter.pool_stats`"""
+        return []
+
+    def close(self):
+        """Close connections"""
+
+
+class RequestsTransport(Transport):
+    """Sends requests through `requests.Session`"""
+
+    name = "requests"
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def pool_managers(self) -> list[urllib3.PoolManager]:
+        return [adapter.poolmanager for adapter in set(self.session.adapters.values())]
+
+
+class Urllib3Transport(Transport):
+    """Sends requests straight through a `urllib3.PoolManager`"""
+
+    name = "urllib3"
+
+    def __init__(
+        self, session: requests.Session, num_pools: int = 32, maxsize: int = 16
+    ):
+        """Initializes `Urllib3Transport`
+
+        Args:
+            session (requests.Session): Session providing headers and cookies.
+            num_pools (int, optional): Hosts whose connections are kept alive. Defaults to 32.
+            maxsize (int, optional): Connections kept alive per host. Defaults to 16.
+        """
+        super().__init__(session)
+        self.pool = urllib3.PoolManager(num_pools=num_pools, maxsize=maxsize)
+        self._proxy_pools: dict[str, urllib3.PoolManager] = {}
+        self._adapter = HTTPAdapter()
+        self.max_redirects = session.max_redirects
+
+    def _pool_for(self, url: str, proxies: dict | None) -> urllib3.PoolManager:
+        proxy = (proxies or {}).get(url.split(":", 1)[0].lower())
+        if not proxy:
+            return self.pool
+        if proxy not in self._proxy_pools:
+            if proxy.lower().startswith("socks"):
+                try:
+                    from urllib3.contrib.socks import SOCKSProxyManager
+                except ImportError as e:
+                    raise ImportError(
+                        "SOCKS proxies require extra dependencies - "
+                        "pip install requests[socks]"
+                    ) from e
+                self._proxy_pools[proxy] = SOCKSProxyManager(proxy)
+            else:
+                self._proxy_pools[proxy] = urllib3.proxy_from_url(proxy)
+        return self._proxy_pools[proxy]
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+        proxies: dict | None = None,
+    ) -> requests.Response:
+        prepared = self.prepare(method, url, params, headers)
+        history: list[requests.Response] = []
+        while True:
+            resp = self._send(prepared, timeout, proxies)
+            next_url = self.session.get_redirect_target(resp)
+            if not allow_redirects or not next_url:
+                break
+            if len(history) >= self.max_redirects:
+                resp.close()
+                raise requests.TooManyRedirects(
+                    f"Exceeded {self.max_redirects} redirects", response=resp
+                )
+            # Body is read so that the connection goes back to the pool
+            resp.content
+            history.append(resp)
+            if resp.status_code in (301, 302, 303) and method != "HEAD":
+                method = "GET"
+            # Preparing every hop afresh sends cookies set by the previous ones
+            prepared = self.prepare(method, urljoin(resp.url, next_url), None, headers)
+        resp.history = history
+        if not stream:
+            resp.content
+        return resp
+
+    def _send(
+        self,
+        prepared: requests.PreparedRequest,
+        timeout: float | None,
+        proxies: dict | None,
+    ) -> requests.Response:
+        started = time.monotonic()
+        try:
+            raw = self._pool_for(prepared.url, proxies).urlopen(
+                prepared.method,
+                prepared.url,
+                headers=dict(prepared.headers),
+                retries=urllib3.Retry(
+                    total=None,
+                    connect=0,
+                    read=0,
+                    status=0,
+                    other=0,
+                    redirect=False,
+                ),
+                redirect=False,
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                preload_content=False,
+                decode_content=False,
+            )
+        except urllib3.exceptions.MaxRetryError as e:
+            if isinstance(e.reason, urllib3.exceptions.ConnectTimeoutError):
+                raise requests.ConnectTimeout(e, request=prepared)
+            if isinstance(e.reason, urllib3.exceptions.ReadTimeoutError):
+                raise requests.ReadTimeout(e, request=prepared)
+            raise requests.ConnectionError(e, request=prepared)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.ReadTimeout(e, request=prepared)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.ConnectionError(e, request=prepared)
+
+        resp = self._adapter.build_response(prepared, raw)
+        resp.url = prepared.url
+        resp.elapsed = timedelta(seconds=time.monotonic() - started)
+        extract_cookies_to_jar(self.session.cookies, prepared, raw)
+        return resp
+
+    def pool_managers(self) -> list[urllib3.PoolManager]:
+        return [self.pool, *self._proxy_pools.values()]
+
+    def close(self):
+        self.pool.clear()
+        for pool in self._proxy_pools.values():
+            pool.clear()
+
+
+class HttpxStream:
+    """Body of a httpx response in the shape `requests.Response.raw` takes"""
+
+    def __init__(self, response: t.Any):
+        self.response = response
+        self._chunks: t.Iterator[bytes] | None = None
+
+    def stream(self, amt: int | None = None, decode_content: bool = True):
+        yield from self.response.iter_bytes(amt)
+
+    def read(self, amt: int | None = None) -> bytes:
+        if amt is None:
+            return self.response.read()
+        if self._chunks is None:
+            self._chunks = self.response.iter_bytes(amt)
+        return next(self._chunks, b"")
+
+    def close(self):
+        self.response.close()
+
+
+class HttpxTransport(Transport):
+    """Sends requests through `httpx.Client` - HTTP/2 lets concurrent
+    metadata requests share a single connection per host"""
+
+    name = "httpx"
+
+    def __init__(self, session: requests.Session, http2: bool = True):
+        """Initializes `HttpxTransport`
+
+        Args:
+            session (requests.Session): Session providing headers and cookies.
+            http2 (bool, optional): Negotiate HTTP/2 where servers support it. Defaults to True.
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "httpx transport requires extra dependencies - "
+                "pip install fzseries-api[http2]"
+            ) from e
+        super().__init__(session)
+        self._httpx = httpx
+        self.http2 = http2
+        # The jar is shared so cookies set by responses land in the session
+        self.client = httpx.Client(http2=http2, cookies=session.cookies)
+        self._proxy_clients: dict[str, t.Any] = {}
+
+    def _client_for(self, url: str, proxies: dict | None) -> t.Any:
+        proxy = (proxies or {}).get(url.split(":", 1)[0].lower())
+        if not proxy:
+            return self.client
+        if proxy not in self._proxy_clients:
+            self._proxy_clients[proxy] = self._httpx.Client(
+                http2=self.http2,
+                cookies=self.session.cookies,
+                proxy=proxy,
+            )
+        return self._proxy_clients[proxy]
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+        proxies: dict | None = None,
+    ) -> requests.Response:
+        httpx = self._httpx
+        prepared = self.prepare(method, url, params, headers)
+        client = self._client_for(prepared.url, proxies)
+        started = time.monotonic()
+        try:
+            raw = client.send(
+                client.build_request(
+                    method,
+                    prepared.url,
+                    headers=dict(prepared.headers),
+                    timeout=timeout,
+                ),
+                stream=True,
+                follow_redirects=allow_redirects,
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=prepared)
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=prepared)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=prepared)
+
+        resp = requests.Response()
+        resp.status_code = raw.status_code
+        resp.reason = raw.reason_phrase
+        resp.headers = CaseInsensitiveDict(raw.headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = str(raw.url)
+        resp.request = prepared
+        resp.raw = HttpxStream(raw)
+        resp.elapsed = timedelta(seconds=time.monotonic() - started)
+        if not stream:
+            resp.content
+            raw.close()
+        return resp
+
+    def close(self):
+        self.client.close()
+        for client in self._proxy_clients.values():
+            client.close()
+
+
+transports: dict[str, type[Transport]] = {
+    transport.name: transport
+    for transport in (RequestsTransport, Urllib3Transport, HttpxTransport)
+}
+"""Available backends keyed by name"""
+
+
+def create(name: str, session: requests.Session, **kwargs) -> Transport:
+    """Make transport by name
+
+    Args:
+        name (str): Backend name - one of `transports`.
+        session (requests.Session): Session providing headers and cookies.
+
+    Returns:
+        Transport
+    """
+    utils.assert_membership(name, tuple(transports), "Transport")
+    return transports[name](session, **kwargs)
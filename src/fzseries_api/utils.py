@@ -38,6 +38,57 @@ def get_absolute_url(relative_url: str) -> str:
     return path.join(default_site_url, relative_url)
 
 
+size_units: dict[str, int] = {
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4,
+}
+"""Multipliers for file size units - binary to keep estimates on the safe side"""
+
+rate_units: dict[str, int] = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "TB": 1000**4,
+}
+"""Multipliers for transfer rate units - decimal like the progress bars"""
+
+
+def parse_size(size: str, units: dict[str, int] = size_units) -> int | None:
+    """Converts human readable file size to bytes
+
+    Args:
+        size (str): File size e.g "350 MB", "1.2GB".
+        units (dict[str, int], optional): Multipliers of the units. Defaults to `size_units`.
+
+    Returns:
+        int | None: Size in bytes or None if unparseable.
+    """
+    match = re.search(r"([\d.,]+)\s*([KMGT]?B)", str(size), re.IGNORECASE)
+    if not match:
+        return None
+    try:
+        value = float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+    return int(value * units[match.group(2).upper()])
+
+
+def parse_rate(rate: str) -> int | None:
+    """Converts human readable transfer rate to bytes per second
+
+    Args:
+        rate (str): Rate e.g "40MB", "512 KB" - 1 MB being 10^6 bytes.
+
+    Returns:
+        int | None: Bytes per second or None if unparseable.
+    """
+    return parse_size(rate, rate_units)
+
+
 def assert_membership(value: t.Any, elements: t.Iterable, identity="Value"):
     """Asserts value is a member of elements
 
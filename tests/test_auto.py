@@ -0,0 +1,186 @@
+import unittest
+import tempfile
+import threading
+import time
+from datetime import datetime
+from unittest import mock
+from pathlib import Path
+import fzseries_api.exceptions as exceptions
+from fzseries_api.main import Auto, Download, EpisodeMetadata, TVSeriesMetadata
+import fzseries_api.models as models
+import fzseries_api.throttle as throttle
+
+
+def episode(season_number: int, number: int) -> models.EpisodeInSearch:
+    return models.EpisodeInSearch(
+        title=f"Test Series - S{season_number:02d}E{number:02d}.mp4",
+        files=[dict(url=f"https://example.com/e{number}", identity="High MP4")],
+        cover_photo="https://example.com/cover.jpg",
+        aired_on=datetime(2024, 1, number),
+    )
+
+
+def download_page(download: Download) -> models.DownloadEpisode:
+    """Download page of the episode without fetching it - S02 pages fail"""
+    if "S02" in download.episode.title:
+        raise Exception("Download page is gone")
+    return models.DownloadEpisode(
+        links=["https://example.com/download"],
+        filename=download.episode.title,
+        size="2 MB",
+        downloads=1,
+    )
+
+
+class TestPlanEpisodes(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dir = Path(self.directory.name)
+        self.results = Download.results
+        self.history = throttle.history
+        Download.results = property(download_page)
+        throttle.history = throttle.ThroughputHistory(self.dir / "throughput.json")
+
+    def tearDown(self):
+        Download.results = self.results
+        throttle.history = self.history
+        self.directory.cleanup()
+
+    def test_plan(self):
+        size = models.DownloadEpisode(
+            links=["https://example.com/download"],
+            filename="episode.mp4",
+            size="2 MB",
+            downloads=1,
+        ).size_in_bytes
+        episodes = [episode(1, 1), episode(1, 2), episode(2, 1)]
+        saved_to = Auto.episode_path(episodes[0], self.dir)
+        saved_to.parent.mkdir(parents=True)
+        saved_to.write_bytes(bytes(500_000))
+
+        plan = Auto.plan_episodes(episodes, directory=self.dir, workers=2)
+        self.assertEqual(
+            [planned.title for planned in plan.episodes],
+            [episode.title for episode in episodes],
+        )
+        self.assertEqual(plan.size, size * 2)
+        self.assertEqual(plan.remaining, size * 2 - 500_000)
+        self.assertEqual(plan.unknown_sizes, 1)
+        self.assertEqual(plan.episodes[2].error, "Download page is gone")
+        self.assertEqual(
+            [(season.season, season.episodes) for season in plan.seasons],
+            [("S01", 2), ("S02", 1)],
+        )
+        self.assertIsNone(plan.eta)
+
+        throttle.history.record(size, 2.0)
+        plan = Auto.plan_episodes(episodes, directory=self.dir)
+        self.assertAlmostEqual(plan.eta, (size * 2 - 500_000) / (size / 2.0))
+
+    def test_ensure_disk_space(self):
+        episodes = [episode(1, 1), episode(1, 2)]
+        plan = Auto.plan_episodes(
+            episodes, directory=self.dir, format_policy="smallest"
+        )
+        self.assertEqual(plan.unknown_sizes, 0)
+        self.assertEqual(
+            Auto.ensure_disk_space(episodes, directory=self.dir), plan.remaining
+        )
+        with mock.patch(
+            "fzseries_api.storage.free_space", return_value=plan.remaining - 1
+        ):
+            with self.assertRaises(exceptions.InsufficientDiskSpace):
+                Auto.ensure_disk_space(
+                    episodes, directory=self.dir, format_policy="smallest"
+                )
+
+
+class OfflineAuto(Auto):
+    """Searches nothing - the series found is a stub"""
+
+    session_is_initialized = True
+
+    @property
+    def results(self) -> models.SearchResults:
+        return models.SearchResults(
+            series=[
+                dict(
+                    title="Test Series",
+                    url="https://example.com/series",
+                    cover_photo="https://example.com/cover.jpg",
+                    about="Testing",
+                )
+            ]
+        )
+
+
+class TestIterEpisodes(unittest.TestCase):
+
+    def setUp(self):
+        self.fetched = []
+        self.released = threading.Event()
+        self.series_results = TVSeriesMetadata.results
+        self.season_results = EpisodeMetadata.results
+        TVSeriesMetadata.results = property(lambda _: self.series())
+        EpisodeMetadata.results = property(lambda metadata: self.season(metadata))
+
+    def tearDown(self):
+        self.released.set()
+        TVSeriesMetadata.results = self.series_results
+        EpisodeMetadata.results = self.season_results
+
+    def series(self) -> models.TVSeries:
+        return models.TVSeries(
+            title="Test Series",
+            genres=None,
+            year=None,
+            about="Testing",
+            imdb_rating=None,
+            last_updated=None,
+            seasons=[
+                dict(
+                    url=f"https://example.com/s{number}",
+                    identity=f"Season {number}",
+                    number=number,
+                )
+                for number in range(1, 6)
+            ],
+        )
+
+    def season(self, metadata: EpisodeMetadata) -> models.EpisodeSearchResults:
+        """Pages of seasons past the first are held until released"""
+        self.fetched.append(metadata.season.number)
+        if metadata.season.number > 1:
+            self.released.wait(5)
+        return models.EpisodeSearchResults(
+            episodes=[episode(metadata.season.number, number) for number in (1, 2, 3)]
+        )
+
+    def assertFetchedUpTo(self, last: int):
+        """Seasons past the lookahead are never fetched - pending ones may be cancelled"""
+        self.released.set()
+        time.sleep(0.2)
+        self.assertIn(1, self.fetched)
+        self.assertLessEqual(max(self.fetched), last)
+
+    def test_limit_stops_fetching(self):
+        episodes = OfflineAuto("test").iter_episodes(limit=2, lookahead=1)
+        self.assertEqual(
+            [episode.title for episode in episodes],
+            ["Test Series - S01E01.mp4", "Test Series - S01E02.mp4"],
+        )
+        self.assertFetchedUpTo(2)
+
+    def test_close_stops_fetching(self):
+        episodes = OfflineAuto("test").iter_episodes(lookahead=2)
+        self.assertEqual(next(episodes).title, "Test Series - S01E01.mp4")
+        started = time.monotonic()
+        episodes.close()
+        # Fetches underway are not waited for
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFetchedUpTo(3)
+
+
+if __name__ == "__main__":
+    unittest.main()
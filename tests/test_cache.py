@@ -0,0 +1,185 @@
+import unittest
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pydantic import BaseModel
+from fzseries_api.cache import Singleflight, ParsedCache, response_cache
+import fzseries_api.hunter as hunter
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Counts requests and takes a while to respond"""
+
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        SlowHandler.requests += 1
+        time.sleep(0.2)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves a page - with an ETag under `/etag`"""
+
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        PageHandler.requests.append(self.headers.get("If-None-Match"))
+        has_etag = self.path.startswith("/etag")
+        if has_etag and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if has_etag:
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", "4")
+        self.end_headers()
+        self.wfile.write(b"page")
+
+
+def run_concurrently(function, count: int = 5) -> list:
+    results = [None] * count
+
+    def target(index: int):
+        try:
+            results[index] = function()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleflight(unittest.TestCase):
+
+    def test_identical_calls_are_coalesced(self):
+        singleflight = Singleflight()
+
+        def slow():
+            time.sleep(0.2)
+            return object()
+
+        results = run_concurrently(lambda: singleflight.do("key", slow))
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertEqual(singleflight.stats()["calls"], 1)
+        self.assertEqual(singleflight.stats()["coalesced"], 4)
+
+    def test_error_reaches_all_waiters(self):
+        singleflight = Singleflight()
+
+        def failing():
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        results = run_concurrently(lambda: singleflight.do("key", failing))
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(singleflight.stats()["in_flight"], 0)
+
+
+class TestGetResource(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/files-1"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_concurrent_requests_share_network_call(self):
+        SlowHandler.requests = 0
+        results = run_concurrently(lambda: hunter.Metadata.get_resource(self.url).text)
+        self.assertEqual(results, ["ok"] * 5)
+        self.assertEqual(SlowHandler.requests, 1)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        PageHandler.requests = []
+        response_cache.clear()
+        self.ttl = response_cache.ttl
+
+    def tearDown(self):
+        response_cache.ttl = self.ttl
+
+    def get(self, path: str) -> str:
+        return hunter.Metadata.get_resource(self.base + path, cacheable=True).text
+
+    def test_fresh_response_is_reused(self):
+        self.assertEqual(self.get("/page"), "page")
+        self.assertEqual(self.get("/page"), "page")
+        self.assertEqual(len(PageHandler.requests), 1)
+
+    def test_revalidation_with_etag(self):
+        response_cache.ttl = 0
+        not_modified = response_cache.stats()["not_modified"]
+        self.assertEqual(self.get("/etag"), "page")
+        self.assertEqual(self.get("/etag"), "page")
+        self.assertEqual(PageHandler.requests, [None, '"v1"'])
+        self.assertEqual(response_cache.stats()["not_modified"], not_modified + 1)
+
+    def test_unchanged_content_without_validators(self):
+        response_cache.ttl = 0
+        unchanged = response_cache.stats()["unchanged"]
+        first = hunter.Metadata.get_resource(self.base + "/page", cacheable=True)
+        second = hunter.Metadata.get_resource(self.base + "/page", cacheable=True)
+        self.assertIs(first, second)
+        self.assertEqual(response_cache.stats()["unchanged"], unchanged + 1)
+
+
+class Page(BaseModel):
+    contents: str
+
+
+class TestParsedCache(unittest.TestCase):
+
+    def test_identical_contents_are_parsed_once(self):
+        parsed_cache = ParsedCache()
+        parsed = []
+
+        @parsed_cache.memoize
+        def handler(contents: str) -> Page:
+            parsed.append(contents)
+            return Page(contents=contents)
+
+        first, second = handler("<html/>"), handler("<html/>")
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        handler("<body/>")
+        self.assertEqual(parsed, ["<html/>", "<body/>"])
+        self.assertEqual(parsed_cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
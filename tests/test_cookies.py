@@ -0,0 +1,118 @@
+import unittest
+import time
+import tempfile
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlparse
+import requests
+from requests.cookies import RequestsCookieJar, create_cookie
+from fzseries_api.cookies import CookieStore
+from fzseries_api.storage import FileLock
+import fzseries_api.hunter as hunter
+
+
+class TestCookieStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "cookies.txt"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def jar(self, **cookies) -> RequestsCookieJar:
+        jar = RequestsCookieJar()
+        for name, value in cookies.items():
+            jar.set_cookie(create_cookie(name, value, domain="fztvseries.live"))
+        return jar
+
+    def test_session_cookies_survive_runs_with_expiry(self):
+        CookieStore(self.path).save(self.jar(PHPSESSID="abc"))
+        jar = RequestsCookieJar()
+        self.assertEqual(CookieStore(self.path).load(jar), 1)
+        cookie = next(iter(jar))
+        self.assertEqual(cookie.value, "abc")
+        self.assertGreater(cookie.expires, time.time())
+
+    def test_expired_cookies_are_dropped(self):
+        CookieStore(self.path, lifetime=-1).save(self.jar(PHPSESSID="abc"))
+        self.assertEqual(CookieStore(self.path).load(RequestsCookieJar()), 0)
+
+    def test_saves_of_processes_are_merged(self):
+        CookieStore(self.path).save(self.jar(PHPSESSID="abc"))
+        CookieStore(self.path).save(self.jar(other="xyz"))
+        jar = RequestsCookieJar()
+        CookieStore(self.path).load(jar)
+        self.assertEqual(jar.get("PHPSESSID"), "abc")
+        self.assertEqual(jar.get("other"), "xyz")
+
+    def test_file_lock_is_exclusive(self):
+        lock = self.path.with_suffix(".lock")
+        with FileLock(lock):
+            self.assertFalse(FileLock(lock).acquire(blocking=False))
+        other = FileLock(lock)
+        self.assertTrue(other.acquire(blocking=False))
+        other.release()
+
+
+class TestWarmStart(unittest.TestCase):
+
+    def test_index_is_skipped_with_saved_session(self):
+        domain = urlparse(hunter.router.active()).netloc
+        hunter.session.cookies.set_cookie(
+            create_cookie("PHPSESSID", "abc", domain=domain)
+        )
+        try:
+            self.assertTrue(hunter.has_session(hunter.router.active()))
+            self.assertIsNone(hunter.Index().index_resp)
+        finally:
+            hunter.session.cookies.clear(domain, "/", "PHPSESSID")
+
+
+class TestSessionRenewal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.site_url = hunter.router.active()
+        self.domain = urlparse(self.site_url).netloc
+        hunter.persist_cookies(Path(self.directory.name) / "cookies.txt")
+        hunter.session.cookies.set_cookie(
+            create_cookie("PHPSESSID", "stale", domain=self.domain)
+        )
+        hunter.save_cookies()
+
+    def tearDown(self):
+        hunter.persist_cookies(None)
+        hunter.session.cookies.clear(self.domain, "/", "PHPSESSID")
+        self.directory.cleanup()
+
+    def fetch(self, url, *args, **kwargs) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code, resp.url = 200, url
+        resp.headers["Content-Type"] = "text/html"
+        if url == self.site_url:
+            hunter.session.cookies.set_cookie(
+                create_cookie("PHPSESSID", "fresh", domain=self.domain)
+            )
+            resp._content = b"<html>Index</html>"
+        elif hunter.session.cookies.get("PHPSESSID") == "stale":
+            resp._content = (
+                b'<p>Your download keys have expired. <a href="/">Home</a></p>'
+            )
+        else:
+            resp._content = b"<html>Episode</html>"
+        return resp
+
+    def test_stale_session_is_renewed(self):
+        with mock.patch.object(hunter, "fetch", self.fetch), mock.patch.object(
+            hunter, "_check_domains_in_background"
+        ):
+            resp = hunter.Metadata._get_resource(self.site_url + "episode.php")
+        self.assertEqual(resp.text, "<html>Episode</html>")
+        jar = RequestsCookieJar()
+        hunter.cookie_store.load(jar)
+        self.assertEqual(jar.get("PHPSESSID"), "fresh")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from fzseries_api.domains import DomainRouter
+
+domains = ("https://one.test/", "https://two.test/", "https://three.test/")
+
+
+class TestDomainRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = DomainRouter(domains, preferred=domains[1])
+
+    def test_preferred_until_measured(self):
+        self.assertEqual(self.router.active(), domains[1])
+
+    def test_routes_to_fastest(self):
+        self.router.update({domains[0]: 0.5, domains[1]: 0.9, domains[2]: 0.1})
+        self.assertEqual(self.router.candidates(), [domains[2], domains[0], domains[1]])
+
+    def test_fails_over(self):
+        self.router.update({domains[0]: 0.5, domains[1]: 0.9, domains[2]: None})
+        self.assertEqual(self.router.active(), domains[0])
+        self.assertEqual(self.router.candidates()[-1], domains[2])
+
+    def test_rewrite(self):
+        self.assertEqual(
+            self.router.rewrite("https://one.test/files-1.htm?a=1", domains[2]),
+            "https://three.test/files-1.htm?a=1",
+        )
+        self.assertEqual(
+            self.router.rewrite("https://mirror.test/file.mp4", domains[2]),
+            "https://mirror.test/file.mp4",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,420 @@
+import unittest
+import os
+import re
+import threading
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from fzseries_api.main import Download, FormatPolicy
+import fzseries_api.hunter as hunter
+import fzseries_api.models as models
+import fzseries_api.storage as storage
+import fzseries_api.throttle as throttle
+import fzseries_api.exceptions as exceptions
+
+contents = os.urandom(3_000_000)
+
+
+class EpisodeFileHandler(BaseHTTPRequestHandler):
+    """Serves `contents` with support for `Range` requests - `/flaky.mp4`
+    drops the connection halfway unless a range is requested and
+    `/norange.mp4` ignores ranges"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(contents)))
+        self.end_headers()
+
+    def do_GET(self):
+        start, end = 0, len(contents) - 1
+        range_header = self.headers.get("Range")
+        if self.path == "/norange.mp4":
+            range_header = None
+        if range_header:
+            self.server.ranges.append(range_header)
+            match = re.match(r"bytes=(\d+)-(\d*)", range_header)
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+            if start >= len(contents):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(contents)}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if self.path == "/flaky.mp4" and not range_header:
+            self.wfile.write(contents[: len(contents) // 2])
+            return
+        self.wfile.write(contents[start : end + 1])
+
+
+class LocalServerTestBase:
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EpisodeFileHandler)
+        cls.server.ranges = []
+        cls.link = f"http://127.0.0.1:{cls.server.server_port}/episode.mp4"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dir = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestSave(LocalServerTestBase, unittest.TestCase):
+
+    def test_save(self):
+        saved_to = Download.save(
+            self.link, "episode.mp4", dir=self.dir, progress_bar=False
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertTrue(storage.verify_file(saved_to)[0])
+
+    def test_resume(self):
+        (self.dir / "episode.mp4").write_bytes(contents[:1_000_000])
+        saved_to = Download.save(
+            self.link, "episode.mp4", dir=self.dir, progress_bar=False, resume=True
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertTrue(storage.verify_file(saved_to)[0])
+
+    def test_resume_restarts_when_range_is_ignored(self):
+        (self.dir / "episode.mp4").write_bytes(contents[:1_000_000])
+        saved_to = Download.save(
+            self.link.replace("episode.mp4", "norange.mp4"),
+            "episode.mp4",
+            dir=self.dir,
+            progress_bar=False,
+            resume=True,
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertTrue(storage.verify_file(saved_to)[0])
+
+    def test_stopped_save_is_resumable(self):
+        stop = threading.Event()
+        stop.set()
+        for connections in (1, 4):
+            with self.assertRaises(exceptions.DownloadStopped):
+                Download.save(
+                    self.link,
+                    "episode.mp4",
+                    dir=self.dir,
+                    progress_bar=False,
+                    connections=connections,
+                    segment_size=0.5,
+                    stop=stop,
+                )
+            self.assertFalse(storage.DownloadLock(self.dir / "episode.mp4").is_locked())
+        saved_to = Download.save(
+            self.link, "episode.mp4", dir=self.dir, progress_bar=False, resume=True
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+
+    def test_segmented_save(self):
+        saved_to = Download.save(
+            self.link,
+            "episode.mp4",
+            dir=self.dir,
+            progress_bar=False,
+            connections=4,
+            segment_size=0.5,
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertFalse(saved_to.with_name("episode.mp4.part").exists())
+        self.assertTrue(storage.verify_file(saved_to)[0])
+
+    def test_segmented_save_without_positional_writes(self):
+        storage.positional_io = False
+        try:
+            saved_to = Download.save(
+                self.link,
+                "episode.mp4",
+                dir=self.dir,
+                progress_bar=False,
+                connections=4,
+                segment_size=0.5,
+            )
+        finally:
+            storage.positional_io = True
+        self.assertEqual(saved_to.read_bytes(), contents)
+
+    def test_segmented_save_resumes_missing_ranges(self):
+        part_path = storage.part_path(self.dir / "episode.mp4")
+        part_path.write_bytes(contents[:1_000_000] + bytes(len(contents) - 1_000_000))
+        journal = storage.RangeJournal(part_path, len(contents))
+        journal.add(0, 999_999)
+        with open(part_path, "r+b") as fh:
+            journal.sync(fh.fileno(), force=True)
+        self.server.ranges.clear()
+        saved_to = Download.save(
+            self.link,
+            "episode.mp4",
+            dir=self.dir,
+            progress_bar=False,
+            connections=2,
+            segment_size=0.5,
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertTrue(storage.verify_file(saved_to)[0])
+        fetched = [
+            int(re.match(r"bytes=(\d+)", r).group(1)) for r in self.server.ranges
+        ]
+        # The first range is the size probe
+        self.assertEqual(
+            sorted(fetched[1:]), [1_000_000, 1_500_000, 2_000_000, 2_500_000]
+        )
+        self.assertFalse(journal.journal_path.exists() or part_path.exists())
+
+    def test_probe_size(self):
+        self.assertEqual(Download._probe_size(self.link, 10), len(contents))
+        norange_link = self.link.replace("episode.mp4", "norange.mp4")
+        self.assertIsNone(Download._probe_size(norange_link, 10))
+        saved_to = Download.save(
+            norange_link,
+            "episode.mp4",
+            dir=self.dir,
+            progress_bar=False,
+            connections=4,
+            segment_size=0.5,
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+
+    def test_stale_journal_is_discarded_without_range_support(self):
+        part_path = storage.part_path(self.dir / "episode.mp4")
+        part_path.write_bytes(contents[:1_000_000] + bytes(len(contents) - 1_000_000))
+        journal = storage.RangeJournal(part_path, len(contents))
+        journal.add(0, 999_999)
+        with open(part_path, "r+b") as fh:
+            journal.sync(fh.fileno(), force=True)
+        saved_to = Download.save(
+            self.link.replace("episode.mp4", "norange.mp4"),
+            "episode.mp4",
+            dir=self.dir,
+            progress_bar=False,
+        )
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertFalse(journal.journal_path.exists() or part_path.exists())
+
+    def test_manifest_records_format_choice(self):
+        saved_to = Download.save(
+            self.link, "episode.mp4", dir=self.dir, progress_bar=False
+        )
+        choice = models.FormatChoice(
+            format="WEBM",
+            policy="smallest",
+            sizes={"High MP4": 3_500_000, "WEBM": len(contents)},
+            decided_on=datetime.now(),
+        )
+        storage.update_manifest(saved_to, format_choice=choice)
+        self.assertEqual(storage.read_manifest(saved_to).format_choice, choice)
+        self.assertTrue(storage.verify_file(saved_to)[0])
+
+    def test_verify_detects_corruption(self):
+        saved_to = Download.save(
+            self.link, "episode.mp4", dir=self.dir, progress_bar=False
+        )
+        with open(saved_to, "r+b") as fh:
+            fh.write(b"corrupt")
+        results = list(storage.verify_library(self.dir))
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0][1])
+
+
+class StubbedFormatPolicy(FormatPolicy):
+    """Takes size and throughput of each format from `measurements`"""
+
+    measurements: dict[str, tuple[int | None, float | None]] = {}
+
+    def _measure(self, episode, format):
+        return self.measurements[format]
+
+
+class TestFormatPolicy(LocalServerTestBase, unittest.TestCase):
+
+    episode = models.EpisodeInSearch(
+        title="Test Series - S01E01.mp4",
+        files=[
+            dict(url="https://example.com/e1", identity="High MP4"),
+            dict(url="https://example.com/e1.webm", identity="WEBM"),
+        ],
+        cover_photo="https://example.com/cover.jpg",
+        aired_on=datetime(2024, 1, 1),
+    )
+
+    def choose(self, policy: str, **measurements) -> str:
+        StubbedFormatPolicy.measurements = {
+            "High MP4": measurements["mp4"],
+            "WEBM": measurements["webm"],
+        }
+        return StubbedFormatPolicy(policy).choose(self.episode).format
+
+    def test_smallest(self):
+        self.assertEqual(
+            self.choose("smallest", mp4=(300, None), webm=(200, None)), "WEBM"
+        )
+        self.assertEqual(
+            self.choose("smallest", mp4=(300, None), webm=(None, None)), "High MP4"
+        )
+
+    def test_prefer_within_tolerance(self):
+        self.assertEqual(
+            self.choose("prefer:WEBM:10", mp4=(200, None), webm=(215, None)), "WEBM"
+        )
+        self.assertEqual(
+            self.choose("prefer:WEBM:10", mp4=(200, None), webm=(240, None)),
+            "High MP4",
+        )
+
+    def test_fastest(self):
+        # WEBM is larger but takes 2s against 3s
+        self.assertEqual(
+            self.choose("fastest", mp4=(300, 100.0), webm=(400, 200.0)), "WEBM"
+        )
+        self.assertEqual(
+            self.choose("fastest", mp4=(300, 100.0), webm=(100, None)), "High MP4"
+        )
+
+    def test_probe_reads_at_most_probe_size(self):
+        class ProbedDownload:
+            last_url = self.link.replace("episode.mp4", "norange.mp4")
+
+        host = f"127.0.0.1:{self.server.server_port}"
+        throttle.tuner.hosts.pop(host, None)
+        policy = FormatPolicy("fastest", probe_size=100_000)
+        self.assertTrue(policy._probe(ProbedDownload()))
+        self.assertEqual(throttle.tuner.hosts[host].window_bytes, 100_000)
+
+    def test_parse(self):
+        policy = FormatPolicy("prefer:WEBM:15")
+        self.assertEqual((policy.name, policy.preferred), ("prefer", "WEBM"))
+        self.assertEqual(policy.tolerance, 15)
+        self.assertEqual(FormatPolicy("prefer:High MP4").tolerance, 10)
+        for invalid in ("largest", "prefer", "prefer:MKV:10"):
+            with self.assertRaises(AssertionError):
+                FormatPolicy(invalid)
+
+
+class TestStream(LocalServerTestBase, unittest.TestCase):
+
+    def test_stream(self):
+        streamed = b"".join(Download.stream_link(self.link, read_ahead=0.5))
+        self.assertEqual(streamed, contents)
+
+    def test_offset(self):
+        streamed = b"".join(Download.stream_link(self.link, offset=1_000_000))
+        self.assertEqual(streamed, contents[1_000_000:])
+
+    def test_reconnects_after_drop(self):
+        link = self.link.replace("episode.mp4", "flaky.mp4")
+        streamed = b"".join(Download.stream_link(link, chunk_size=64))
+        self.assertEqual(streamed, contents)
+
+    def test_consumer_stops_early(self):
+        chunks = Download.stream_link(self.link, chunk_size=10, read_ahead=0.05)
+        self.assertEqual(next(chunks), contents[:10_000])
+        chunks.close()
+
+
+class TestDownloadLocking(LocalServerTestBase, unittest.TestCase):
+
+    def save(self, **kwargs) -> Path:
+        return Download.save(
+            self.link, "episode.mp4", dir=self.dir, progress_bar=False, **kwargs
+        )
+
+    def test_skip_while_another_downloads(self):
+        lock = storage.DownloadLock(self.dir / "episode.mp4")
+        self.assertTrue(lock.acquire())
+        try:
+            with self.assertRaises(exceptions.DownloadInProgress):
+                self.save(if_locked="skip")
+        finally:
+            lock.release()
+
+    def test_wait_reuses_completed_download(self):
+        lock = storage.DownloadLock(self.dir / "episode.mp4")
+        self.assertTrue(lock.acquire())
+
+        def complete():
+            saved_to = self.dir / "episode.mp4"
+            saved_to.write_bytes(contents)
+            storage.write_manifest(
+                saved_to, storage.hash_file(saved_to).hexdigest(), self.link
+            )
+            lock.release()
+
+        timer = threading.Timer(0.3, complete)
+        timer.start()
+        saved_to = self.save(if_locked="wait")
+        timer.join()
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertFalse(storage.lock_path(saved_to).exists())
+
+    def test_wait_without_manifest_does_not_download_again(self):
+        lock = storage.DownloadLock(self.dir / "episode.mp4")
+        self.assertTrue(lock.acquire())
+        lock.advance(0, total=len(contents))
+
+        completed = {}
+
+        def complete():
+            saved_to = self.dir / "episode.mp4"
+            saved_to.write_bytes(contents)
+            completed["modified"] = saved_to.stat().st_mtime_ns
+            lock.release()
+
+        timer = threading.Timer(0.3, complete)
+        timer.start()
+        saved_to = self.save(if_locked="wait", checksum=False)
+        timer.join()
+        self.assertEqual(saved_to.stat().st_mtime_ns, completed["modified"])
+
+    def test_wait_resumes_where_the_other_process_stopped(self):
+        lock = storage.DownloadLock(self.dir / "episode.mp4")
+        self.assertTrue(lock.acquire())
+
+        def interrupt():
+            (self.dir / "episode.mp4").write_bytes(contents[:1_000_000])
+            lock.release()
+
+        self.server.ranges.clear()
+        timer = threading.Timer(0.3, interrupt)
+        timer.start()
+        saved_to = self.save(if_locked="wait", checksum=False)
+        timer.join()
+        self.assertEqual(saved_to.read_bytes(), contents)
+        self.assertEqual(self.server.ranges, ["bytes=1000000-"])
+
+
+class TestConnectionPool(LocalServerTestBase, unittest.TestCase):
+
+    def test_preconnect_and_pool_stats(self):
+        latencies = hunter.preconnect([self.link], connections=2)
+        self.assertIsInstance(latencies[self.link], float)
+        stats = hunter.pool_stats()[f"http://127.0.0.1:{self.server.server_port}"]
+        self.assertEqual(stats["maxsize"], hunter.mirror_pool_size)
+        self.assertGreaterEqual(stats["idle"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import io
+import json
+from datetime import datetime, timedelta
+import fzseries_api.models as models
+from fzseries_api.export import aria2_entry, write
+
+
+def resolved(number: int, **kwargs) -> models.ResolvedEpisode:
+    resolved_on = datetime(2024, 1, 1, 12)
+    return models.ResolvedEpisode(
+        title=f"Test Series - S01E{number:02d}.mp4",
+        url=f"https://d1.example.com/e{number}.mp4",
+        path=f"/downloads/Test Series/S1/Test Series - S01E{number:02d}.mp4",
+        resolved_on=resolved_on,
+        expires_on=resolved_on + timedelta(hours=1),
+        **kwargs,
+    )
+
+
+class TestExport(unittest.TestCase):
+
+    def test_aria2_entry(self):
+        entry = aria2_entry(
+            resolved(
+                1,
+                mirrors=["https://d2.example.com/e1.mp4"],
+                size=250_000_000,
+                proxy="http://127.0.0.1:3128",
+            ),
+            headers={"User-Agent": "Mozilla/5.0"},
+        )
+        self.assertEqual(
+            entry.splitlines(),
+            [
+                "# Test Series - S01E01.mp4 - 250.0 MB, expires 2024-01-01T13:00:00",
+                "https://d1.example.com/e1.mp4\thttps://d2.example.com/e1.mp4",
+                "  dir=/downloads/Test Series/S1",
+                "  out=Test Series - S01E01.mp4",
+                "  all-proxy=http://127.0.0.1:3128",
+                "  header=User-Agent: Mozilla/5.0",
+            ],
+        )
+
+    def test_aria2_entry_omits_socks_proxy(self):
+        with self.assertLogs("fzseries_api", level="WARNING"):
+            entry = aria2_entry(resolved(1, proxy="socks5h://127.0.0.1:9050"))
+        self.assertNotIn("all-proxy", entry)
+
+    def test_write_ndjson(self):
+        output = io.StringIO()
+        self.assertEqual(
+            write((resolved(number) for number in (1, 2)), output, format="ndjson"), 2
+        )
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(
+            [line["url"] for line in lines],
+            [
+                "https://d1.example.com/e1.mp4",
+                "https://d1.example.com/e2.mp4",
+            ],
+        )
+        self.assertEqual(models.ResolvedEpisode(**lines[0]), resolved(1))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(AssertionError):
+            write([resolved(1)], io.StringIO(), format="csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import asyncio
 from shutil import rmtree
 from os import remove
 from pathlib import Path
@@ -202,6 +203,25 @@ class TestAuto(unittest.TestCase):
     def setUp(self):
         pass
 
+    def test_iter_episodes(self):
+        episodes = Auto(query).iter_episodes(limit=3)
+        self.assertIsInstance(episodes, Generator)
+        listed = list(episodes)
+        self.assertEqual(len(listed), 3)
+        for episode in listed:
+            self.assertIsInstance(episode, models.EpisodeInSearch)
+
+    def test_aiter_episodes(self):
+        async def collect():
+            return [
+                episode
+                async for episode in Auto(query).aiter_episodes(episode_range="S01E01")
+            ]
+
+        listed = asyncio.run(collect())
+        self.assertEqual(len(listed), 1)
+        self.assertIsInstance(listed[0], models.EpisodeInSearch)
+
     @unittest.skip("Downloading series is resources intensive")
     def test_with_series_query(self):
         auto = Auto(query=AlphabeticalOrderFilter())
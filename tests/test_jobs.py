@@ -0,0 +1,206 @@
+import unittest
+import os
+import re
+import subprocess
+import sys
+import threading
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from fzseries_api.jobs import JobQueue
+import fzseries_api.models as models
+import fzseries_api.storage as storage
+from fzseries_api.resilience import RetryPolicy
+
+contents = os.urandom(2_000_000)
+
+
+class EpisodeFileHandler(BaseHTTPRequestHandler):
+    """Serves `contents` with support for `Range` requests - 404 for `/gone`"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/gone":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = 0, len(contents) - 1
+        range_header = self.headers.get("Range")
+        if range_header:
+            self.server.ranges.append(range_header)
+            start = int(re.match(r"bytes=(\d+)-", range_header).group(1))
+            if start >= len(contents):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(contents)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(contents[start : end + 1])
+
+
+def episode(number: int) -> models.EpisodeInSearch:
+    return models.EpisodeInSearch(
+        title=f"Test Series - S01E{number:02d}.mp4",
+        files=[dict(url=f"https://example.com/e{number}", identity="High MP4")],
+        cover_photo="https://example.com/cover.jpg",
+        aired_on=datetime(2024, 1, number),
+    )
+
+
+class TestJobQueue(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EpisodeFileHandler)
+        cls.server.ranges = []
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dir = Path(self.directory.name)
+        self.queue = JobQueue(self.dir / "jobs.sqlite3")
+        self.server.ranges.clear()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def add(self, *numbers: int, link: str = "/episode.mp4", **kwargs):
+        jobs = self.queue.add(
+            [episode(number) for number in numbers], directory=self.dir, **kwargs
+        )
+        # Links are resolved upfront so that the site is never contacted
+        return [
+            self.queue._update(
+                job.id, link=self.base + link, resolved_on=datetime.now().isoformat()
+            )
+            for job in jobs
+        ]
+
+    def test_add_skips_queued_episodes(self):
+        self.add(1, 2)
+        self.assertEqual(
+            len(self.queue.add([episode(2), episode(3)], directory=self.dir)), 1
+        )
+        self.assertEqual(
+            [job.title[-10:] for job in self.queue.jobs()],
+            ["S01E01.mp4", "S01E02.mp4", "S01E03.mp4"],
+        )
+
+    def test_claim_order(self):
+        first, second, third = self.add(1, 2, 3)
+        self.queue._update(first.id, size=300)
+        self.queue._update(second.id, size=100, priority=1)
+        self.assertEqual(self.queue.claim("smallest").id, second.id)
+        self.assertEqual(self.queue.claim("smallest").id, first.id)
+        self.assertEqual(self.queue.claim("priority").id, third.id)
+        self.assertIsNone(self.queue.claim())
+
+    def test_run(self):
+        self.add(1, 2)
+        executed = self.queue.run(workers=2, preallocate=False)
+        self.assertEqual([job.state for job in executed], ["done", "done"])
+        for job in executed:
+            self.assertEqual(Path(job.path).read_bytes(), contents)
+            self.assertEqual(job.downloaded, len(contents))
+            self.assertEqual(
+                [attempt.outcome for attempt in self.queue.attempts(job.id)], ["done"]
+            )
+
+    def test_resumes_job_of_crashed_process(self):
+        (job,) = self.add(1)
+        job = self.queue.claim()
+        Path(job.path).parent.mkdir(parents=True)
+        Path(job.path).write_bytes(contents[:500_000])
+        # Hand the job to a process that is no longer running
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        self.queue._running.clear()
+        self.queue._update(job.id, pid=dead.pid)
+
+        (job,) = self.queue.run()
+        self.assertEqual(job.state, "done")
+        self.assertEqual(Path(job.path).read_bytes(), contents)
+        self.assertEqual(self.server.ranges, ["bytes=500000-"])
+        self.assertEqual(
+            [attempt.outcome for attempt in self.queue.attempts(job.id)],
+            ["crashed", "done"],
+        )
+
+    def test_failed_job_retry_and_cancel(self):
+        (job,) = self.add(1, link="/gone", max_attempts=1)
+        (job,) = self.queue.run()
+        self.assertEqual(job.state, "failed")
+        self.assertIn("404", job.error)
+        self.assertIsNone(job.link)
+        self.assertEqual(self.queue.retry(), 1)
+        self.assertEqual(self.queue.get(job.id).state, "pending")
+        # A retried job gets a fresh budget but keeps its history
+        (job,) = self.queue.run()
+        self.assertEqual((job.state, job.attempts), ("failed", 1))
+        self.assertEqual(
+            [
+                (attempt.number, attempt.outcome)
+                for attempt in self.queue.attempts(job.id)
+            ],
+            [(1, "failed"), (2, "failed")],
+        )
+        self.assertEqual(self.queue.retry(), 1)
+        self.assertEqual(self.queue.cancel([job.id]), 1)
+        self.assertEqual(self.queue.jobs(["cancelled"])[0].id, job.id)
+
+    def test_stopped_job_is_put_back(self):
+        (job,) = self.add(1)
+        self.queue.stop()
+        job = self.queue.execute(
+            self.queue.claim(), preallocate=False, stop=self.queue._stop
+        )
+        self.assertEqual(job.state, "pending")
+        self.assertEqual(
+            [attempt.outcome for attempt in self.queue.attempts(job.id)],
+            ["interrupted"],
+        )
+
+    def test_skipped_job_backs_off_without_using_attempts(self):
+        (job,) = self.add(1)
+        lock = storage.DownloadLock(job.path)
+        self.assertTrue(lock.acquire())
+        try:
+            job = self.queue.execute(
+                self.queue.claim(), preallocate=False, if_locked="skip"
+            )
+        finally:
+            lock.release()
+        self.assertEqual((job.state, job.attempts, job.skips), ("pending", 0, 1))
+        self.assertGreater(job.not_before, datetime.now())
+        self.assertEqual(self.queue.attempts(job.id), [])
+        self.assertIsNone(self.queue.claim())
+
+    def test_failed_attempts_back_off(self):
+        self.queue.retry_policy = RetryPolicy(backoff_factor=0.2, max_backoff=0.2)
+        (job,) = self.add(1, link="/gone", max_attempts=2)
+        (job,) = self.queue.run()
+        self.assertEqual(job.state, "failed")
+        attempts = self.queue.attempts(job.id)
+        self.assertEqual([attempt.outcome for attempt in attempts], ["failed"] * 2)
+        self.assertGreaterEqual(
+            (attempts[1].started_on - attempts[0].finished_on).total_seconds(), 0.2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
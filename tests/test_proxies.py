@@ -0,0 +1,155 @@
+import unittest
+import os
+import socket
+import threading
+import tempfile
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+from fzseries_api.main import Download
+from fzseries_api.proxies import ProxyPool
+import fzseries_api.hunter as hunter
+
+contents = os.urandom(2_000_000)
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        start, end = 0, len(contents) - 1
+        if self.headers.get("Range"):
+            start, end = map(int, self.headers["Range"][6:].split("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(contents)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(contents[start : end + 1])
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Forward proxy stand-in counting requests it relays"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.relayed += 1
+        headers = {"Range": self.headers["Range"]} if self.headers["Range"] else {}
+        resp = requests.get(self.path, headers=headers, proxies=dict(http=None))
+        self.send_response(resp.status_code)
+        for name in ("Content-Range", "Content-Length"):
+            if name in resp.headers:
+                self.send_header(name, resp.headers[name])
+        self.end_headers()
+        self.wfile.write(resp.content)
+
+
+def serve(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.relayed = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestProxyPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ProxyPool(["http://a:1", "http://b:1"])
+
+    def test_spreads_load(self):
+        with self.pool.use() as first, self.pool.use() as second:
+            self.assertNotEqual(first.proxy, second.proxy)
+
+    def test_failing_proxy_is_skipped(self):
+        self.pool.record_failure("http://a:1")
+        self.assertEqual(self.pool.select(), "http://b:1")
+        self.assertFalse(self.pool.stats()["http://a:1"]["healthy"])
+
+    def test_sticky_key(self):
+        proxy = self.pool.select("episode")
+        with self.pool.use():
+            self.assertEqual(self.pool.select("episode"), proxy)
+        self.pool.record_failure(proxy)
+        self.assertNotEqual(self.pool.select("episode"), proxy)
+
+    def test_pinned_to_thread(self):
+        with self.pool.pinned("episode") as proxy:
+            self.assertEqual(self.pool.current(), proxy)
+            with self.pool.use() as lease:
+                self.assertEqual(lease.proxy, proxy)
+        self.assertIsNone(self.pool.current())
+
+    def test_empty_pool_goes_direct(self):
+        with ProxyPool().use() as lease:
+            self.assertIsNone(lease.proxies)
+
+
+class TestDownloadThroughProxies(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = serve(FileHandler)
+        cls.link = f"http://127.0.0.1:{cls.server.server_port}/episode.mp4"
+        cls.proxies = [serve(ProxyHandler) for _ in range(2)]
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in [cls.server, *cls.proxies]:
+            server.shutdown()
+            server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.urls = [f"http://127.0.0.1:{proxy.server_port}" for proxy in self.proxies]
+        self.dead = f"http://127.0.0.1:{unused_port()}"
+        for url in [*self.urls, self.dead]:
+            hunter.proxy_pool.add(url)
+        for proxy in self.proxies:
+            proxy.relayed = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+        for url in [*self.urls, self.dead]:
+            hunter.proxy_pool.remove(url)
+
+    def save(self, **kwargs) -> Path:
+        return Download.save(
+            self.link,
+            "episode.mp4",
+            dir=self.directory.name,
+            progress_bar=False,
+            **kwargs,
+        )
+
+    def test_segments_are_spread_and_dead_proxy_is_avoided(self):
+        saved_to = self.save(connections=4, segment_size=0.25)
+        self.assertEqual(Path(saved_to).read_bytes(), contents)
+        self.assertTrue(all(proxy.relayed for proxy in self.proxies))
+        stats = hunter.proxy_pool.stats()
+        self.assertFalse(stats[self.dead]["healthy"])
+        self.assertTrue(all(stats[url]["total_bytes"] for url in self.urls))
+
+    def test_pinned_proxy_carries_whole_download(self):
+        with hunter.proxy_pool.pinned("episode") as proxy:
+            if proxy == self.dead:
+                hunter.proxy_pool.record_failure(proxy)
+                hunter.proxy_pool.forget("episode")
+        with hunter.proxy_pool.pinned("episode") as proxy:
+            saved_to = self.save(connections=4, segment_size=0.25)
+        self.assertEqual(Path(saved_to).read_bytes(), contents)
+        relayed = {url: p.relayed for url, p in zip(self.urls, self.proxies)}
+        self.assertEqual([url for url, count in relayed.items() if count], [proxy])
+
+
+if __name__ == "__main__":
+    unittest.main()
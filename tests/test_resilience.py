@@ -0,0 +1,100 @@
+import unittest
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import fzseries_api.hunter as hunter
+import fzseries_api.exceptions as exceptions
+from fzseries_api.resilience import RetryPolicy, CircuitBreaker
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Responds with 503 for the first `failures` requests"""
+
+    failures = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if FlakyHandler.failures > 0:
+            FlakyHandler.failures -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+class TestFetch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        cls.host = f"127.0.0.1:{cls.server.server_port}"
+        cls.url = f"http://{cls.host}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        hunter.circuit_breaker.record_success(self.host)
+        hunter.scheduler.hosts.pop(self.host, None)
+
+    def test_retries_until_success(self):
+        FlakyHandler.failures = 2
+        self.assertEqual(hunter.fetch(self.url).status_code, 200)
+
+    def test_gives_up_after_total_retries(self):
+        FlakyHandler.failures = 10
+        hunter.retry_policies[self.host] = RetryPolicy(total=1)
+        try:
+            self.assertEqual(hunter.fetch(self.url).status_code, 503)
+        finally:
+            hunter.retry_policies.pop(self.host)
+
+    def test_interrupted_trial_does_not_keep_circuit_open(self):
+        class InterruptedTransport:
+            def get(self, *args, **kwargs):
+                raise KeyboardInterrupt
+
+        FlakyHandler.failures = 0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure(self.host)
+        original_breaker, original_transport = hunter.circuit_breaker, hunter.transport
+        hunter.circuit_breaker, hunter.transport = breaker, InterruptedTransport()
+        try:
+            self.assertRaises(KeyboardInterrupt, hunter.fetch, self.url)
+            hunter.transport = original_transport
+            self.assertEqual(hunter.fetch(self.url).status_code, 200)
+        finally:
+            hunter.circuit_breaker, hunter.transport = (
+                original_breaker,
+                original_transport,
+            )
+        self.assertEqual(breaker.state(self.host), "closed")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure("host")
+        breaker.before_request("host")
+        breaker.record_failure("host")
+        self.assertRaises(exceptions.CircuitOpen, breaker.before_request, "host")
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure("host")
+        breaker.before_request("host")
+        self.assertRaises(exceptions.CircuitOpen, breaker.before_request, "host")
+        breaker.record_success("host")
+        self.assertEqual(breaker.state("host"), "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime
+from fzseries_api.selection import EpisodeRange, last_episode
+import fzseries_api.models as models
+
+
+def season(number: int) -> models.TVSeriesSeason:
+    return models.TVSeriesSeason(
+        url=f"https://example.com/season{number}",
+        identity=f"Season {number}",
+        number=number,
+    )
+
+
+def episode(season_number: int, number: int) -> models.EpisodeInSearch:
+    return models.EpisodeInSearch(
+        title=f"Test Series - S{season_number:02d}E{number:02d}.mp4",
+        files=[dict(url=f"https://example.com/e{number}", identity="High MP4")],
+        cover_photo="https://example.com/cover.jpg",
+        aired_on=datetime(2024, 1, number),
+    )
+
+
+class TestEpisodeRange(unittest.TestCase):
+
+    seasons = [season(number) for number in range(1, 6)]
+
+    def indexed(self, expression: str) -> list[tuple[int, list[tuple[int, int]]]]:
+        return [
+            (season.number, spans)
+            for season, spans in EpisodeRange(expression).index(self.seasons)
+        ]
+
+    def test_span_across_seasons(self):
+        self.assertEqual(
+            self.indexed("S03E05-S04E02"),
+            [(3, [(5, last_episode)]), (4, [(0, 2)])],
+        )
+
+    def test_whole_seasons_and_latest(self):
+        self.assertEqual(
+            self.indexed("s02, S05"),
+            [(2, [(0, last_episode)]), (5, [(0, last_episode)])],
+        )
+        self.assertEqual(self.indexed("latest"), [(5, [(0, last_episode)])])
+
+    def test_open_ended(self):
+        self.assertEqual([number for number, _ in self.indexed("S04E03-")], [4, 5])
+
+    def test_invalid(self):
+        for expression in ("", "S03E05-S02", "E05", "S01-latest"):
+            with self.assertRaises(ValueError):
+                EpisodeRange(expression)
+
+    def test_select_stops_past_range(self):
+        def episodes():
+            for number in range(1, 11):
+                if number > 4:
+                    self.fail("Episodes past the range were read")
+                yield episode(4, number)
+
+        self.assertEqual(
+            [
+                selected.title[-6:-4]
+                for selected in EpisodeRange.select(episodes(), [(2, 3)])
+            ],
+            ["02", "03"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+import unittest
+import os
+import threading
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+from fzseries_api.jobs import JobQueue
+from fzseries_api.server import Server, EpisodeProxy, parse_range
+import fzseries_api.models as models
+import fzseries_api.storage as storage
+
+contents = os.urandom(1_000_000)
+
+
+class EpisodeFileHandler(BaseHTTPRequestHandler):
+    """Serves `contents` with support for `Range` requests"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        start, end = 0, len(contents) - 1
+        if self.headers.get("Range"):
+            start, end = map(int, self.headers["Range"][6:].split("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(contents)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(contents[start : end + 1])
+
+
+def episode(number: int) -> dict:
+    return models.EpisodeInSearch(
+        title=f"Test Series - S01E{number:02d}.mp4",
+        files=[dict(url=f"https://example.com/e{number}", identity="High MP4")],
+        cover_photo="https://example.com/cover.jpg",
+        aired_on=datetime(2024, 1, number),
+    ).model_dump(mode="json")
+
+
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.file_server = ThreadingHTTPServer(("127.0.0.1", 0), EpisodeFileHandler)
+        cls.link = f"http://127.0.0.1:{cls.file_server.server_port}/episode.mp4"
+        threading.Thread(target=cls.file_server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.file_server.shutdown()
+        cls.file_server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dir = Path(self.directory.name)
+        self.queue = JobQueue(self.dir / "jobs.sqlite3")
+        self.server = Server(
+            port=0, queue=self.queue, poll_interval=0.1, download_dir=self.dir
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        return requests.request(method, self.server.url + path, **kwargs)
+
+    def test_errors(self):
+        self.assertEqual(self.request("GET", "/nowhere").status_code, 404)
+        self.assertEqual(self.request("DELETE", "/jobs").status_code, 405)
+        self.assertEqual(self.request("GET", "/search").status_code, 400)
+        resp = self.request(
+            "POST",
+            "/series",
+            data=b"{not json",
+            headers={"Content-Type": "application/json"},
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("error", resp.json())
+        self.assertEqual(self.request("GET", "/jobs/7").status_code, 404)
+
+    def test_forged_requests_are_rejected(self):
+        body = dict(episodes=[episode(1)])
+        for headers in (
+            {"Origin": "https://evil.example"},
+            {"Host": "evil.example"},
+        ):
+            resp = self.request("POST", "/jobs", json=body, headers=headers)
+            self.assertEqual(resp.status_code, 403)
+        resp = self.request(
+            "POST",
+            "/jobs",
+            data=b'{"episodes": []}',
+            headers={"Content-Type": "text/plain"},
+        )
+        self.assertEqual(resp.status_code, 415)
+        resp = self.request(
+            "POST", "/jobs", json=body, headers={"Origin": self.server.url}
+        )
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(self.request("GET", "/health").status_code, 200)
+
+    def test_jobs_are_confined_to_download_dir(self):
+        resp = self.request(
+            "POST", "/jobs", json=dict(episodes=[episode(1)], directory="/tmp")
+        )
+        self.assertEqual(resp.status_code, 403)
+        climbing = episode(1)
+        climbing["title"] = "../../../../tmp/owned - S01E01.mp4"
+        resp = self.request("POST", "/jobs", json=dict(episodes=[climbing]))
+        self.assertEqual(resp.status_code, 403)
+        self.assertEqual(self.queue.jobs(), [])
+        resp = self.request(
+            "POST", "/jobs", json=dict(episodes=[episode(1)], directory="library")
+        )
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(
+            Path(resp.json()[0]["path"]).parent.parent.parent, self.dir / "library"
+        )
+
+    def test_jobs(self):
+        resp = self.request(
+            "POST",
+            "/jobs",
+            json=dict(episodes=[episode(1), episode(2)], directory=str(self.dir)),
+        )
+        self.assertEqual(resp.status_code, 202)
+        first, second = resp.json()
+        self.assertEqual(first["state"], "pending")
+        self.assertEqual(
+            self.request("DELETE", f"/jobs/{second['id']}").status_code, 200
+        )
+        self.assertEqual(
+            [job["id"] for job in self.request("GET", "/jobs?state=pending").json()],
+            [first["id"]],
+        )
+        self.assertEqual(
+            self.request("DELETE", f"/jobs/{second['id']}").status_code, 409
+        )
+        resp = self.request("POST", f"/jobs/{second['id']}/retry")
+        self.assertEqual(resp.json()["state"], "pending")
+
+    def test_queued_jobs_are_downloaded(self):
+        (job,) = self.queue.add(
+            [models.EpisodeInSearch(**episode(1))], directory=self.dir
+        )
+        # Link is resolved upfront so that the site is never contacted
+        self.queue._update(
+            job.id, link=self.link, resolved_on=datetime.now().isoformat()
+        )
+        self.server.start_workers()
+        for _ in range(100):
+            resp = self.request("GET", f"/jobs/{job.id}").json()
+            if resp["job"]["state"] == "done":
+                break
+            time.sleep(0.1)
+        self.assertEqual(resp["job"]["state"], "done")
+        self.assertEqual(resp["attempts"][0]["outcome"], "done")
+        self.assertEqual(Path(job.path).read_bytes(), contents)
+
+
+class TestEpisodeProxy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.file_server = ThreadingHTTPServer(("127.0.0.1", 0), EpisodeFileHandler)
+        cls.link = f"http://127.0.0.1:{cls.file_server.server_port}/episode.mp4"
+        threading.Thread(target=cls.file_server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.file_server.shutdown()
+        cls.file_server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.save_to = Path(self.directory.name) / "episode.mp4"
+        self.proxy = EpisodeProxy(
+            self.link,
+            self.save_to,
+            len(contents),
+            port=0,
+            chunk_size=100_000,
+            read_ahead=0,
+        )
+        threading.Thread(target=self.proxy.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.proxy.shutdown()
+        self.proxy.server_close()
+        self.directory.cleanup()
+
+    def get(self, byte_range: str | None = None) -> requests.Response:
+        headers = {"Range": byte_range} if byte_range else {}
+        return requests.get(self.proxy.url, headers=headers)
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=10-", 100), (10, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=5-500", 100), (5, 99))
+        self.assertIsNone(parse_range("bytes=100-", 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=0-1,5-6", 100)
+
+    def test_seeking_is_served_from_cache(self):
+        resp = self.get("bytes=250000-449999")
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(
+            resp.headers["Content-Range"], f"bytes 250000-449999/{len(contents)}"
+        )
+        self.assertEqual(resp.content, contents[250_000:450_000])
+        self.assertEqual(self.proxy.upstream_requests, 3)
+        self.assertEqual(
+            self.get("bytes=300000-399999").content, contents[300_000:400_000]
+        )
+        self.assertEqual(self.proxy.upstream_requests, 3)
+        self.assertEqual(self.get(f"bytes={len(contents)}-").status_code, 416)
+
+    def test_cache_is_promoted_once_complete(self):
+        resp = self.get()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, contents)
+        self.assertEqual(self.save_to.read_bytes(), contents)
+        self.assertTrue(storage.verify_file(self.save_to)[0])
+        self.assertEqual(self.get("bytes=-10").content, contents[-10:])
+
+
+if __name__ == "__main__":
+    unittest.main()
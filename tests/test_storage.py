@@ -0,0 +1,221 @@
+import unittest
+import io
+import os
+import sys
+import subprocess
+import tempfile
+from pathlib import Path
+import fzseries_api.storage as storage
+from fzseries_api.utils import parse_size
+
+
+class FailingFile(io.BytesIO):
+
+    def write(self, contents):
+        raise OSError("No space left on device")
+
+
+class TestWriteBehindWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.contents = os.urandom(1_000_003)
+
+    def test_contents_written_in_order(self):
+        fh = io.BytesIO()
+        with storage.WriteBehindWriter(
+            fh, buffer_budget=50_000, write_size=16_384
+        ) as writer:
+            for index in range(0, len(self.contents), 1_000):
+                writer.write(self.contents[index : index + 1_000])
+        self.assertEqual(fh.getvalue(), self.contents)
+
+    def test_write_error_propagates(self):
+        with self.assertRaises(OSError):
+            with storage.WriteBehindWriter(
+                FailingFile(), buffer_budget=10_000, write_size=4_096
+            ) as writer:
+                for index in range(0, len(self.contents), 1_000):
+                    writer.write(self.contents[index : index + 1_000])
+
+
+class TestDiskSpace(unittest.TestCase):
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("350 MB"), 350 * 1024**2)
+        self.assertEqual(parse_size("1.5GB"), int(1.5 * 1024**3))
+        self.assertIsNone(parse_size("unknown"))
+
+    def test_preallocate_keeps_size(self):
+        with tempfile.TemporaryFile() as fh:
+            fh.write(b"contents")
+            fh.flush()
+            storage.preallocate(fh.fileno(), 8, 1_000_000)
+            self.assertEqual(os.fstat(fh.fileno()).st_size, 8)
+
+    def test_free_space_of_missing_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertGreater(
+                storage.free_space(Path(directory) / "series" / "S01"), 0
+            )
+
+
+class TestDownloadLock(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "episode.mp4"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_in_process(self, code: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import os, sys, time\n"
+                "import fzseries_api.storage as storage\n"
+                f"lock = storage.DownloadLock({str(self.path)!r})\n"
+                "lock.acquire(blocking=True)\n"
+                "lock.advance(10, total=100)\n"
+                "print('locked', flush=True)\n" + code,
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+
+    def test_lock_is_exclusive_across_processes(self):
+        process = self.run_in_process("time.sleep(30)")
+        try:
+            self.assertEqual(process.stdout.readline().strip(), "locked")
+            lock = storage.DownloadLock(self.path)
+            self.assertFalse(lock.acquire())
+            self.assertEqual(lock.owner().pid, process.pid)
+            self.assertEqual(lock.owner().total, 100)
+            self.assertTrue(list(storage.active_downloads(self.directory.name))[0][2])
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_stale_lock_of_crashed_process_is_taken_over(self):
+        process = self.run_in_process("os._exit(1)")
+        process.wait()
+        (path, progress, is_active), *_ = storage.active_downloads(self.directory.name)
+        self.assertEqual(path, self.path)
+        self.assertEqual(progress.pid, process.pid)
+        self.assertFalse(is_active)
+        with self.assertLogs(level="WARNING"):
+            lock = storage.DownloadLock(self.path)
+            self.assertTrue(lock.acquire())
+        self.assertEqual(lock.owner().pid, os.getpid())
+        lock.release()
+        self.assertFalse(storage.lock_path(self.path).exists())
+
+
+class TestChunkCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "episode.mp4"
+        self.contents = os.urandom(2_500)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def cache(self) -> storage.ChunkCache:
+        return storage.ChunkCache(self.path, len(self.contents), chunk_size=1_000)
+
+    def write(self, cache: storage.ChunkCache, index: int):
+        start, end = cache.chunk_range(index)
+        cache.write(index, self.contents[start : end + 1])
+
+    def test_chunks_persist_across_instances(self):
+        cache = self.cache()
+        self.assertEqual(cache.count, 3)
+        self.write(cache, 2)
+        cache.close()
+        cache = self.cache()
+        self.assertEqual(cache.missing(), [0, 1])
+        self.assertEqual(cache.read(2_000, 500), self.contents[2_000:])
+        with self.assertRaises(ValueError):
+            cache.write(0, b"short")
+        cache.close()
+
+    def test_promote(self):
+        cache = self.cache()
+        for index in cache.missing():
+            self.write(cache, index)
+        self.assertTrue(cache.is_complete)
+        self.assertEqual(cache.promote("http://localhost/episode.mp4"), self.path)
+        self.assertEqual(cache.read(1_500, 10), self.contents[1_500:1_510])
+        cache.close()
+        self.assertEqual(self.path.read_bytes(), self.contents)
+        self.assertTrue(storage.verify_file(self.path)[0])
+        self.assertFalse(cache.cache_path.exists() or cache.map_path.exists())
+        self.assertTrue(self.cache().promoted)
+
+    def test_closed_cache_drops_late_writes(self):
+        cache = self.cache()
+        cache.close()
+        self.write(cache, 0)
+        self.assertEqual(cache.missing(), [0, 1, 2])
+        self.assertRaises(ValueError, cache.read, 0, 10)
+        cache.close()
+
+    def test_without_positional_io(self):
+        storage.positional_io = False
+        try:
+            cache = self.cache()
+            for index in (2, 0, 1):
+                self.write(cache, index)
+            self.assertEqual(cache.read(900, 200), self.contents[900:1_100])
+            cache.close()
+        finally:
+            storage.positional_io = True
+        cache = self.cache()
+        self.assertEqual(cache.missing(), [])
+        cache.close()
+
+
+class TestRangeJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "episode.mp4.part"
+        self.path.write_bytes(bytes(1_000))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ranges_merge(self):
+        journal = storage.RangeJournal(self.path, 1_000)
+        journal.add(500, 599)
+        journal.add(0, 99)
+        journal.add(100, 199)
+        journal.add(550, 699)
+        self.assertEqual(journal.ranges, [(0, 199), (500, 699)])
+        self.assertEqual(journal.completed, 400)
+        self.assertEqual(journal.missing(), [(200, 499), (700, 999)])
+        self.assertEqual(
+            journal.missing(segment_size=200),
+            [(200, 399), (400, 499), (700, 899), (900, 999)],
+        )
+        journal.add(200, 499)
+        journal.add(700, 999)
+        self.assertTrue(journal.is_complete)
+
+    def test_sync_and_load(self):
+        journal = storage.RangeJournal(self.path, 1_000)
+        journal.add(100, 299)
+        with open(self.path, "r+b") as fh:
+            journal.sync(fh.fileno(), force=True)
+        restored = storage.RangeJournal(self.path, 1_000)
+        self.assertTrue(restored.load())
+        self.assertEqual(restored.ranges, [(100, 299)])
+        self.assertFalse(storage.RangeJournal(self.path, 2_000).load())
+        restored.remove()
+        self.assertFalse(restored.load())
+
+
+if __name__ == "__main__":
+    unittest.main()
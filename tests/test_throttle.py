@@ -0,0 +1,183 @@
+import unittest
+import time
+import tempfile
+import threading
+from pathlib import Path
+import fzseries_api.throttle as throttle
+from fzseries_api.utils import parse_rate
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+
+    def consume(self, limiter: throttle.BandwidthLimiter, nbytes: int):
+        with limiter.share() as share:
+            for _ in range(nbytes // 64_000):
+                share.consume(64_000)
+
+    def test_unlimited(self):
+        limiter = throttle.BandwidthLimiter()
+        started = time.monotonic()
+        self.consume(limiter, 10_000_000)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_rate_is_parsed_in_decimal_units(self):
+        self.assertEqual(parse_rate("40MB"), 40_000_000)
+        self.assertEqual(parse_rate("512 KB"), 512_000)
+        self.assertIsNone(parse_rate("fast"))
+
+    def test_rate_is_shared_by_downloads(self):
+        limiter = throttle.BandwidthLimiter(rate=4_000_000)
+        started = time.monotonic()
+        downloads = [
+            threading.Thread(target=self.consume, args=(limiter, 1_024_000))
+            for _ in range(2)
+        ]
+        for download in downloads:
+            download.start()
+        for download in downloads:
+            download.join()
+        self.assertGreater(time.monotonic() - started, 0.4)
+        self.assertEqual(limiter.stats()["total_bytes"], 2_048_000)
+
+    def test_rate_is_shared_across_limiters_through_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "bandwidth"
+            first = throttle.BandwidthLimiter(rate=4_000_000, path=path)
+            second = throttle.BandwidthLimiter(path=path)
+            self.assertEqual(second.rate, 4_000_000)
+            second.set_rate(8_000_000)
+            self.assertEqual(first.rate, 8_000_000)
+            bucket = first.bucket
+            first.use_file(Path(directory) / "other")
+            self.assertIsNone(bucket._fd)
+            self.assertEqual(first.rate, 8_000_000)
+            first.bucket.close()
+            second.bucket.close()
+
+
+class TestConnectionTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.tuner = throttle.ConnectionTuner(initial=2, maximum=4, window=0)
+
+    def test_increase_while_throughput_improves(self):
+        with self.tuner.connection("host"), self.tuner.connection("host"):
+            self.tuner.record("host", 1_000_000)
+        self.assertEqual(self.tuner.limit("host"), 3)
+
+    def test_no_increase_when_not_saturated(self):
+        with self.tuner.connection("host"):
+            self.tuner.record("host", 1_000_000)
+        self.assertEqual(self.tuner.limit("host"), 2)
+
+    def test_backoff_on_errors(self):
+        self.tuner.check_status("host", 503)
+        self.assertEqual(self.tuner.limit("host"), 1)
+        self.assertEqual(self.tuner.stats()["host"]["errors"], 1)
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = throttle.RequestScheduler(rate=20, concurrency=1)
+
+    def request(self, order: list, name: str, priority: int):
+        self.scheduler.acquire("host", priority)
+        order.append(name)
+        self.scheduler.release("host", 200)
+
+    def test_rate_is_enforced(self):
+        started = time.monotonic()
+        for _ in range(5):
+            self.scheduler.acquire("host")
+            self.scheduler.release("host", 200)
+        self.assertGreater(time.monotonic() - started, 0.18)
+
+    def test_interactive_requests_go_first(self):
+        order = []
+        self.scheduler.acquire("host")
+        requests = [
+            threading.Thread(target=self.request, args=(order, name, priority))
+            for name, priority in (
+                ("crawl", throttle.Priority.BACKGROUND),
+                ("search", throttle.Priority.INTERACTIVE),
+            )
+        ]
+        for request in requests:
+            request.start()
+            time.sleep(0.05)
+        self.scheduler.release("host", 200)
+        for request in requests:
+            request.join()
+        self.assertEqual(order, ["search", "crawl"])
+
+    def test_backoff_and_recovery(self):
+        self.scheduler.acquire("host")
+        self.scheduler.release("host", 429)
+        self.assertEqual(self.scheduler.stats()["host"]["rate"], 10)
+        self.scheduler.acquire("host")
+        self.scheduler.release("host", 200)
+        self.assertEqual(self.scheduler.stats()["host"]["rate"], 10.1)
+
+    def test_thread_priority(self):
+        with self.scheduler.background():
+            self.assertEqual(
+                self.scheduler.default_priority, throttle.Priority.BACKGROUND
+            )
+        self.assertEqual(self.scheduler.default_priority, throttle.Priority.INTERACTIVE)
+        priorities = []
+        worker = threading.Thread(
+            target=self.scheduler.in_background(
+                lambda: priorities.append(self.scheduler.default_priority)
+            )
+        )
+        worker.start()
+        worker.join()
+        self.assertEqual(priorities, [throttle.Priority.BACKGROUND])
+
+    def test_interrupted_wait_leaves_the_queue(self):
+        def interrupt(timeout=None):
+            raise KeyboardInterrupt
+
+        self.scheduler.acquire("host")
+        self.scheduler._condition.wait = interrupt
+        self.assertRaises(KeyboardInterrupt, self.scheduler.acquire, "host")
+        del self.scheduler._condition.wait
+        self.assertEqual(self.scheduler.stats()["host"]["waiting"], 0)
+        self.scheduler.release("host", 200)
+        waiter = threading.Thread(target=self.scheduler.acquire, args=("host",))
+        waiter.start()
+        waiter.join(timeout=2)
+        self.assertFalse(waiter.is_alive())
+
+
+class TestThroughputHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history = throttle.ThroughputHistory(
+            Path(self.directory.name) / "throughput.json", max_samples=2
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_rate(self):
+        self.assertIsNone(self.history.rate())
+        self.history.record(100, 1)
+        self.assertIsNone(self.history.rate())
+        self.history.record(2_000_000, 1)
+        self.history.record(4_000_000, 1)
+        self.history.record(6_000_000, 2)
+        self.assertEqual(len(self.history.samples()), 2)
+        self.assertEqual(self.history.rate(), 10_000_000 / 3)
+
+    def test_old_samples_are_ignored(self):
+        self.history.record(2_000_000, 1)
+        self.history.max_age = 0
+        time.sleep(0.01)
+        self.assertIsNone(self.history.rate())
+
+
+if __name__ == "__main__":
+    unittest.main()
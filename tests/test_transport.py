@@ -0,0 +1,128 @@
+import unittest
+import os
+import threading
+import tempfile
+import importlib.util
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from fzseries_api.main import Download
+import fzseries_api.hunter as hunter
+import fzseries_api.transport as transport
+
+contents = os.urandom(500_000)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Echoes query and cookie on `/page`, sets a cookie and redirects
+    there on `/redirect` and serves `contents` elsewhere"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Set-Cookie", "hop=1; Path=/")
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/page"):
+            body = f"{self.path}|{self.headers.get('Cookie')}".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Set-Cookie", "visited=yes; Path=/")
+        else:
+            body = contents
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TransportTestBase:
+    backend: str = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.previous = hunter.transport
+        hunter.use_transport(self.backend)
+
+    def tearDown(self):
+        hunter.transport.close()
+        hunter.transport = self.previous
+        if "visited" in hunter.session.cookies or "hop" in hunter.session.cookies:
+            hunter.session.cookies.clear("127.0.0.1")
+
+    def test_params_and_cookies(self):
+        resp = hunter.fetch(self.base + "/page", params=dict(q="tv"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.text, "/page?q=tv|None")
+        self.assertGreaterEqual(resp.elapsed.total_seconds(), 0)
+        resp = hunter.fetch(self.base + "/page")
+        self.assertEqual(resp.text, "/page|visited=yes")
+
+    def test_redirect_cookies(self):
+        resp = hunter.fetch(self.base + "/redirect")
+        self.assertEqual(resp.url, self.base + "/page")
+        self.assertEqual(len(resp.history), 1)
+        self.assertIn("hop=1", resp.text)
+
+    def test_download(self):
+        with tempfile.TemporaryDirectory() as directory:
+            saved_to = Download.save(
+                self.base + "/episode.mp4",
+                "episode.mp4",
+                dir=directory,
+                progress_bar=False,
+            )
+            self.assertEqual(Path(saved_to).read_bytes(), contents)
+
+
+class TestRequestsTransport(TransportTestBase, unittest.TestCase):
+    backend = "requests"
+
+
+class TestUrllib3Transport(TransportTestBase, unittest.TestCase):
+    backend = "urllib3"
+
+    def test_socks_proxy(self):
+        from urllib3.contrib.socks import SOCKSProxyManager
+
+        pool = hunter.transport._pool_for(
+            self.base, {"http": "socks5h://127.0.0.1:9050"}
+        )
+        self.assertIsInstance(pool, SOCKSProxyManager)
+
+    def test_pool_stats(self):
+        hunter.fetch(self.base + "/page")
+        self.assertIn(
+            f"http://127.0.0.1:{self.server.server_port}", hunter.pool_stats()
+        )
+
+
+@unittest.skipUnless(importlib.util.find_spec("httpx"), "httpx is not installed")
+class TestHttpxTransport(TransportTestBase, unittest.TestCase):
+    backend = "httpx"
+
+
+class TestCreate(unittest.TestCase):
+
+    def test_unknown_backend(self):
+        with self.assertRaises(AssertionError):
+            transport.create("curl", hunter.session)
+
+
+if __name__ == "__main__":
+    unittest.main()